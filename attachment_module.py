@@ -0,0 +1,183 @@
+import codecs
+import hashlib
+import json
+import os
+import re
+import shutil
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+from autosave_module import atomic_write_text
+
+# [Lite] 첨부 파일 수집(ingestion) 설정
+ATTACHMENT_DIR_NAME = ".eidos_attachments"  # 샌드박스 안의 숨김 폴더 (세션별 하위 폴더 + 추출 캐시)
+READ_BLOCK_BYTES = 1024 * 1024              # 스트리밍 읽기 단위
+CHUNK_CHARS = 2000                          # 청크 하나의 대략적인 글자 수 (줄 경계에서 자름)
+PROMPT_ATTACHMENT_BUDGET = 8000             # 프롬프트에 넣을 첨부 내용의 최대 글자 수
+_BINARY_SNIFF_BYTES = 8192
+_WORD_RE = re.compile(r"[0-9A-Za-z_가-힣]{2,}")
+
+
+def _terms(text: str) -> List[str]:
+    return [w.lower() for w in _WORD_RE.findall(text)]
+
+
+class AttachmentStore:
+    """
+    [Lite] 첨부 파일을 샌드박스의 세션 폴더로 가져오고(하드링크, 실패 시 복사),
+    스트리밍으로 읽어 줄 경계 청크로 나눈 뒤 내용 해시(sha256)별로 추출 결과를 캐시합니다.
+      <root>/.eidos_attachments/<session>/<해시 앞 8자>_<파일명>   샌드박스 사본 (read_file로 읽을 수 있음)
+      <root>/.eidos_attachments/cache/<해시>.json                   추출된 청크 (세션 간 공유)
+      <root>/.eidos_attachments/cache/stat_index.json              (원본 경로, 크기, mtime) -> 해시
+    같은 파일을 다시 첨부하면 stat 한 번으로 캐시를 찾아 읽기/해시/복사를 모두 건너뜁니다.
+    """
+    def __init__(self, root: str, session_id: Optional[str] = None):
+        self.root = os.path.realpath(root)
+        self.base_dir = os.path.join(self.root, ATTACHMENT_DIR_NAME)
+        self.cache_dir = os.path.join(self.base_dir, "cache")
+        self.session_id = session_id or time.strftime("session-%Y%m%d-%H%M%S")
+        self.session_dir = os.path.join(self.base_dir, self.session_id)
+        self._lock = threading.Lock()
+        self._stat_index: Optional[Dict[str, str]] = None
+        self.cache_hits = 0
+
+    def _stat_key(self, path: str, st: os.stat_result) -> str:
+        return f"{os.path.realpath(path)}|{st.st_size}|{st.st_mtime_ns}"
+
+    def _load_stat_index(self) -> Dict[str, str]:
+        if self._stat_index is None:
+            try:
+                with open(os.path.join(self.cache_dir, "stat_index.json"), "r", encoding="utf-8") as f:
+                    self._stat_index = json.load(f)
+            except (OSError, ValueError):
+                self._stat_index = {}
+        return self._stat_index
+
+    def _extract(self, source_path: str) -> Dict[str, Any]:
+        """ (Helper) 파일을 블록 단위로 읽으며 해시 계산 + 텍스트 청크 분할 (전체를 메모리에 올리지 않음) """
+        hasher = hashlib.sha256()
+        decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        chunks: List[Dict[str, Any]] = []
+        is_binary = False
+        pending, pending_start, line_no = [], 1, 1
+        pending_chars = 0
+        carry = ""
+
+        def flush(end_line: int):
+            nonlocal pending, pending_chars, pending_start
+            if pending:
+                text = "".join(pending)
+                chunks.append({"start_line": pending_start, "end_line": end_line, "text": text,
+                               "fingerprint": hashlib.sha1(text.encode("utf-8")).hexdigest()[:16]})
+            pending, pending_chars, pending_start = [], 0, end_line + 1
+
+        size = 0
+        with open(source_path, "rb") as f:
+            while True:
+                block = f.read(READ_BLOCK_BYTES)
+                if not block: break
+                if size == 0 and b"\0" in block[:_BINARY_SNIFF_BYTES]: is_binary = True
+                size += len(block)
+                hasher.update(block)
+                if is_binary: continue
+                lines = (carry + decoder.decode(block)).split("\n")
+                carry = lines.pop()  # 마지막 줄은 다음 블록과 이어질 수 있음
+                for line in lines:
+                    pending.append(line + "\n"); pending_chars += len(line) + 1
+                    if pending_chars >= CHUNK_CHARS: flush(line_no)
+                    line_no += 1
+        if not is_binary:
+            carry += decoder.decode(b"", final=True)
+            if carry: pending.append(carry)
+            flush(line_no if carry else line_no - 1)
+        return {"sha256": hasher.hexdigest(), "size": size, "kind": "binary" if is_binary else "text",
+                "lines": 0 if is_binary else (line_no if carry else line_no - 1), "chunks": chunks}
+
+    def ingest(self, source_path: str) -> Dict[str, Any]:
+        """
+        [Lite] 첨부 파일 하나를 가져옵니다.
+        반환: {"name", "source", "sandbox_path"(샌드박스 기준 상대 경로), "sha256", "size", "kind", "lines", "chunks", "cached"}
+        """
+        st = os.stat(source_path)
+        stat_key = self._stat_key(source_path, st)
+        with self._lock:
+            digest = self._load_stat_index().get(stat_key)
+        extracted = None
+        if digest:
+            try:
+                with open(os.path.join(self.cache_dir, f"{digest}.json"), "r", encoding="utf-8") as f:
+                    extracted = json.load(f)
+            except (OSError, ValueError):
+                extracted = None
+        cached = extracted is not None
+        if cached:
+            self.cache_hits += 1
+        else:
+            extracted = self._extract(source_path)
+            digest = extracted["sha256"]
+            os.makedirs(self.cache_dir, exist_ok=True)
+            atomic_write_text(os.path.join(self.cache_dir, f"{digest}.json"), json.dumps(extracted, ensure_ascii=False))
+            with self._lock:
+                self._load_stat_index()[stat_key] = digest
+                atomic_write_text(os.path.join(self.cache_dir, "stat_index.json"), json.dumps(self._stat_index, ensure_ascii=False))
+
+        name = os.path.basename(source_path)
+        target_path = os.path.join(self.session_dir, f"{digest[:8]}_{name}")
+        if not os.path.exists(target_path):
+            os.makedirs(self.session_dir, exist_ok=True)
+            try:
+                os.link(source_path, target_path)  # 같은 파일 시스템이면 복사 비용 없음
+            except OSError:
+                shutil.copyfile(source_path, target_path)
+        return dict(extracted, name=name, source=source_path, cached=cached,
+                    sandbox_path=os.path.relpath(target_path, self.root))
+
+    def ingest_many(self, source_paths: List[str]) -> List[Dict[str, Any]]:
+        results = []
+        for path in source_paths:
+            try:
+                results.append(self.ingest(path))
+            except OSError as e:
+                results.append({"name": os.path.basename(path), "source": path, "error": str(e), "chunks": []})
+        return results
+
+
+def select_relevant_chunks(attachments: List[Dict[str, Any]], query: str,
+                           budget_chars: int = PROMPT_ATTACHMENT_BUDGET) -> List[Dict[str, Any]]:
+    """
+    [Lite] 사용자 지시와 겹치는 단어가 많은 청크부터 예산 안에서 고릅니다.
+    같은 내용(fingerprint)의 청크는 한 번만, 각 파일의 첫 청크는 동점일 때 우선합니다.
+    반환: [{"attachment", "chunk", "score"}, ...] (파일/줄 순서로 정렬)
+    """
+    query_terms = set(_terms(query))
+    candidates = []
+    for a_index, attachment in enumerate(attachments):
+        for c_index, chunk in enumerate(attachment.get("chunks", [])):
+            chunk_terms = _terms(chunk["text"])
+            score = sum(1 for term in chunk_terms if term in query_terms)
+            candidates.append((-score, c_index, a_index, chunk))
+    candidates.sort(key=lambda item: item[:3])
+    selected, seen, used = [], set(), 0
+    for neg_score, c_index, a_index, chunk in candidates:
+        if chunk["fingerprint"] in seen or used + len(chunk["text"]) > budget_chars: continue
+        seen.add(chunk["fingerprint"]); used += len(chunk["text"])
+        selected.append({"attachment": attachments[a_index], "chunk": chunk, "score": -neg_score,
+                         "_order": (a_index, chunk["start_line"])})
+    selected.sort(key=lambda item: item.pop("_order"))
+    return selected
+
+
+def build_attachment_prompt(attachments: List[Dict[str, Any]], user_text: str,
+                            budget_chars: int = PROMPT_ATTACHMENT_BUDGET) -> str:
+    """ [Lite] 첨부 요약(샌드박스 경로 포함) + 관련 청크만 담은 프롬프트 앞부분 """
+    lines = ["[첨부 파일] (전체 내용이 필요하면 아래 샌드박스 경로로 read_file 사용)"]
+    for attachment in attachments:
+        if attachment.get("error"):
+            lines.append(f"- {attachment['name']}: 가져오기 실패 ({attachment['error']})"); continue
+        detail = f"{attachment['lines']}줄, {len(attachment['chunks'])}개 청크" if attachment["kind"] == "text" else "바이너리 (텍스트 추출 안 함)"
+        lines.append(f"- {attachment['name']} -> {attachment['sandbox_path']} ({attachment['size']} bytes, {detail})")
+    for item in select_relevant_chunks(attachments, user_text, budget_chars):
+        chunk = item["chunk"]
+        lines.append(f"\n[발췌: {item['attachment']['name']} {chunk['start_line']}~{chunk['end_line']}줄]\n{chunk['text'].rstrip()}")
+    return "\n".join(lines)
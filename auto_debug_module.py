@@ -0,0 +1,263 @@
+import ast
+import hashlib
+import os
+import re
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+# [Lite] 자동 디버거 한도
+MAX_ATTEMPTS_PER_FINGERPRINT = 3   # 같은 오류(지문)에 대한 최대 AI 수정 횟수
+MAX_ATTEMPTS_PER_FILE = 8          # 한 파일에서 성공 전까지 허용하는 전체 AI 수정 횟수
+MAX_REGION_LINES = 150             # 전송할 코드 영역의 최대 줄 수
+WINDOW_LINES = 20                  # 구조(ast)로 영역을 못 찾을 때 오류 줄 앞뒤로 보낼 줄 수
+MAX_TRACEBACK_LINES = 25
+MAX_ERROR_MESSAGE_CHARS = 500
+
+_FRAME_RE = re.compile(r'^\s*File "(?P<file>.+?)", line (?P<line>\d+)(?:, in (?P<func>.+))?\s*$')
+_EXC_RE = re.compile(r"^(?P<type>[A-Za-z_][\w.]*(?:Error|Exception|Exit|Interrupt|Warning|Iteration))\b(?::\s?(?P<msg>.*))?$")
+
+
+def _sha1(text: str) -> str:
+    return hashlib.sha1(text.encode("utf-8", "replace")).hexdigest()
+
+
+def estimate_tokens(text: str) -> int:
+    """ (Helper) 대략적인 토큰 수 추정 (문자 4개 ≈ 1토큰) """
+    return max(1, len(text) // 4)
+
+
+def _is_user_frame(frame_file: str, script_path: Optional[str]) -> bool:
+    if not script_path:
+        return True
+    return os.path.basename(frame_file) == os.path.basename(script_path) or \
+        os.path.abspath(frame_file) == os.path.abspath(script_path)
+
+
+def parse_traceback(stderr: str, script_path: Optional[str] = None) -> Dict[str, Any]:
+    """
+    [Lite] stderr에서 트레이스백 정보를 추출합니다.
+    반환 dict: exc_type, message, frames[(file, line, func)], error_line(사용자 파일 기준, 없으면 None)
+    """
+    frames: List[Tuple[str, int, str]] = []
+    exc_type, message = "UnknownError", ""
+    for line in stderr.splitlines():
+        frame_match = _FRAME_RE.match(line)
+        if frame_match:
+            frames.append((frame_match.group("file"), int(frame_match.group("line")), frame_match.group("func") or "<module>"))
+            continue
+        exc_match = _EXC_RE.match(line.strip())
+        if exc_match and not line.startswith(" "):
+            exc_type, message = exc_match.group("type"), (exc_match.group("msg") or "")
+
+    user_frames = [f for f in frames if _is_user_frame(f[0], script_path)]
+    error_line = user_frames[-1][1] if user_frames else None
+    return {"exc_type": exc_type, "message": message, "frames": frames,
+            "user_frames": user_frames, "error_line": error_line}
+
+
+def fingerprint_failure(tb_info: Dict[str, Any]) -> str:
+    """
+    [Lite] 오류 지문: 예외 타입 + 사용자 파일 프레임 위치(파일명:함수).
+    메시지(변수 값 등)와 줄 번호는 제외하므로, 수정으로 줄이 밀려도
+    같은 원인의 반복 실패가 같은 지문을 갖습니다.
+    """
+    frame_parts = [f"{os.path.basename(f)}:{func}" for f, _line, func in tb_info["user_frames"]]
+    return _sha1(tb_info["exc_type"] + "|" + "|".join(frame_parts))[:12]
+
+
+def trim_traceback(stderr: str, script_path: Optional[str] = None) -> str:
+    """ [Lite] 라이브러리 프레임을 생략하고 사용자 프레임 + 마지막 예외만 남깁니다. """
+    lines = stderr.strip().splitlines()
+    kept: List[str] = []
+    skipped = 0
+    i = 0
+    while i < len(lines):
+        line = lines[i]
+        frame_match = _FRAME_RE.match(line)
+        if frame_match:
+            # 프레임 줄 다음의 소스/캐럿 줄은 프레임에 딸린 것으로 취급
+            block = [line]
+            while i + 1 < len(lines) and lines[i + 1].startswith("    ") and not _FRAME_RE.match(lines[i + 1]):
+                i += 1
+                block.append(lines[i])
+            if _is_user_frame(frame_match.group("file"), script_path):
+                if skipped:
+                    kept.append(f"  ... (라이브러리 프레임 {skipped}개 생략)")
+                    skipped = 0
+                kept.extend(block)
+            else:
+                skipped += 1
+        else:
+            if skipped:
+                kept.append(f"  ... (라이브러리 프레임 {skipped}개 생략)")
+                skipped = 0
+            kept.append(line[:MAX_ERROR_MESSAGE_CHARS])
+        i += 1
+    if len(kept) > MAX_TRACEBACK_LINES:
+        kept = kept[:3] + ["  ..."] + kept[-(MAX_TRACEBACK_LINES - 4):]
+    return "\n".join(kept)
+
+
+def extract_failing_region(code: str, error_line: Optional[int]) -> Tuple[int, int]:
+    """
+    [Lite] 오류 줄을 감싸는 가장 안쪽 함수(없으면 클래스)의 줄 범위를 반환합니다. (1-based, 포함)
+    파싱 실패/모듈 레벨/너무 큰 영역이면 오류 줄 주변 창을 사용합니다.
+    """
+    lines = code.splitlines()
+    total = max(1, len(lines))
+    if not error_line or error_line > total:
+        return 1, total
+
+    best: Optional[Tuple[int, int]] = None
+    best_is_func = False
+    try:
+        tree = ast.parse(code)
+        for node in ast.walk(tree):
+            if not isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+                continue
+            start = min([node.lineno] + [d.lineno for d in node.decorator_list])
+            end = getattr(node, "end_lineno", None) or node.lineno
+            if not (start <= error_line <= end):
+                continue
+            is_func = not isinstance(node, ast.ClassDef)
+            # 함수 우선, 같은 종류면 더 안쪽(짧은) 영역
+            if best is None or (is_func and not best_is_func) or \
+                    (is_func == best_is_func and end - start < best[1] - best[0]):
+                best, best_is_func = (start, end), is_func
+    except SyntaxError:
+        best = None
+
+    if best and best[1] - best[0] + 1 <= MAX_REGION_LINES:
+        return best
+    return max(1, error_line - WINDOW_LINES), min(total, error_line + WINDOW_LINES)
+
+
+def get_region_text(code: str, start: int, end: int) -> str:
+    return "\n".join(code.splitlines()[start - 1:end])
+
+
+def replace_region(code: str, start: int, end: int, new_region: str) -> str:
+    """ [Lite] 줄 범위(1-based, 포함)를 새 코드로 교체합니다. """
+    lines = code.splitlines()
+    trailing_newline = code.endswith("\n")
+    new_lines = lines[:start - 1] + new_region.rstrip("\n").splitlines() + lines[end:]
+    return "\n".join(new_lines) + ("\n" if trailing_newline else "")
+
+
+class AutoFixEngine:
+    """
+    [Lite] 자동 디버거 상태 관리.
+    - 트레이스백 지문별 시도 횟수 제한 (같은 오류에 같은 비싼 수정 반복 방지)
+    - 실패 영역 + 요약 트레이스백만 LLM에 전송
+    - (지문, 영역) 별로 이미 시도한 수정을 기억: 성공한 수정은 LLM 없이 재적용,
+      실패한 수정은 다음 프롬프트에 '이미 실패한 시도'로 첨부
+    - 버그별 토큰/지연 사용량과, 해결된 버그의 낭비(실패 시도) 토큰/지연 추적
+    """
+    def __init__(self,
+                 max_attempts_per_fingerprint: int = MAX_ATTEMPTS_PER_FINGERPRINT,
+                 max_attempts_per_file: int = MAX_ATTEMPTS_PER_FILE):
+        self.max_attempts_per_fingerprint = max_attempts_per_fingerprint
+        self.max_attempts_per_file = max_attempts_per_file
+        self.bugs: Dict[str, Dict[str, Any]] = {}            # fingerprint -> 통계
+        self.file_attempts: Dict[str, int] = {}              # file -> 연속 시도 수
+        self.tried_fixes: Dict[str, List[str]] = {}          # (fp:region_hash) -> [실패한 수정 코드]
+        self.verified_fixes: Dict[str, str] = {}             # (fp:region_hash) -> 성공한 수정 코드
+        self.pending: Dict[str, Dict[str, Any]] = {}         # file -> 검증 대기 중인 수정
+
+    def prepare_fix(self, code: str, stderr: str, file_path: Optional[str]) -> Dict[str, Any]:
+        """
+        [Lite] 실패를 분석해 다음 행동을 결정합니다.
+        반환 dict의 action:
+          "llm"    -> region/traceback/failed_attempts로 LLM 수정 요청 필요
+          "cached" -> cached_fix를 LLM 없이 바로 적용
+          "stop"   -> 한도 초과 (message 참고)
+        """
+        file_key = file_path or "<buffer>"
+        # 이전 수정이 검증 대기 중이었는데 다시 실패 -> 이전 수정 결과 반영
+        self._resolve_pending(file_key, stderr, file_path)
+
+        tb_info = parse_traceback(stderr, file_path)
+        fingerprint = fingerprint_failure(tb_info)
+        bug = self.bugs.setdefault(fingerprint, {
+            "exc_type": tb_info["exc_type"], "attempts": 0, "tokens": 0, "latency": 0.0,
+            "wasted_tokens": 0, "wasted_latency": 0.0, "status": "open",
+            "first_seen": time.time(),
+        })
+        start, end = extract_failing_region(code, tb_info["error_line"])
+        region = get_region_text(code, start, end)
+        region_key = f"{fingerprint}:{_sha1(region)[:12]}"
+        base = {"fingerprint": fingerprint, "start_line": start, "end_line": end,
+                "region": region, "region_key": region_key, "exc_type": tb_info["exc_type"]}
+
+        if region_key in self.verified_fixes:
+            return dict(base, action="cached", cached_fix=self.verified_fixes[region_key])
+        if bug["attempts"] >= self.max_attempts_per_fingerprint:
+            bug["status"] = "gave_up"
+            return dict(base, action="stop",
+                        message=f"같은 오류({tb_info['exc_type']}, 지문 {fingerprint})에 대한 자동 수정 한도"
+                                f"({self.max_attempts_per_fingerprint}회)에 도달했습니다. 직접 확인이 필요합니다.")
+        if self.file_attempts.get(file_key, 0) >= self.max_attempts_per_file:
+            return dict(base, action="stop",
+                        message=f"이 파일의 자동 수정 한도({self.max_attempts_per_file}회)에 도달했습니다.")
+
+        return dict(base, action="llm",
+                    traceback=trim_traceback(stderr, file_path),
+                    failed_attempts=list(self.tried_fixes.get(region_key, [])))
+
+    def record_attempt(self, file_path: Optional[str], prepared: Dict[str, Any],
+                       fixed_region: str, prompt_chars: int, latency: float):
+        """ [Lite] LLM 수정 1회를 기록하고 검증 대기 상태로 둡니다. """
+        file_key = file_path or "<buffer>"
+        bug = self.bugs[prepared["fingerprint"]]
+        tokens = max(1, prompt_chars // 4) + estimate_tokens(fixed_region)
+        bug["attempts"] += 1
+        bug["tokens"] += tokens
+        bug["latency"] += latency
+        self.file_attempts[file_key] = self.file_attempts.get(file_key, 0) + 1
+        self.pending[file_key] = dict(prepared, fixed_region=fixed_region, tokens=tokens, latency=latency)
+
+    def _resolve_pending(self, file_key: str, stderr: str, file_path: Optional[str]):
+        attempt = self.pending.pop(file_key, None)
+        if attempt is None:
+            return
+        new_fp = fingerprint_failure(parse_traceback(stderr, file_path))
+        if new_fp == attempt["fingerprint"]:
+            # 같은 오류 재발 -> 이 수정은 실패 (낭비)
+            bug = self.bugs[attempt["fingerprint"]]
+            bug["wasted_tokens"] += attempt["tokens"]
+            bug["wasted_latency"] += attempt["latency"]
+            self.tried_fixes.setdefault(attempt["region_key"], []).append(attempt["fixed_region"])
+        else:
+            # 오류가 바뀜 -> 원래 버그는 해결된 것으로 간주
+            self._mark_fixed(attempt)
+
+    def _mark_fixed(self, attempt: Dict[str, Any]):
+        bug = self.bugs[attempt["fingerprint"]]
+        bug["status"] = "fixed"
+        self.verified_fixes[attempt["region_key"]] = attempt["fixed_region"]
+
+    def record_success(self, file_path: Optional[str]) -> Optional[str]:
+        """ [Lite] 실행 성공 시 호출. 검증 대기 중인 수정이 있으면 해결 보고 문자열을 반환합니다. """
+        file_key = file_path or "<buffer>"
+        self.file_attempts[file_key] = 0
+        attempt = self.pending.pop(file_key, None)
+        if attempt is None:
+            return None
+        self._mark_fixed(attempt)
+        return self.format_bug_report(attempt["fingerprint"])
+
+    def format_bug_report(self, fingerprint: str) -> str:
+        bug = self.bugs[fingerprint]
+        return (f"🧾 [Auto-Fix] 버그 {fingerprint} ({bug['exc_type']}) {bug['status']}: "
+                f"시도 {bug['attempts']}회, 토큰 ~{bug['tokens']} (낭비 ~{bug['wasted_tokens']}), "
+                f"지연 {bug['latency']:.1f}s (낭비 {bug['wasted_latency']:.1f}s)")
+
+    def stats(self) -> Dict[str, Any]:
+        fixed = [b for b in self.bugs.values() if b["status"] == "fixed"]
+        return {
+            "bugs": len(self.bugs),
+            "fixed": len(fixed),
+            "gave_up": sum(1 for b in self.bugs.values() if b["status"] == "gave_up"),
+            "wasted_tokens_per_fixed_bug": (sum(b["wasted_tokens"] for b in fixed) / len(fixed)) if fixed else 0.0,
+            "wasted_latency_per_fixed_bug": (sum(b["wasted_latency"] for b in fixed) / len(fixed)) if fixed else 0.0,
+        }
@@ -0,0 +1,154 @@
+import concurrent.futures
+import hashlib
+import os
+import tempfile
+import threading
+import time
+from typing import Callable, Dict, Iterable, List, Optional
+
+# [Lite] 에디터 자동 저장 설정
+AUTOSAVE_DEBOUNCE_MS = 1500        # 마지막 입력 후 이 시간(ms) 동안 조용하면 저장
+HISTORY_DIR_NAME = ".eidos_history" # 파일과 같은 폴더의 숨김 히스토리 폴더 (파일 트리에서 숨겨짐)
+HISTORY_LIMIT = 5                  # 파일당 보관할 이전 버전 수
+
+
+def content_hash(content: str) -> str:
+    return hashlib.sha1(content.encode("utf-8", "replace")).hexdigest()
+
+
+def _history_dir_for(path: str) -> str:
+    return os.path.join(os.path.dirname(path), HISTORY_DIR_NAME)
+
+
+def list_history(path: str) -> List[str]:
+    """ [Lite] 파일의 로컬 히스토리(이전 버전) 경로 목록. (오래된 순) """
+    history_dir = _history_dir_for(path)
+    prefix = os.path.basename(path) + "."
+    try:
+        names = [n for n in os.listdir(history_dir) if n.startswith(prefix) and n.endswith(".bak")]
+    except OSError:
+        return []
+    return [os.path.join(history_dir, n) for n in sorted(names)]
+
+
+def _keep_previous_version(path: str, history_limit: int):
+    """ (Helper) 덮어쓰기 전에 현재 파일을 히스토리에 보관하고 오래된 버전을 정리합니다. """
+    if history_limit <= 0 or not os.path.exists(path):
+        return
+    history_dir = _history_dir_for(path)
+    os.makedirs(history_dir, exist_ok=True)
+    backup_path = os.path.join(history_dir, f"{os.path.basename(path)}.{time.time_ns()}.bak")
+    # 원본은 곧 os.replace로 교체되므로, 복사 대신 하드링크로 보관 (실패 시 복사)
+    try:
+        os.link(path, backup_path)
+    except OSError:
+        with open(path, "rb") as src, open(backup_path, "wb") as dst:
+            dst.write(src.read())
+    for old_path in list_history(path)[:-history_limit]:
+        try: os.remove(old_path)
+        except OSError: pass
+
+
+def atomic_write_text(path: str, content: str, history_limit: int = 0):
+    """
+    [Lite] 임시 파일에 쓴 뒤 os.replace로 교체합니다. (중간에 실패해도 원본이 깨지지 않음)
+    history_limit > 0이면 이전 버전을 로컬 히스토리에 남깁니다.
+    """
+    atomic_write_chunks(path, (content.encode("utf-8"),), history_limit=history_limit)
+
+
+def atomic_write_chunks(path: str, chunks: Iterable[bytes], history_limit: int = 0,
+                        before_replace: Optional[Callable[[], None]] = None):
+    """
+    [Lite] atomic_write_text의 바이트 조각 버전. 큰 파일을 메모리에 모으지 않고 조각 단위로 씁니다.
+    before_replace는 교체 직전에 호출됩니다. (원본을 mmap으로 읽는 중이면 여기서 닫음, Windows는 열린 mmap을 교체할 수 없음)
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    _keep_previous_version(path, history_limit)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=f".{os.path.basename(path)}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            for chunk in chunks:
+                f.write(chunk)
+            f.flush()
+            os.fsync(f.fileno())
+        if before_replace: before_replace()
+        os.replace(tmp_path, path)
+    except BaseException:
+        try: os.remove(tmp_path)
+        except OSError: pass
+        raise
+
+
+class AutosaveWriter:
+    """
+    [Lite] GUI 스레드 밖에서 자동 저장/직접 저장을 수행하는 단일 쓰기 스레드.
+    파일별 마지막 저장 해시를 기억해 내용이 같으면 쓰기를 건너뜁니다.
+    파일별 세대(generation)를 두어, 작업 제출 후 mark_saved/discard_pending이 호출되었으면(다른 경로로 더 새 내용이 저장됨)
+    그 작업은 쓰지 않습니다. (대기 중이던 오래된 내용이 새 저장을 덮어쓰지 않도록)
+    on_done(path, status, error)는 쓰기 스레드에서 호출되므로 GUI 쪽에서는 Signal로 넘겨야 합니다.
+    status: "saved" | "skipped" | "stale" | "error"
+    """
+    def __init__(self, history_limit: int = HISTORY_LIMIT):
+        self.history_limit = history_limit
+        # 단일 워커: 같은 파일에 대한 쓰기 순서가 보장됨
+        self._executor = concurrent.futures.ThreadPoolExecutor(max_workers=1, thread_name_prefix="eidos-autosave")
+        self._saved_hashes: Dict[str, str] = {}
+        self._generations: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock() # 세대 확인 + 쓰기를 함께 보호 (discard_pending이 진행 중인 쓰기를 기다림)
+
+    def discard_pending(self, path: str):
+        """
+        이 쓰기 스레드를 거치지 않고 파일을 쓰기 직전에 호출합니다. (AI 수정 적용, 되돌리기 등)
+        반환되면 진행 중이던 쓰기는 끝났고, 대기 중인 작업은 쓰지 않습니다.
+        """
+        key = os.path.abspath(path)
+        with self._write_lock, self._lock:
+            self._generations[key] = self._generations.get(key, 0) + 1
+
+    def mark_saved(self, path: str, content: str):
+        """ 파일을 열거나 다른 경로로 저장했을 때 기준 해시를 갱신합니다. (대기 중인 이전 작업은 취소됨) """
+        key = os.path.abspath(path)
+        with self._lock:
+            self._saved_hashes[key] = content_hash(content)
+            self._generations[key] = self._generations.get(key, 0) + 1
+
+    def _write_job(self, path: str, content: str, generation: int,
+                   on_done: Optional[Callable[[str, str, Optional[str]], None]]):
+        key = os.path.abspath(path)
+        digest = content_hash(content)
+        with self._write_lock:
+            with self._lock:
+                stale = self._generations.get(key, 0) != generation
+                unchanged = self._saved_hashes.get(key) == digest
+            if stale:
+                status, error = "stale", None
+            elif unchanged:
+                status, error = "skipped", None
+            else:
+                try:
+                    atomic_write_text(path, content, history_limit=self.history_limit)
+                    with self._lock:
+                        self._saved_hashes[key] = digest
+                    status, error = "saved", None
+                except Exception as e:
+                    status, error = "error", str(e)
+        if on_done:
+            on_done(path, status, error)
+        return status
+
+    def submit(self, path: str, content: str,
+               on_done: Optional[Callable[[str, str, Optional[str]], None]] = None) -> concurrent.futures.Future:
+        """ 쓰기 작업을 예약합니다. Future의 결과는 status. """
+        with self._lock:
+            generation = self._generations.get(os.path.abspath(path), 0)
+        return self._executor.submit(self._write_job, path, content, generation, on_done)
+
+    def flush(self):
+        """ 지금까지 예약된 쓰기가 모두 끝날 때까지 기다립니다. (파일을 다시 읽기 전에) """
+        self._executor.submit(lambda: None).result()
+
+    def shutdown(self, wait: bool = True):
+        self._executor.shutdown(wait=wait)
@@ -1,2 +1,16 @@
 # config.py
 GEMINI_API_KEY = "YOUR_GEMINI_API_KEY_HERE"
+
+# 작업 종류별 실행 풀 (executor_pool_module). 느린 작업이 다른 종류의 작업을 밀어내지 않도록 분리합니다.
+#   kind: "thread" 또는 "process", max_workers: 최대 작업자 수 (None이면 min(4, CPU 수))
+EXECUTOR_POOLS = {
+    "io": {"kind": "thread", "max_workers": 8},      # 파일 읽기/쓰기, 첨부 수집, 프로젝트 검색
+    "llm": {"kind": "thread", "max_workers": 8},     # Gemini API 호출
+    "cpu": {"kind": "process", "max_workers": None}, # SymPy 계산 등 CPU 바운드 작업
+}
+
+# 호출 위치별 생성 설정 덮어쓰기 (기본값: lite_llm_module.DEFAULT_GENERATION_PROFILES)
+#   프로필: plan(계획), code(코드 수정), text(긴 글), chat(대화 응답), suggestion(편집기 추천)
+#   키: model, max_output_tokens, temperature, stop_sequences (지정한 키만 덮어씀)
+#   예: {"chat": {"model": "gemini-1.5-pro", "max_output_tokens": 2048}}
+GENERATION_PROFILES = {}
@@ -0,0 +1,230 @@
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+from typing import Any, Dict, List, Optional, Set
+
+import lite_llm_module
+import metrics_module
+import replay_module
+import triage_module
+from execution_module import SAFE_BASE_PATH
+from executor_pool_module import pool_stats, shutdown_pools
+from eidos_lite_core import EidosLiteCore
+
+# [Lite] 배치(오프라인) 실행 기본값
+BATCH_CONCURRENCY = 4              # 동시에 처리하는 작업 수
+BATCH_LLM_CALLS_PER_MINUTE = 60    # 모든 작업이 공유하는 LLM 호출 속도 제한
+BATCH_LLM_BURST = 4                # 속도 제한 안에서 연속으로 허용하는 호출 수
+
+
+def load_tasks(path: str) -> List[Dict[str, Any]]:
+    """
+    [Lite] 작업 JSONL을 읽습니다. 한 줄에 작업 하나:
+      {"id": "선택", "text": "지시"} 또는 {"template": "{name} 스캐폴드 생성", "vars": {"name": "X"}}
+      (선택) "project_dir": 프로젝트 폴더 이름, "attachments": [첨부 파일 경로, ...]
+    id가 없으면 "line-<줄 번호>"를 사용합니다. (재개 시 같은 작업을 찾는 키)
+    """
+    tasks = []
+    with open(path, "r", encoding="utf-8") as f:
+        for line_no, line in enumerate(f, 1):
+            if not line.strip(): continue
+            try:
+                task = json.loads(line)
+            except json.JSONDecodeError as e:
+                raise ValueError(f"{path}:{line_no}: JSON 파싱 실패 ({e})")
+            if "text" not in task:
+                if "template" not in task:
+                    raise ValueError(f"{path}:{line_no}: 'text' 또는 'template'이 필요합니다.")
+                try:
+                    task["text"] = task["template"].format_map(task.get("vars", {}))
+                except (KeyError, IndexError, ValueError) as e:
+                    raise ValueError(f"{path}:{line_no}: 템플릿 변수 오류 ({e})")
+            task["id"] = str(task.get("id") or f"line-{line_no}")
+            tasks.append(task)
+    ids = [task["id"] for task in tasks]
+    if len(set(ids)) != len(ids):
+        raise ValueError(f"{path}: 중복된 작업 id가 있습니다.")
+    return tasks
+
+
+def load_completed_ids(output_path: str) -> Set[str]:
+    """ [Lite] 결과 파일(체크포인트)에서 성공한 작업 id를 읽습니다. (잘린 마지막 줄은 무시) """
+    completed = set()
+    try:
+        with open(output_path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                if record.get("status") == "ok": completed.add(record.get("id"))
+    except OSError:
+        pass
+    return completed
+
+
+class BatchRunner:
+    """
+    [Lite] 작업 목록을 Core의 process_input으로 동시에(concurrency개) 실행합니다.
+    결과는 작업이 끝날 때마다 출력 JSONL에 한 줄씩 추가하고 flush/fsync하므로,
+    출력 파일 자체가 체크포인트가 됩니다. (중단 후 다시 실행하면 성공한 작업은 건너뜀, 실패한 작업은 재시도)
+    """
+    def __init__(self, core: EidosLiteCore, output_path: str, concurrency: int = BATCH_CONCURRENCY):
+        self.core = core
+        self.output_path = output_path
+        self.concurrency = max(1, concurrency)
+        self._output = None
+        self.counts = {"ok": 0, "error": 0, "skipped": 0}
+
+    def _write_record(self, record: Dict[str, Any]):
+        # 이벤트 루프 스레드에서만 호출되므로 줄 단위 쓰기가 섞이지 않음
+        self._output.write(json.dumps(record, ensure_ascii=False) + "\n")
+        self._output.flush()
+        os.fsync(self._output.fileno())
+
+    async def _run_one(self, task: Dict[str, Any]) -> Dict[str, Any]:
+        started_at = time.time()
+        started = time.monotonic()
+        record: Dict[str, Any] = {"id": task["id"], "text": task["text"], "started_at": started_at}
+        try:
+            (
+                _, _, _, _, _, _,
+                exec_task_state, _,
+                reasoning_log, natural_text, _, outcome
+            ) = await self.core.process_input(
+                task["text"],
+                None,
+                [f"👤 사용자: {task['text']}"],  # 작업끼리 대화 기록을 공유하지 않음
+                project_dir=task.get("project_dir"),
+                attachment_paths=task.get("attachments")
+            )
+            record.update(status="ok" if outcome.get("succeeded") else "error", response=natural_text,
+                          reasoning_log=reasoning_log,
+                          plan=json.dumps(exec_task_state["plan"], ensure_ascii=False) if exec_task_state else None)
+        except Exception as e:
+            record.update(status="error", response=f"{type(e).__name__}: {e}")
+        record["duration"] = round(time.monotonic() - started, 3)
+        return record
+
+    async def run(self, tasks: List[Dict[str, Any]], resume: bool = True) -> Dict[str, int]:
+        completed = load_completed_ids(self.output_path) if resume else set()
+        pending = [task for task in tasks if task["id"] not in completed]
+        self.counts["skipped"] = len(tasks) - len(pending)
+        print(f"📦 [Batch-Lite] 작업 {len(tasks)}개 중 {len(pending)}개 실행 "
+              f"(완료 {self.counts['skipped']}개 건너뜀, 동시 {self.concurrency}개)")
+
+        queue: asyncio.Queue = asyncio.Queue()
+        for task in pending: queue.put_nowait(task)
+        batch_started = time.monotonic()
+
+        async def worker():
+            while True:
+                try:
+                    task = queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    return
+                record = await self._run_one(task)
+                self._write_record(record)
+                self.counts[record["status"]] += 1
+                done = self.counts["ok"] + self.counts["error"]
+                icon = "✅" if record["status"] == "ok" else "❌"
+                print(f"{icon} [Batch-Lite] {done}/{len(pending)} '{task['id']}' ({record['duration']:.1f}s)")
+
+        with open(self.output_path, "a" if resume else "w", encoding="utf-8") as self._output:
+            await asyncio.gather(*(worker() for _ in range(min(self.concurrency, len(pending)) or 1)))
+        self._output = None
+        elapsed = time.monotonic() - batch_started
+        print(f"🏁 [Batch-Lite] 완료: 성공 {self.counts['ok']}, 실패 {self.counts['error']}, "
+              f"건너뜀 {self.counts['skipped']} ({elapsed:.1f}s)")
+        for name, stats in pool_stats().items():
+            if stats["submitted"]:
+                print(f"   - 실행 풀 '{name}': {stats['submitted']}건, 최대 동시 {stats['peak']}/{stats['max_workers']}, "
+                      f"사용률 {stats['utilization']:.0%}")
+        return self.counts
+
+
+def train_triage(result_paths: List[str]) -> int:
+    """ [Lite] 배치 결과(요청 + 계획 유무)로 Core의 요청 분류기를 학습합니다. """
+    try:
+        examples = triage_module.examples_from_results(result_paths)
+    except OSError as e:
+        print(f"❌ [Batch-Lite] 결과 파일 오류: {e}")
+        return 2
+    classifier = triage_module.TriageClassifier(triage_module.model_path(SAFE_BASE_PATH))
+    for text, label in examples:
+        classifier.learn(text, label)
+    classifier.save()
+    print(f"🧭 [Batch-Lite] 요청 분류기 학습: 예시 {len(examples)}개 -> 대화 {classifier.docs['chat']}개, "
+          f"도구 {classifier.docs['tool']}개 누적 ('{classifier.path}', 사용 가능: {classifier.ready})")
+    return 0
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="EIDOS-Lite 배치 실행기: 작업 JSONL을 Core로 처리하고 결과를 JSONL로 기록합니다.")
+    parser.add_argument("tasks", nargs="?", help="작업 JSONL 파일")
+    parser.add_argument("-o", "--output", help="결과 JSONL 파일 (기본: <작업 파일>.results.jsonl, 체크포인트 겸용)")
+    parser.add_argument("-c", "--concurrency", type=int, default=BATCH_CONCURRENCY, help="동시에 실행할 작업 수")
+    parser.add_argument("--rate", type=float, default=BATCH_LLM_CALLS_PER_MINUTE, help="분당 LLM 호출 수 제한 (0이면 제한 없음)")
+    parser.add_argument("--burst", type=int, default=BATCH_LLM_BURST, help="연속으로 허용하는 LLM 호출 수")
+    parser.add_argument("--metrics-port", type=int, help="지정하면 이 포트에서 Prometheus 형식 /metrics 엔드포인트 제공")
+    parser.add_argument("--no-resume", action="store_true", help="기존 결과를 무시하고 처음부터 실행 (결과 파일을 덮어씀)")
+    traffic = parser.add_mutually_exclusive_group()
+    traffic.add_argument("--record", metavar="PATH", help="LLM 호출/도구 실행의 요청, 응답, 시간을 PATH에 기록 (.gz면 압축)")
+    traffic.add_argument("--replay", metavar="PATH", help="API/도구 대신 --record로 기록한 응답을 재생 (부하 테스트, 성능 회귀 추적용)")
+    parser.add_argument("--replay-speed", type=float, default=replay_module.REPLAY_ORIGINAL_SPEED,
+                        help="재생 지연 배율 (1: 기록된 시간 그대로, 0.1: 10배 빠르게, 0: 지연 없음)")
+    parser.add_argument("--replay-strict", action="store_true", help="기록에 없는 요청이 오면 대체 응답 대신 실패 처리")
+    parser.add_argument("--replay-llm-only", action="store_true", help="LLM만 재생하고 도구는 실제로 실행")
+    parser.add_argument("--train-triage", nargs="+", metavar="RESULTS",
+                        help="작업을 실행하지 않고, 결과 JSONL 파일들로 요청 분류기(대화/도구)를 학습해 샌드박스에 저장")
+    args = parser.parse_args(argv)
+
+    if args.train_triage:
+        return train_triage(args.train_triage)
+    if not args.tasks:
+        parser.error("작업 JSONL 파일이 필요합니다.")
+
+    try:
+        tasks = load_tasks(args.tasks)
+    except (OSError, ValueError) as e:
+        print(f"❌ [Batch-Lite] 작업 파일 오류: {e}")
+        return 2
+    output_path = args.output or os.path.splitext(args.tasks)[0] + ".results.jsonl"
+    if args.metrics_port is not None:
+        metrics_module.start_metrics_server(args.metrics_port)
+
+    async def _main() -> Dict[str, int]:
+        if args.replay:
+            replay_module.start_replay(args.replay, args.replay_speed, args.replay_strict,
+                                       replay_tools=not args.replay_llm_only)
+        elif args.record:
+            replay_module.start_recording(args.record)
+        if args.rate > 0 and not args.replay:  # 재생은 API를 호출하지 않으므로 제한 불필요
+            lite_llm_module.set_rate_limiter(lite_llm_module.LLMRateLimiter(args.rate, args.burst))
+        core = EidosLiteCore()
+        try:
+            return await BatchRunner(core, output_path, args.concurrency).run(tasks, resume=not args.no_resume)
+        finally:
+            core.workspace.close()
+            lite_llm_module.set_rate_limiter(None)
+            shutdown_pools()
+            replayer = replay_module.get_replayer()
+            if replayer is not None:
+                summary = replayer.summary()
+                print(f"📼 [Replay-Lite] 재생 {summary['replayed']}건 (대체 {summary['mismatches']}건, 미사용 {summary['unused']}건), "
+                      f"기록 당시 호출 시간 합계 {summary['recorded_seconds']:.1f}s")
+            replay_module.stop()
+
+    try:
+        counts = asyncio.run(_main())
+    except KeyboardInterrupt:
+        print(f"\n⏸️ [Batch-Lite] 중단됨. 같은 명령으로 다시 실행하면 '{output_path}'에서 이어서 진행합니다.")
+        return 130
+    return 1 if counts["error"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
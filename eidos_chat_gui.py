@@ -9,12 +9,26 @@ import re
 import json 
 import subprocess
 import html
+import threading
 
 from eidos_lite_core import EidosLiteCore as EidosCore 
+from eidos_lite_core import SUGGESTION_PREFETCH_IDLE_MS
 from lite_llm_module import ( 
     generate_modification_suggestion_async,
-    modify_code_async
+    modify_code_async,
+    GENERATION_PROFILES
 )
+from sandbox_runner_module import SandboxRunner, format_usage_report
+from autosave_module import AutosaveWriter, AUTOSAVE_DEBOUNCE_MS
+from large_file_module import LargeFileDocument, is_large_file
+from project_search_module import get_project_index, notify_file_changed, notify_path_removed, ProjectSearchIndex
+from snapshot_store_module import get_snapshot_store
+from execution_module import SAFE_BASE_PATH
+from workspace_module import list_projects
+import metrics_module
+from loop_monitor_module import LoopMonitor
+from executor_pool_module import pool_stats, shutdown_pools
+import plan_view_module
 EIDOS_LOADED = True
 
 os.environ["TOKENIZERS_PARALLELISM"] = "false"
@@ -27,7 +41,8 @@ from PySide6.QtWidgets import (
     QLineEdit, QLabel, QPushButton, QFrame, QSplitter, QTextEdit, QPlainTextEdit,
     QCheckBox, QDialog, QFormLayout, QDialogButtonBox,
     QFileDialog, QTreeWidget, QTreeWidgetItem,
-    QMessageBox, QInputDialog, QMenu, QHeaderView, QDockWidget, QMainWindow, QMenuBar
+    QMessageBox, QInputDialog, QMenu, QHeaderView, QDockWidget, QMainWindow, QMenuBar,
+    QListWidget, QListWidgetItem, QComboBox, QTextBrowser
 )
 from PySide6.QtGui import (
     QFont, QColor, QPalette, QIcon, QKeySequence,
@@ -37,7 +52,8 @@ from PySide6.QtGui import (
 QT_MULTIMEDIA_LOADED = False
 WEB_ENGINE_LOADED = False
 
-from collections import deque
+from collections import deque, OrderedDict
+from typing import List, Optional, Tuple
 
 SETTINGS_FILE = "eidos_settings.json"
 THEME_LIGHT = """
@@ -62,26 +78,106 @@ THEME_DARK_MONOCHROME = """
     QPushButton { background-color: #007ACC; color: #FFFFFF; border-radius: 3px; padding: 6px 10px; border: none; }
     QPushButton:hover { background-color: #0056b3; }
 """
-def load_theme_setting() -> str:
+def load_settings() -> dict:
     try:
         if os.path.exists(SETTINGS_FILE):
             with open(SETTINGS_FILE, 'r', encoding='utf-8') as f:
-                return json.load(f).get("theme", "Light")
+                return json.load(f)
     except Exception: pass
-    return "Light"
+    return {}
 
-def save_theme_setting(theme_name: str):
-    settings = {"theme": theme_name}
+def save_setting(key: str, value):
+    """ 설정 파일의 다른 항목은 유지하고 key만 갱신 """
+    settings = load_settings(); settings[key] = value
     try:
         with open(SETTINGS_FILE, 'w', encoding='utf-8') as f:
             json.dump(settings, f, indent=4)
-    except Exception as e: print(f"❌ [Theme] 설정 저장 실패: {e}")
+    except Exception as e: print(f"❌ [Settings] 설정 저장 실패: {e}")
+
+def load_theme_setting() -> str:
+    return load_settings().get("theme", "Light")
+
+def save_theme_setting(theme_name: str):
+    save_setting("theme", theme_name)
+
+# [Lite] 파일 탐색기: 폴더는 펼칠 때 한 단계씩 읽고, 항목이 많으면 이만큼씩 나눠 표시
+FILE_TREE_PAGE_SIZE = 200
+
+class LazyFileTree(QTreeWidget):
+    """
+    (Lite) 파일 탐색기 트리. 새로고침은 최상위 폴더만 읽고, 하위 폴더는 펼칠 때 읽습니다.
+    한 폴더의 항목이 FILE_TREE_PAGE_SIZE개를 넘으면 '더 보기' 항목을 눌러 다음 페이지를 추가합니다.
+    펼쳐 두었던 폴더는 새로고침 후에도 다시 펼칩니다. (그 폴더만 다시 읽음)
+    """
+    PLACEHOLDER_ROLE = Qt.ItemDataRole.UserRole + 1   # 아직 읽지 않은 폴더의 자리 표시 항목
+    MORE_ROLE = Qt.ItemDataRole.UserRole + 2          # '더 보기' 항목: (폴더 경로, 다음 시작 위치)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._expanded_paths: set = set()
+        self.itemExpanded.connect(self._on_item_expanded)
+        self.itemCollapsed.connect(lambda item: self._expanded_paths.discard(item.data(0, Qt.ItemDataRole.UserRole)))
+        self.itemClicked.connect(self._on_item_clicked)
+
+    def refresh(self, root_path: str):
+        self.clear()
+        self._add_entries(self.invisibleRootItem(), root_path, 0)
+
+    def path_item_at(self, pos: QPoint) -> Optional[QTreeWidgetItem]:
+        """ 위치의 파일/폴더 항목 (자리 표시/'더 보기' 항목이면 None) """
+        item = self.itemAt(pos)
+        return item if item is not None and item.data(0, Qt.ItemDataRole.UserRole) else None
+
+    @staticmethod
+    def _list_folder(folder_path: str) -> List[Tuple[str, bool]]:
+        try:
+            with os.scandir(folder_path) as entries:
+                listed = [(entry.name, entry.is_dir()) for entry in entries if not entry.name.startswith('.')]
+        except OSError:
+            return []
+        listed.sort(key=lambda entry: (not entry[1], entry[0].lower())) # 폴더 먼저 (페이지 경계가 새로고침마다 같도록 정렬)
+        return listed
+
+    def _add_entries(self, parent_item: QTreeWidgetItem, folder_path: str, start: int):
+        entries = self._list_folder(folder_path)
+        for name, is_dir in entries[start:start + FILE_TREE_PAGE_SIZE]:
+            path = os.path.join(folder_path, name)
+            item = QTreeWidgetItem([name]); item.setData(0, Qt.ItemDataRole.UserRole, path)
+            parent_item.addChild(item)
+            if is_dir:
+                placeholder = QTreeWidgetItem(["…"]); placeholder.setData(0, self.PLACEHOLDER_ROLE, True)
+                item.addChild(placeholder)
+                if path in self._expanded_paths: item.setExpanded(True)
+        remaining = len(entries) - start - FILE_TREE_PAGE_SIZE
+        if remaining > 0:
+            more = QTreeWidgetItem([f"… {remaining}개 더 보기"])
+            more.setData(0, self.MORE_ROLE, (folder_path, start + FILE_TREE_PAGE_SIZE))
+            parent_item.addChild(more)
+
+    @Slot(QTreeWidgetItem)
+    def _on_item_expanded(self, item: QTreeWidgetItem):
+        path = item.data(0, Qt.ItemDataRole.UserRole)
+        self._expanded_paths.add(path)
+        if item.childCount() == 1 and item.child(0).data(0, self.PLACEHOLDER_ROLE):
+            item.takeChild(0)
+            self._add_entries(item, path, 0)
+
+    @Slot(QTreeWidgetItem, int)
+    def _on_item_clicked(self, item: QTreeWidgetItem, column: int):
+        more = item.data(0, self.MORE_ROLE)
+        if not more: return
+        parent_item = item.parent() or self.invisibleRootItem()
+        parent_item.removeChild(item)
+        self._add_entries(parent_item, *more)
 
 class LineNumberArea(QWidget):
     """ (Lite) 코드 에디터용 줄 번호 위젯 (기존과 동일) """
     def __init__(self, editor: QPlainTextEdit): # [Fix] QTextEdit -> QPlainTextEdit
         super().__init__(editor)
         self.editor = editor
+        # [Lite] 대용량 모드: 에디터에는 한 페이지만 올라가므로 실제 줄 번호 = offset + 블록 번호
+        self.line_offset = 0
+        self.total_lines: Optional[int] = None
         self.update_palette()
 
     def sizeHint(self):
@@ -98,7 +194,7 @@ class LineNumberArea(QWidget):
         painter.setPen(self.text_color)
         while block.isValid() and top <= event.rect().bottom():
             if block.isVisible() and bottom >= event.rect().top():
-                number = str(block_number + 1)
+                number = str(self.line_offset + block_number + 1)
                 painter.drawText(0, top, self.width() - 5, self.editor.fontMetrics().height(), Qt.AlignRight, number)
             block = block.next()
             top = bottom
@@ -106,7 +202,7 @@ class LineNumberArea(QWidget):
             block_number += 1
 
     def calculate_width(self) -> int:
-        digits = len(str(max(1, self.editor.document().blockCount())))
+        digits = len(str(max(1, self.total_lines or self.editor.document().blockCount())))
         space = 10 + self.editor.fontMetrics().horizontalAdvance('9') * digits
         return space
 
@@ -117,9 +213,41 @@ class LineNumberArea(QWidget):
         self.background_color = palette.color(QPalette.ColorRole.AlternateBase)
         self.update()
 
+class LargeFileSearchThread(QThread):
+    """ (Lite) 대용량 파일 백그라운드 검색 (결과를 배치 단위로 점진 전달) """
+    results_found = Signal(list)
+    search_finished = Signal(str, int)
+
+    def __init__(self, document: LargeFileDocument, term: str, parent=None):
+        super().__init__(parent)
+        self.document = document
+        self.term = term
+        self.cancel_event = threading.Event()
+
+    def run(self):
+        count = self.document.search(self.term, self.cancel_event, self.results_found.emit)
+        if not self.cancel_event.is_set(): self.search_finished.emit(self.term, count)
+
+    def cancel(self):
+        self.cancel_event.set(); self.wait()
+
+class ProjectSearchThread(QThread):
+    """ (Lite) 프로젝트 색인 검색 (첫 검색 시 색인 생성, refresh=True면 디스크 변경 반영) """
+    results_ready = Signal(str, list)
+
+    def __init__(self, index: ProjectSearchIndex, query: str, refresh: bool = False, parent=None):
+        super().__init__(parent)
+        self.index = index
+        self.query = query
+        self.refresh = refresh
+
+    def run(self):
+        if self.refresh: self.index.refresh()
+        self.results_ready.emit(self.query, self.index.search(self.query, max_results=500))
+
 class SettingsDialog(QDialog):
     """ (Lite) 설정 다이얼로그 (AGI/Pro 모드 제거, 테마 설정만 유지) """
-    def __init__(self, parent=None, initial_theme: str = "Light"):
+    def __init__(self, parent=None, initial_theme: str = "Light", loop_monitor_enabled: bool = False):
         super().__init__(parent)
         self.setWindowTitle("⚙️ EIDOS-Lite 설정")
         self.setMinimumWidth(350)
@@ -131,6 +259,10 @@ class SettingsDialog(QDialog):
         else: self.theme_combo.setCurrentText("Light")
         self.layout.addRow("GUI 테마:", self.theme_combo)
 
+        self.loop_monitor_check = QCheckBox("이벤트 루프 지연/블로킹 호출 감시 (추론 로그에 기록)", self)
+        self.loop_monitor_check.setChecked(loop_monitor_enabled)
+        self.layout.addRow("진단:", self.loop_monitor_check)
+
         self.account_button = QPushButton("🔑 API 키 관리 (config.py)")
         self.account_button.clicked.connect(lambda: QMessageBox.information(self, "API 키", "config.py 파일을 직접 수정하여 Gemini API 키를 입력하세요."))
         self.layout.addRow("계정:", self.account_button)
@@ -142,6 +274,86 @@ class SettingsDialog(QDialog):
     def get_selected_theme(self) -> str:
         return "Dark" if "Dark" in self.theme_combo.currentText() else "Light"
 
+    def is_loop_monitor_enabled(self) -> bool:
+        return self.loop_monitor_check.isChecked()
+
+class PlanDetailDialog(QDialog):
+    """
+    (Lite) 작업 계획 세부 보기. 단계 목록은 페이지 단위로 만들고, 단계 인수/파일 내용은 선택할 때만 읽어 표시합니다.
+    (Core가 만든 계획 객체를 참조만 하며 복사하거나 HTML로 만들지 않음)
+    """
+    def __init__(self, plan: list, summary: dict, parent=None):
+        super().__init__(parent)
+        self.plan = plan
+        self.step_page = 0; self.file_page = 0
+        self.current_files: list = []
+        self.setWindowTitle(f"📋 작업 계획 ({summary['step_count']}단계, 파일 {summary['file_count']}개)")
+        self.resize(900, 600)
+        splitter = QSplitter(Qt.Orientation.Horizontal, self)
+
+        left = QWidget(splitter); left_layout = QVBoxLayout(left)
+        self.step_list = QListWidget(left)
+        self.step_list.currentItemChanged.connect(self._on_step_selected)
+        step_nav, self.step_page_label = self._page_controls(left, self._show_step_page)
+        left_layout.addWidget(self.step_list); left_layout.addLayout(step_nav)
+
+        right = QWidget(splitter); right_layout = QVBoxLayout(right)
+        self.detail_view = QPlainTextEdit(right); self.detail_view.setReadOnly(True)
+        right_layout.addWidget(self.detail_view)
+        self.files_panel = QWidget(right); files_layout = QVBoxLayout(self.files_panel)
+        files_layout.setContentsMargins(0, 0, 0, 0)
+        self.file_list = QListWidget(self.files_panel)
+        self.file_list.currentItemChanged.connect(self._on_file_selected)
+        file_nav, self.file_page_label = self._page_controls(self.files_panel, self._show_file_page)
+        self.file_preview = QPlainTextEdit(self.files_panel); self.file_preview.setReadOnly(True)
+        files_layout.addWidget(self.file_list); files_layout.addLayout(file_nav); files_layout.addWidget(self.file_preview)
+        right_layout.addWidget(self.files_panel)
+
+        layout = QVBoxLayout(self); layout.addWidget(splitter)
+        splitter.setSizes([350, 550])
+        self._show_step_page()
+
+    def _page_controls(self, parent: QWidget, on_move) -> Tuple[QHBoxLayout, QLabel]:
+        row = QHBoxLayout()
+        prev_button = QPushButton("◀", parent); next_button = QPushButton("▶", parent)
+        label = QLabel(parent); label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        prev_button.clicked.connect(lambda: on_move(-1)); next_button.clicked.connect(lambda: on_move(1))
+        row.addWidget(prev_button); row.addWidget(label, 1); row.addWidget(next_button)
+        return row, label
+
+    def _show_step_page(self, delta: int = 0):
+        entries, self.step_page, page_count = plan_view_module.page(self.plan, self.step_page + delta, plan_view_module.PLAN_PAGE_SIZE)
+        self.step_list.clear()
+        for index, step in entries:
+            item = QListWidgetItem(f"{index + 1}. {step.get('tool', 'N/A')}  {plan_view_module.step_label(step)}")
+            item.setData(Qt.ItemDataRole.UserRole, index)
+            self.step_list.addItem(item)
+        self.step_page_label.setText(f"{self.step_page + 1} / {page_count} 페이지 (전체 {len(self.plan)}단계)")
+        if entries: self.step_list.setCurrentRow(0)
+
+    @Slot(QListWidgetItem, QListWidgetItem)
+    def _on_step_selected(self, item: Optional[QListWidgetItem], _previous=None):
+        if item is None: return
+        step = self.plan[item.data(Qt.ItemDataRole.UserRole)]
+        self.detail_view.setPlainText(plan_view_module.step_detail(step))
+        self.current_files = plan_view_module.step_files(step)
+        self.files_panel.setVisible(bool(self.current_files))
+        self.file_page = 0
+        self._show_file_page()
+
+    def _show_file_page(self, delta: int = 0):
+        entries, self.file_page, page_count = plan_view_module.page(self.current_files, self.file_page + delta, plan_view_module.PLAN_FILES_PAGE_SIZE)
+        self.file_list.clear(); self.file_preview.clear()
+        for index, entry in entries:
+            item = QListWidgetItem(entry[0]); item.setData(Qt.ItemDataRole.UserRole, index)
+            self.file_list.addItem(item)
+        self.file_page_label.setText(f"{self.file_page + 1} / {page_count} 페이지 (파일 {len(self.current_files)}개)")
+
+    @Slot(QListWidgetItem, QListWidgetItem)
+    def _on_file_selected(self, item: Optional[QListWidgetItem], _previous=None):
+        if item is None: return
+        self.file_preview.setPlainText(plan_view_module.file_preview(self.current_files[item.data(Qt.ItemDataRole.UserRole)]))
+
 class EidosWorker(QThread):
     """ (Lite) GUI와 Lite Core를 연결하는 워커 (단순화됨) """
     
@@ -150,7 +362,9 @@ class EidosWorker(QThread):
     error_occurred = Signal(str)
     
     code_modification_ready = Signal(dict)
+    project_modification_ready = Signal(dict)
     suggestion_ready = Signal(str)
+    sandbox_run_finished = Signal(dict)
     
     def __init__(self):
         super().__init__()
@@ -158,27 +372,83 @@ class EidosWorker(QThread):
         self.loop: Optional[asyncio.AbstractEventLoop] = None
         self.session: Optional[aiohttp.ClientSession] = None
         self.stop_event: Optional[asyncio.Event] = None
+        self.sandbox_runner: Optional[SandboxRunner] = None
+        self.loop_monitor: Optional[LoopMonitor] = None
+        self.loop_monitor_enabled = bool(load_settings().get("loop_monitor", False))
+        self.pending_futures: set = set() # 제출 후 끝나지 않은 작업 (지표 수집 여부와 무관하게 추적)
         
-    async def request_modification_suggestion_async(self, current_code: str, chat_history: List[str]):
-        """ (Lite) 코드 추천 요청을 Core로 전달 (기존과 동일) """
+    async def request_modification_suggestion_async(self, current_code: str, chat_history: List[str],
+                                                    current_file_path: Optional[str] = None, cursor_line: Optional[int] = None):
+        """ (Lite) 코드 추천 요청을 Core로 전달 (파일 경로/커서 줄은 심볼 컨텍스트용) """
         if not self.eidos_core: return
         try:
-            suggestion_text = await self.eidos_core.request_modification_suggestion_async(current_code, chat_history)
+            suggestion_text = await self.eidos_core.request_modification_suggestion_async(
+                current_code, chat_history, current_file_path, cursor_line)
             self.suggestion_ready.emit(suggestion_text)
         except Exception as e:
             self.error_occurred.emit(f"[Suggestion] 오류: {e}")
 
-    async def request_code_modification_async(self, current_code: str, user_request: str, new_file_name: Optional[str], current_file_path: Optional[str]):
-        """ (Lite) 코드 수정 요청을 Core로 전달 (기존과 동일) """
+    async def prefetch_modification_suggestion_async(self, current_code: str, chat_history: List[str],
+                                                     current_file_path: Optional[str] = None, cursor_line: Optional[int] = None):
+        """ (Lite) 에디터가 한가할 때 코드 추천을 미리 계산 (결과는 Core 캐시에 저장, 신호 없음) """
+        if not self.eidos_core: return
+        try:
+            await self.eidos_core.prefetch_modification_suggestion_async(
+                current_code, chat_history, current_file_path, cursor_line)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            print(f"⚠️ [Worker-Lite] 추천 미리 계산 실패: {e}")
+
+    async def request_code_modification_async(self, current_code: str, user_request: str, new_file_name: Optional[str],
+                                              current_file_path: Optional[str], cursor_line: Optional[int] = None):
+        """ (Lite) 코드 수정 요청을 Core로 전달 (긴 파이썬 파일은 Core가 커서 위치 심볼만 수정) """
         if not self.eidos_core: return
         try:
             response_dict = await self.eidos_core.request_code_modification_async(
-                current_code, user_request, new_file_name, current_file_path
+                current_code, user_request, new_file_name, current_file_path, cursor_line
             )
             self.code_modification_ready.emit(response_dict)
         except Exception as e:
             self.error_occurred.emit(f"[Code Modify] 오류: {e}")
 
+    async def request_project_modification_async(self, user_request: str, project_root: str, current_file_path: Optional[str],
+                                                 current_code: Optional[str], cursor_line: Optional[int]):
+        """ (Lite) 여러 파일에 걸친 코드 수정을 Core로 전달 (결과는 하나의 변경 묶음으로 적용됨) """
+        if not self.eidos_core: return
+        try:
+            result = await self.eidos_core.request_project_modification_async(
+                user_request, project_root, current_file_path, current_code, cursor_line)
+            self.project_modification_ready.emit(result)
+        except Exception as e:
+            self.error_occurred.emit(f"[Code Modify] 프로젝트 수정 오류: {e}")
+
+    async def request_auto_fix_async(self, current_code: str, error_output: str, current_file_path: Optional[str]):
+        """ (Lite) 자동 디버거 요청을 Core로 전달 (지문/시도 제한은 Core가 관리) """
+        if not self.eidos_core: return
+        try:
+            response_dict = await self.eidos_core.request_auto_fix_async(current_code, error_output, current_file_path)
+            self.code_modification_ready.emit(response_dict)
+        except Exception as e:
+            self.error_occurred.emit(f"[Code Modify] 자동 디버깅 오류: {e}")
+
+    async def run_sandbox_script_async(self, script_path: str):
+        """ (Lite) 코드 미리보기를 샌드박스 워커 풀에서 실행 (GUI 스레드 차단 없음) """
+        try:
+            if self.sandbox_runner is None:
+                self.sandbox_runner = SandboxRunner()
+            result = await self.sandbox_runner.run_script_async(script_path)
+            result["script_path"] = script_path
+            if self.eidos_core and not (result.get("stderr") or result.get("returncode") or result.get("timed_out")):
+                # 실행 성공 -> 자동 디버거에 알려 해결된 버그의 비용을 집계
+                result["auto_fix_report"] = self.eidos_core.report_run_success(script_path)
+            self.sandbox_run_finished.emit(result)
+        except Exception as e:
+            self.sandbox_run_finished.emit({
+                "script_path": script_path, "returncode": -1, "stdout": "",
+                "stderr": f"알 수 없는 실행 오류: {e}", "timed_out": False,
+            })
+
     async def async_main(self):
         """ (Lite) 메인 루프 (자율성 Heartbeat 제거) """
         try:
@@ -196,8 +466,16 @@ class EidosWorker(QThread):
                     return
                 
                 self.stop_event = asyncio.Event()
+                self._apply_loop_monitor(self.loop_monitor_enabled)
+                # 코드 미리보기용 warm 워커를 미리 띄워 첫 실행 지연을 줄임
+                self.sandbox_runner = SandboxRunner()
+                await self.sandbox_runner.warm_up()
                 print("[Worker-Lite] 대기 모드 시작. (자율성 없음)")
                 await self.stop_event.wait() # 중지 신호가 올 때까지 영원히 대기
+                self._apply_loop_monitor(False)
+                await self.sandbox_runner.shutdown()
+                self.eidos_core.workspace.close() # 활성 프로젝트들의 대화 기록 저장
+                shutdown_pools(wait=False)
 
         except Exception as e:
             self.error_occurred.emit(f"[async_main] 오류: {e}")
@@ -213,7 +491,8 @@ class EidosWorker(QThread):
             if self.loop and not self.loop.is_closed(): self.loop.close()
             print("[Worker-Lite] 이벤트 루프 종료됨.")
 
-    async def _process_async(self, text: str, chat_history: Optional[list] = None, project_dir: Optional[str] = None):
+    async def _process_async(self, text: str, chat_history: Optional[list] = None, project_dir: Optional[str] = None,
+                             attachment_paths: Optional[List[str]] = None):
         """ (Lite) Core의 process_input 호출 (단순화됨) """
         if not EIDOS_LOADED or not self.eidos_core:
             self.error_occurred.emit("EIDOS Lite Core가 로드되지 않았습니다.")
@@ -228,7 +507,8 @@ class EidosWorker(QThread):
                  text,
                  None, # image_input (무시)
                  chat_history,
-                 project_dir=project_dir
+                 project_dir=project_dir,
+                 attachment_paths=attachment_paths
              )
             
             print(f"  [Worker-Lite] Core 응답 수신. Policy: {policy_state}")
@@ -242,9 +522,35 @@ class EidosWorker(QThread):
             self.error_occurred.emit(f"[EIDOS-Lite Core 오류]: {e}")
 
     def submit_task(self, coro):
+        """ 워커 루프에 코루틴 제출. 반환된 Future로 취소할 수 있습니다. (루프가 없으면 None) """
         if self.loop and self.loop.is_running():
-            asyncio.run_coroutine_threadsafe(coro, self.loop)
+            future = asyncio.run_coroutine_threadsafe(coro, self.loop)
+            self.pending_futures.add(future)
+            metrics_module.WORKER_QUEUE_DEPTH.set(len(self.pending_futures))
+            future.add_done_callback(self._on_task_done)
+            return future
+        coro.close()
+        return None
             
+    def _on_task_done(self, future):
+        # 지표가 꺼져 있던 동안 끝난 작업도 빠지도록 inc/dec 대신 현재 개수를 set
+        self.pending_futures.discard(future)
+        metrics_module.WORKER_QUEUE_DEPTH.set(len(self.pending_futures))
+
+    def set_loop_monitor_enabled(self, enabled: bool):
+        """ (GUI 스레드) 설정 변경 시 루프 모니터를 켜거나 끕니다. (루프 스레드에서 적용) """
+        self.loop_monitor_enabled = enabled
+        if self.loop and self.loop.is_running():
+            self.loop.call_soon_threadsafe(self._apply_loop_monitor, enabled)
+
+    def _apply_loop_monitor(self, enabled: bool):
+        if enabled and self.loop_monitor is None:
+            self.loop_monitor = LoopMonitor(self.loop)
+            self.loop_monitor.start()
+        elif not enabled and self.loop_monitor is not None:
+            self.loop_monitor.stop(); self.loop_monitor = None
+        if self.eidos_core: self.eidos_core.loop_monitor = self.loop_monitor
+
     def stop_loop(self):
         if self.loop and self.stop_event:
             self.loop.call_soon_threadsafe(self.stop_event.set)
@@ -266,6 +572,7 @@ class MainHubWindow(QMainWindow):
         self.setCentralWidget(self.chat_window)
 
         self._setup_dock_widgets()
+        self._setup_stats_dock()
         self._setup_menu_bar()
 
     def apply_theme(self, theme_name: str):
@@ -282,8 +589,14 @@ class MainHubWindow(QMainWindow):
     @Slot()
     def _open_settings(self):
         """ (Lite) 단순화된 설정 다이얼로그 호출 """
-        dialog = SettingsDialog(self, initial_theme=self.current_theme)
+        dialog = SettingsDialog(self, initial_theme=self.current_theme,
+                                loop_monitor_enabled=self.eidos_worker.loop_monitor_enabled)
         if dialog.exec():
+            monitor_enabled = dialog.is_loop_monitor_enabled()
+            if monitor_enabled != self.eidos_worker.loop_monitor_enabled:
+                save_setting("loop_monitor", monitor_enabled)
+                self.eidos_worker.set_loop_monitor_enabled(monitor_enabled)
+                self.chat_window.append_message(f"<b>[시스템]</b> 이벤트 루프 모니터 {'켜짐' if monitor_enabled else '꺼짐'}.", "system")
             new_theme = dialog.get_selected_theme()
             if new_theme != self.current_theme:
                 self.apply_theme(new_theme)
@@ -293,7 +606,7 @@ class MainHubWindow(QMainWindow):
         """ (Lite) 파일 탐색기 도크 (기존과 동일) """
         self.file_dock = QDockWidget("📁 EIDOS 파일 탐색기", self)
         self.file_dock.setAllowedAreas(Qt.DockWidgetArea.RightDockWidgetArea)
-        self.file_tree = QTreeWidget(self)
+        self.file_tree = LazyFileTree(self)
         self.file_tree.setHeaderLabels(["파일 및 폴더"])
         self.file_tree.header().setSectionResizeMode(0, QHeaderView.ResizeMode.Stretch)
         self.file_tree.setContextMenuPolicy(Qt.ContextMenuPolicy.CustomContextMenu)
@@ -341,18 +654,10 @@ class MainHubWindow(QMainWindow):
             QMessageBox.critical(self, "에디터 열기 오류", f"에디터 열기 실패: {e}")
 
     def _refresh_file_tree(self):
-        self.file_tree.clear()
         if not os.path.exists(self.project_root): os.makedirs(self.project_root)
-        self._populate_tree(self.project_root, self.file_tree.invisibleRootItem())
-    def _populate_tree(self, folder_path: str, parent_item: QTreeWidgetItem):
-        for name in os.listdir(folder_path):
-            if name.startswith('.'): continue
-            path = os.path.join(folder_path, name)
-            item = QTreeWidgetItem([name]); item.setData(0, Qt.ItemDataRole.UserRole, path)
-            if os.path.isdir(path): self._populate_tree(path, item)
-            parent_item.addChild(item)
+        self.file_tree.refresh(self.project_root)
     def _file_tree_context_menu(self, pos: QPoint):
-        item = self.file_tree.itemAt(pos); menu = QMenu(self)
+        item = self.file_tree.path_item_at(pos); menu = QMenu(self)
         if item is None:
             menu.addAction("📄 새 파일 (루트)").triggered.connect(lambda: self._create_new_item(self.file_tree.invisibleRootItem(), is_file=True, is_root=True))
             menu.addAction("📁 새 폴더 (루트)").triggered.connect(lambda: self._create_new_item(self.file_tree.invisibleRootItem(), is_file=False, is_root=True))
@@ -382,6 +687,7 @@ class MainHubWindow(QMainWindow):
             try:
                 if os.path.isdir(file_path): shutil.rmtree(file_path)
                 else: os.remove(file_path)
+                notify_path_removed(file_path)
                 self._refresh_file_tree()
             except Exception as e: QMessageBox.critical(self, "삭제 오류", f"삭제 실패: {e}")
     def _rename_item(self, item: QTreeWidgetItem): QMessageBox.information(self, "안내", "이름 바꾸기는 아직 지원되지 않습니다.")
@@ -395,8 +701,86 @@ class MainHubWindow(QMainWindow):
         settings_action = QAction("⚙️ GUI 테마 설정", self)
         settings_action.triggered.connect(self._open_settings)
         settings_menu.addAction(settings_action)
+        edit_menu = menu_bar.addMenu("편집(&E)")
+        edit_menu.addAction("↩️ 마지막 AI 계획 되돌리기", self._undo_last_plan)
+        edit_menu.addAction("↪️ AI 계획 다시 적용", self._redo_last_plan)
+        edit_menu.addAction("🔍 마지막 AI 계획 변경 내용 (diff)", self._show_last_plan_diff)
         view_menu = menu_bar.addMenu("보기(&V)")
         view_menu.addAction(self.file_dock.toggleViewAction())
+        view_menu.addAction(self.stats_dock.toggleViewAction())
+
+    # --- [Lite] 성능 통계 패널 (패널이 보이는 동안만 지표 수집/갱신, 닫으면 수집 중지) ---
+    def _setup_stats_dock(self):
+        self.stats_dock = QDockWidget("📊 성능 통계", self)
+        self.stats_dock.setAllowedAreas(Qt.DockWidgetArea.RightDockWidgetArea | Qt.DockWidgetArea.BottomDockWidgetArea)
+        self.stats_label = QLabel(self.stats_dock)
+        self.stats_label.setTextFormat(Qt.TextFormat.RichText)
+        self.stats_label.setAlignment(Qt.AlignmentFlag.AlignTop | Qt.AlignmentFlag.AlignLeft)
+        self.stats_dock.setWidget(self.stats_label)
+        self.addDockWidget(Qt.DockWidgetArea.RightDockWidgetArea, self.stats_dock)
+        self.stats_dock.hide()
+        self.stats_timer = QTimer(self)
+        self.stats_timer.setInterval(2000)
+        self.stats_timer.timeout.connect(self._refresh_stats_panel)
+        self.stats_dock.visibilityChanged.connect(self._on_stats_visibility_changed)
+
+    @Slot(bool)
+    def _on_stats_visibility_changed(self, visible: bool):
+        if visible:
+            metrics_module.REGISTRY.enable()
+            metrics_module.WORKER_QUEUE_DEPTH.set(len(self.eidos_worker.pending_futures))
+            self._refresh_stats_panel(); self.stats_timer.start()
+        else:
+            self.stats_timer.stop()
+            metrics_module.REGISTRY.disable() # 기본은 꺼짐 (기록 호출은 플래그 확인만), 이미 모은 값은 다시 열면 이어서 표시
+
+    @Slot()
+    def _refresh_stats_panel(self):
+        stats = metrics_module.snapshot()
+        ratio = lambda r: "-" if r is None else f"{r:.0%}"
+        llm, tool = stats["llm"], stats["tool"]
+        rows = [
+            ("LLM 호출", f"{llm['count']}회 (오류 {stats['llm_errors']})"),
+            ("LLM 지연", f"평균 {llm['avg']:.2f}s / p95 ≤ {llm['p95']:g}s"),
+            ("토큰 (입력/출력)", f"{stats['tokens_in']:,} / {stats['tokens_out']:,}"),
+            ("도구 실행", f"{tool['count']}회, 평균 {tool['avg']:.3f}s"),
+            ("도구 캐시 적중률", ratio(stats["tool_cache_hit_ratio"])),
+            ("추천 캐시 적중률", ratio(stats["suggestion_cache_hit_ratio"])),
+            ("워커 대기열", f"{stats['queue_depth']:g}"),
+            ("요청 / 실패한 계획", f"{stats['plans']:g} / {stats['plan_failures']:g}"),
+            ("플래너 생략 (대화 분류)", f"{stats['triage_chat']:g} / {stats['triage_total']:g}"),
+        ]
+        for profile, summary in stats["llm_profiles"].items():
+            model_name = GENERATION_PROFILES.get(profile, {}).get("model", "?")
+            rows.append((f"LLM '{profile}'", f"{model_name}: {summary['count']}회, 평균 {summary['avg']:.2f}s, "
+                                             f"출력 {summary['tokens_out']:,} 토큰"))
+        for name, pool in pool_stats().items():
+            rows.append((f"실행 풀 '{name}'", f"사용 중 {pool['active']}/{pool['max_workers']}, 대기 {pool['queued']}, "
+                                            f"완료 {pool['completed']}, 사용률 {pool['utilization']:.0%}"))
+        self.stats_label.setText("<table cellpadding='3'>" + "".join(
+            f"<tr><td><b>{name}</b></td><td>{html.escape(value)}</td></tr>" for name, value in rows) + "</table>")
+
+    # --- [Lite] AI 계획 스냅샷 (변경 묶음 단위 되돌리기/다시 적용) ---
+    def _report_plan_history(self, result: Optional[dict], tag: str):
+        if result is None:
+            QMessageBox.information(self, tag, "적용할 AI 계획 기록이 없습니다."); return
+        message = f"'{result['label']}' (스냅샷 {result['changeset']}): {len(result['restored'])}개 파일 복원"
+        if result["conflicts"]:
+            message += f"\n이후에 수정되어 건너뛴 파일: {', '.join(result['conflicts'])}"
+        self.chat_window.append_message(f"<i>[{tag}] {html.escape(message)}</i>", "system")
+        self._refresh_file_tree()
+    @Slot()
+    def _undo_last_plan(self): self._report_plan_history(get_snapshot_store(SAFE_BASE_PATH).undo(), "계획 되돌리기")
+    @Slot()
+    def _redo_last_plan(self): self._report_plan_history(get_snapshot_store(SAFE_BASE_PATH).redo(), "계획 다시 적용")
+    @Slot()
+    def _show_last_plan_diff(self):
+        store = get_snapshot_store(SAFE_BASE_PATH); changesets = store.list_changesets()
+        if not changesets: QMessageBox.information(self, "변경 내용", "기록된 AI 변경이 없습니다."); return
+        dialog = QDialog(self); dialog.setWindowTitle(f"변경 내용 - {changesets[-1]['label']}"); dialog.resize(800, 600)
+        viewer = QPlainTextEdit(dialog); viewer.setReadOnly(True); viewer.setFont(QFont("Consolas", 9))
+        viewer.setPlainText(store.diff_changeset(changesets[-1]["id"]) or "(변경 없음)")
+        QVBoxLayout(dialog).addWidget(viewer); dialog.exec()
 
     def closeEvent(self, event):
         self.chat_window.closeEvent(event)
@@ -404,6 +788,8 @@ class MainHubWindow(QMainWindow):
 
 class CodeEditorWindow(QWidget):
     """ (Lite) 코드 에디터 (QA 패널 제거) """
+    autosave_finished = Signal(str, str, str) # (path, status, error) - 쓰기 스레드 -> GUI 스레드
+
     def __init__(self, parent=None, project_dir: str = "eidos_files/default_project", eidos_worker: Optional['EidosWorker'] = None, chat_history_deque: Optional[deque] = None):
         super().__init__(parent)
         self.setWindowTitle(f"EIDOS Code Editor (Lite) - {project_dir}")
@@ -412,18 +798,43 @@ class CodeEditorWindow(QWidget):
         self.project_root = os.path.abspath(project_dir)
         self.current_file_path: Optional[str] = None
         self.eidos_worker = eidos_worker
-        self.code_before_ai_modification: Optional[str] = None
+        # [Lite] AI 수정은 샌드박스 스냅샷 저장소에 기록 (파일별 여러 단계 되돌리기/다시 적용)
+        self.snapshot_store = get_snapshot_store(SAFE_BASE_PATH)
         self.chat_history_deque = chat_history_deque if chat_history_deque else deque(maxlen=30)
-        self.autosave_timer = QTimer(self); self.autosave_timer.setInterval(30000); self.autosave_timer.timeout.connect(self._autosave_file); self.autosave_timer.start()
+        # [Lite] 자동 저장: 입력이 멈춘 뒤(디바운스) 문서가 수정된 경우에만, GUI 스레드 밖에서 원자적으로 저장
+        self.autosave_writer = AutosaveWriter()
+        self.autosave_timer = QTimer(self); self.autosave_timer.setSingleShot(True); self.autosave_timer.setInterval(AUTOSAVE_DEBOUNCE_MS)
+        self.autosave_timer.timeout.connect(self._autosave_file)
+        self._autosave_revision: Optional[int] = None
+        self.autosave_finished.connect(self._on_autosave_finished)
+        # [Lite] 코드 추천 미리 계산: 파일이 열린 채 입력이 멈추면 백그라운드 요청, 버퍼가 바뀌면 취소
+        self.prefetch_timer = QTimer(self); self.prefetch_timer.setSingleShot(True); self.prefetch_timer.setInterval(SUGGESTION_PREFETCH_IDLE_MS)
+        self.prefetch_timer.timeout.connect(self._prefetch_suggestion)
+        self._prefetch_future = None
 
         main_splitter = QSplitter(Qt.Horizontal)
         
-        self.file_tree = QTreeWidget(self); self.file_tree.setHeaderLabels(["File Name"])
+        self.file_tree = LazyFileTree(self); self.file_tree.setHeaderLabels(["File Name"])
         self.file_tree.header().setSectionResizeMode(0, QHeaderView.ResizeMode.Stretch)
         self.file_tree.setContextMenuPolicy(Qt.ContextMenuPolicy.CustomContextMenu)
         self.file_tree.customContextMenuRequested.connect(self._file_tree_context_menu)
         self.file_tree.itemDoubleClicked.connect(self._open_file_in_editor)
         
+        # [Lite] 프로젝트 검색 패널 (트라이그램 색인, 파일 트리 아래)
+        self.project_index = get_project_index(self.project_root)
+        self.project_index_stale = False
+        self.project_search_thread: Optional[ProjectSearchThread] = None
+        project_search_panel = QWidget(); project_search_layout = QVBoxLayout(project_search_panel)
+        project_search_layout.setContentsMargins(0, 0, 0, 0)
+        self.project_search_input = QLineEdit(self); self.project_search_input.setPlaceholderText("🔍 프로젝트에서 찾기 (Ctrl+Shift+F)")
+        self.project_search_input.returnPressed.connect(self._run_project_search)
+        self.project_search_results = QListWidget(self)
+        self.project_search_results.itemActivated.connect(self._open_project_search_result)
+        project_search_layout.addWidget(self.project_search_input); project_search_layout.addWidget(self.project_search_results)
+        left_splitter = QSplitter(Qt.Vertical)
+        left_splitter.addWidget(self.file_tree); left_splitter.addWidget(project_search_panel)
+        left_splitter.setSizes([400, 200])
+        
         editor_console_splitter = QSplitter(Qt.Vertical)
 
         self.code_editor = QPlainTextEdit(self)
@@ -442,7 +853,7 @@ class CodeEditorWindow(QWidget):
         editor_console_splitter.setSizes([400, 150])
         
 
-        main_splitter.addWidget(self.file_tree)
+        main_splitter.addWidget(left_splitter)
         main_splitter.addWidget(editor_console_splitter)
         main_splitter.setSizes([250, 650]) 
         
@@ -455,6 +866,20 @@ class CodeEditorWindow(QWidget):
         search_layout.addWidget(self.find_next_button); search_layout.addWidget(self.find_prev_button)
         search_layout.addWidget(self.close_search_button); self.search_bar.setVisible(False)
         layout.addWidget(self.search_bar)
+
+        # [Lite] 대용량 모드 (mmap 페이지 로딩, 페이지 단위 편집) UI
+        self.large_doc: Optional[LargeFileDocument] = None; self.large_page = 0
+        self.large_search_thread: Optional[LargeFileSearchThread] = None
+        self.large_file_bar = QFrame(self); large_layout = QHBoxLayout(self.large_file_bar)
+        self.large_page_label = QLabel("", self)
+        self.large_prev_button = QPushButton("◀ 이전 페이지"); self.large_prev_button.clicked.connect(lambda: self._load_large_page(self.large_page - 1))
+        self.large_next_button = QPushButton("다음 페이지 ▶"); self.large_next_button.clicked.connect(lambda: self._load_large_page(self.large_page + 1))
+        large_layout.addWidget(self.large_page_label); large_layout.addStretch()
+        large_layout.addWidget(self.large_prev_button); large_layout.addWidget(self.large_next_button)
+        self.large_file_bar.setVisible(False); layout.addWidget(self.large_file_bar)
+        self.large_search_results = QListWidget(self); self.large_search_results.setMaximumHeight(150)
+        self.large_search_results.itemActivated.connect(self._goto_large_search_result)
+        self.large_search_results.setVisible(False); layout.addWidget(self.large_search_results)
         
         button_layout = QHBoxLayout()
         self.save_button = QPushButton("💾 저장"); self.save_button.clicked.connect(self._save_file)
@@ -462,27 +887,37 @@ class CodeEditorWindow(QWidget):
         self.refresh_button = QPushButton("🔄 새로고침"); self.refresh_button.clicked.connect(self._refresh_file_tree)
         self.undo_ai_button = QPushButton("↩️ AI 수정 되돌리기"); self.undo_ai_button.clicked.connect(self._undo_ai_modification)
         self.undo_ai_button.setEnabled(False)
+        self.redo_ai_button = QPushButton("↪️ AI 수정 다시 적용"); self.redo_ai_button.clicked.connect(self._redo_ai_modification)
+        self.redo_ai_button.setEnabled(False)
         self.eidos_edit_button = QPushButton("🤖 EIDOS로 기능 추가"); self.eidos_edit_button.clicked.connect(self._eidos_modify_code)
+        self.eidos_project_edit_button = QPushButton("🧩 프로젝트 전체 수정"); self.eidos_project_edit_button.clicked.connect(self._eidos_modify_project)
         
         button_layout.addWidget(self.save_button); button_layout.addWidget(self.run_button)
         button_layout.addWidget(self.refresh_button); button_layout.addStretch()
-        button_layout.addWidget(self.undo_ai_button); button_layout.addWidget(self.eidos_edit_button)
+        button_layout.addWidget(self.undo_ai_button); button_layout.addWidget(self.redo_ai_button)
+        button_layout.addWidget(self.eidos_edit_button); button_layout.addWidget(self.eidos_project_edit_button)
         layout.addLayout(button_layout)
 
         self._refresh_file_tree()
         
         self.code_editor.document().blockCountChanged.connect(self._update_line_number_area_width)
+        self.code_editor.document().contentsChanged.connect(self._schedule_autosave)
+        self.code_editor.document().contentsChanged.connect(self._schedule_suggestion_prefetch)
         self.code_editor.updateRequest.connect(self._safe_update_line_number_area)
         self._update_line_number_area_width()
 
         find_action = QAction("Find", self); find_action.setShortcut(QKeySequence.StandardKey.Find)
         find_action.triggered.connect(self._show_search_bar); self.addAction(find_action)
+        project_find_action = QAction("Find in Project", self); project_find_action.setShortcut(QKeySequence("Ctrl+Shift+F"))
+        project_find_action.triggered.connect(lambda: self.project_search_input.setFocus()); self.addAction(project_find_action)
         self.find_next_button.clicked.connect(self._find_next); self.find_prev_button.clicked.connect(self._find_prev)
         self.search_input.returnPressed.connect(self._find_next); self.close_search_button.clicked.connect(self._hide_search_bar)
 
         if self.eidos_worker:
             self.eidos_worker.code_modification_ready.connect(self._on_code_modified)
+            self.eidos_worker.project_modification_ready.connect(self._on_project_modified)
             self.eidos_worker.error_occurred.connect(self._on_eidos_error)
+            self.eidos_worker.sandbox_run_finished.connect(self._on_sandbox_run_finished)
         else:
             self.debug_console.append("❌ [Critical] EidosWorker가 연결되지 않았습니다.")
 
@@ -494,26 +929,40 @@ class CodeEditorWindow(QWidget):
     @Slot(dict)
     def _on_code_modified(self, response_dict: dict):
         try:
+            if response_dict.get("auto_fix_stopped"):
+                self.debug_console.append(f"🛑 [AI Auto-Debugger] {response_dict.get('message', '자동 수정 중단')}")
+                return
             filepath_key = response_dict.get("filepath", "CURRENT")
             new_code = response_dict.get("code", "[EIDOS 응답 오류]")
             if filepath_key == "CURRENT":
-                self.code_editor.setPlainText(new_code)
-                self.debug_console.append("✅ [EIDOS] 코드가 수정되었습니다.")
+                label = "AI 자동 수정" if response_dict.get("auto_fix") else "AI 코드 수정"
+                self._apply_ai_edit(self.current_file_path, new_code, label, load=True)
+                if response_dict.get("symbol"):
+                    self.debug_console.append(f"✅ [EIDOS] '{response_dict['symbol']}'이(가) 수정되었습니다. (커서 위치 심볼 단위)")
+                else:
+                    self.debug_console.append("✅ [EIDOS] 코드가 수정되었습니다.")
             else:
                 new_file_path = os.path.join(self.project_root, filepath_key)
-                self._save_file_content(new_file_path, new_code)
+                self._apply_ai_edit(new_file_path, new_code, f"AI 새 파일: {filepath_key}", load=False)
                 self._refresh_file_tree()
                 self.debug_console.append(f"✅ [EIDOS] 새 파일 '{filepath_key}'이(가) 생성/저장되었습니다.")
-            if self.code_before_ai_modification is not None:
-                self.undo_ai_button.setEnabled(True)
+            self._update_ai_history_buttons()
+            auto_fix = response_dict.get("auto_fix")
+            if auto_fix and filepath_key == "CURRENT":
+                source = "캐시된 수정 재적용" if auto_fix.get("cached") else f"LLM 수정 ({auto_fix.get('latency', 0.0):.1f}s)"
+                self.debug_console.append(
+                    f"🤖 [AI Auto-Debugger] {auto_fix['exc_type']} (지문 {auto_fix['fingerprint']}) "
+                    f"{auto_fix['start_line']}~{auto_fix['end_line']}줄 수정: {source}. 다시 실행합니다..."
+                )
+                self._run_code_preview() # 수정 후 재실행 (시도 횟수는 Core의 AutoFixEngine이 제한)
         except Exception as e:
             self.debug_console.append(f"❌ [EIDOS] 응답 처리 중 오류: {e}")
-            self.undo_ai_button.setEnabled(False)
-            self.code_before_ai_modification = None
+            self._update_ai_history_buttons()
     @Slot(str)
     def _on_eidos_error(self, error_msg: str):
         if "[Code Modify]" in error_msg or "[Suggestion]" in error_msg:
             self.debug_console.append(f"❌ {error_msg}")
+        if "프로젝트 수정 오류" in error_msg: self.eidos_project_edit_button.setEnabled(True)
 
     # [Lite] _eidos_modify_code (AI 추천 기능 포함, 기존과 동일)
     @Slot()
@@ -522,12 +971,13 @@ class CodeEditorWindow(QWidget):
             self.debug_console.append("❌ EIDOS Worker 또는 파일이 없습니다.")
             return
         current_code = self.code_editor.toPlainText()
-        self.code_before_ai_modification = current_code
-        self.undo_ai_button.setEnabled(False) 
+        cursor_line = self.code_editor.textCursor().blockNumber() + 1
+        self.prefetch_timer.stop() # 진행 중인 미리 계산이 있으면 아래 요청이 그 결과를 함께 기다림
         dialog = ModificationDialog(os.path.basename(self.current_file_path), self)
         self.eidos_worker.suggestion_ready.connect(dialog.set_suggestion)
         self.eidos_worker.submit_task(
-            self.eidos_worker.request_modification_suggestion_async(current_code, list(self.chat_history_deque))
+            self.eidos_worker.request_modification_suggestion_async(
+                current_code, list(self.chat_history_deque), self.current_file_path, cursor_line)
         )
         if dialog.exec():
             try: self.eidos_worker.suggestion_ready.disconnect(dialog.set_suggestion)
@@ -537,7 +987,7 @@ class CodeEditorWindow(QWidget):
                 self.debug_console.append(f"🤖 [EIDOS] 코드 수정 요청: '{user_request}'")
                 self.eidos_worker.submit_task(
                     self.eidos_worker.request_code_modification_async(
-                        current_code, user_request, new_file_name, self.current_file_path
+                        current_code, user_request, new_file_name, self.current_file_path, cursor_line
                     )
                 )
             else: self.debug_console.append("ℹ️ 코드 수정이 취소되었습니다.")
@@ -546,10 +996,44 @@ class CodeEditorWindow(QWidget):
             except RuntimeError: pass
             self.debug_console.append("ℹ️ 코드 수정이 취소되었습니다.")
 
+    # [Lite] 여러 파일에 걸친 수정 (이름 변경/시그니처 변경 등). 되돌리기는 '계획 되돌리기'로 한 번에
+    @Slot()
+    def _eidos_modify_project(self):
+        if not self.eidos_worker: self.debug_console.append("❌ EIDOS Worker가 없습니다."); return
+        user_request, ok = QInputDialog.getText(self, "프로젝트 전체 수정",
+                                                "여러 파일에 적용할 수정 요청 (함수/클래스 이름을 포함하면 관련 파일을 찾기 쉽습니다):")
+        if not ok or not user_request.strip(): return
+        current_code = self.code_editor.toPlainText() if self.current_file_path and not self.large_doc else None
+        cursor_line = self.code_editor.textCursor().blockNumber() + 1 if current_code is not None else None
+        self.autosave_timer.stop(); self._autosave_file(); self.autosave_writer.flush() # AI가 읽기 전에 남은 변경 저장
+        self.eidos_project_edit_button.setEnabled(False)
+        self.debug_console.append(f"🧩 [EIDOS] 프로젝트 수정 요청: '{user_request}'")
+        self.eidos_worker.submit_task(self.eidos_worker.request_project_modification_async(
+            user_request, self.project_root, self.current_file_path if current_code is not None else None, current_code, cursor_line))
+    @Slot(dict)
+    def _on_project_modified(self, result: dict):
+        self.eidos_project_edit_button.setEnabled(True)
+        skipped = ", ".join(f"{path} ({reason})" for path, reason in result["skipped"])
+        if not result["files"]:
+            self.debug_console.append(f"ℹ️ [EIDOS] 프로젝트 수정: 바꿀 내용이 없습니다. (검토한 파일: {', '.join(result['selected'])})")
+            return
+        self.debug_console.append(
+            f"✅ [EIDOS] 프로젝트 수정 ({'일괄 요청' if result['mode'] == 'batch' else '파일별 병렬 요청'}, 프롬프트 {result['prompt_chars']}자): "
+            f"{len(result['files'])}개 파일 수정 - {', '.join(result['files'])}"
+            + (f"\n   제외된 파일: {skipped}" if skipped else "")
+            + "\n   전체를 되돌리려면 '계획 되돌리기'를 사용하세요.")
+        if self.current_file_path and os.path.exists(self.current_file_path) and \
+                os.path.relpath(os.path.realpath(self.current_file_path), os.path.realpath(self.project_root)) in result["files"]:
+            self.autosave_timer.stop()
+            with open(self.current_file_path, 'r', encoding='utf-8') as f: content = f.read()
+            self.code_editor.setPlainText(content); self.code_editor.document().setModified(False)
+            self.autosave_writer.mark_saved(self.current_file_path, content)
+        self._refresh_file_tree(); self._update_ai_history_buttons()
+
     @Slot()
     def _run_code_preview(self):
         if not self.current_file_path: return
-        self._save_file() # 저장 필수
+        self._save_file(wait=True) # 저장 필수 (실행은 디스크 내용 기준)
         self.debug_console.clear()
         self.debug_console.append(f">>> python {os.path.basename(self.current_file_path)} 실행...")
         try:
@@ -563,63 +1047,120 @@ class CodeEditorWindow(QWidget):
                 self.debug_console.append("✅ GUI 앱 감지. 새 창으로 실행합니다.")
                 subprocess.Popen(['python', self.current_file_path], cwd=os.path.dirname(self.current_file_path))
                 return
-            result = subprocess.run(
-                ['python', self.current_file_path],
-                cwd=os.path.dirname(self.current_file_path),
-                capture_output=True, text=True, timeout=10, encoding='utf-8'
-            )
-            if result.stdout: self.debug_console.append(f"--- [STDOUT] ---\n{result.stdout.strip()}")
-            if result.stderr:
-                error_output = result.stderr.strip()
-                self.debug_console.append(f"--- [STDERR] ---\n{error_output}")
-                self.debug_console.append("\n❌ 실행 실패: AI 자동 디버거를 호출합니다...")
-                self._trigger_auto_debugger(error_output) 
-            if result.returncode == 0: self.debug_console.append("\n✅ 코드 실행 성공.")
+            if not self.eidos_worker:
+                self.debug_console.append("❌ EIDOS Worker가 없어 샌드박스 실행을 할 수 없습니다.")
+                return
+            # [Lite] 샌드박스 워커 풀에서 자원 제한과 함께 실행 (결과는 _on_sandbox_run_finished)
+            self.run_button.setEnabled(False)
+            self.eidos_worker.submit_task(self.eidos_worker.run_sandbox_script_async(self.current_file_path))
         except Exception as e:
             error_output = f"알 수 없는 실행 오류: {e}"
             self.debug_console.append(f"\n❌ {error_output}")
             self._trigger_auto_debugger(error_output)
+    @Slot(dict)
+    def _on_sandbox_run_finished(self, result: dict):
+        if result.get("script_path") != self.current_file_path: return
+        self.run_button.setEnabled(True)
+        stdout = result.get("stdout", "").strip(); stderr = result.get("stderr", "").strip()
+        if stdout: self.debug_console.append(f"--- [STDOUT] ---\n{stdout}")
+        if stderr: self.debug_console.append(f"--- [STDERR] ---\n{stderr}")
+        self.debug_console.append(format_usage_report(result))
+        if result.get("auto_fix_report"): self.debug_console.append(result["auto_fix_report"])
+        if stderr or result.get("returncode") != 0 or result.get("timed_out"):
+            error_output = stderr or f"프로세스가 비정상 종료되었습니다. ({format_usage_report(result)})"
+            self.debug_console.append("\n❌ 실행 실패: AI 자동 디버거를 호출합니다...")
+            self._trigger_auto_debugger(error_output)
+        else: self.debug_console.append("\n✅ 코드 실행 성공.")
     @Slot(str)
     def _trigger_auto_debugger(self, error_message: str):
         if not self.eidos_worker or not self.current_file_path: return
         self.debug_console.append(f"🤖 [AI Auto-Debugger] 오류 감지. EIDOS에 자동 수정을 요청합니다...")
-        auto_request = f"[자동 디버깅 요청] 다음 오류를 해결해 주세요:\n{error_message}"
+        current_code = self.code_editor.toPlainText()
         self.eidos_worker.submit_task(
-            self.eidos_worker.request_code_modification_async(
-                self.code_editor.toPlainText(), auto_request, None, self.current_file_path
-            )
+            self.eidos_worker.request_auto_fix_async(current_code, error_message, self.current_file_path)
         )
 
     def _save_file_content(self, absolute_path: str, content: str):
-        try:
-            os.makedirs(os.path.dirname(absolute_path), exist_ok=True)
-            with open(absolute_path, 'w', encoding='utf-8') as f: f.write(content)
-        except Exception as e:
-            self.debug_console.append(f"❌ 파일 저장 실패: {e}")
+        """ (Lite) 직접 저장도 자동 저장과 같은 쓰기 스레드로 (순서 보장, 결과는 _on_autosave_finished) """
+        return self.autosave_writer.submit(
+            absolute_path, content,
+            lambda path, status, error: self.autosave_finished.emit(path, status, error or "")
+        )
+    @Slot()
+    def _schedule_suggestion_prefetch(self):
+        if self._prefetch_future is not None and not self._prefetch_future.done():
+            self._prefetch_future.cancel() # 이전 버퍼 기준 추천은 더 이상 쓸모 없음
+        self._prefetch_future = None
+        if self.current_file_path and not self.large_doc: self.prefetch_timer.start()
+    @Slot()
+    def _prefetch_suggestion(self):
+        if not self.eidos_worker or not self.current_file_path or self.large_doc: return
+        self._prefetch_future = self.eidos_worker.submit_task(
+            self.eidos_worker.prefetch_modification_suggestion_async(
+                self.code_editor.toPlainText(), list(self.chat_history_deque),
+                self.current_file_path, self.code_editor.textCursor().blockNumber() + 1)
+        )
+    @Slot()
+    def _schedule_autosave(self):
+        if self.current_file_path: self.autosave_timer.start() # 입력마다 재시작 (디바운스)
+    @Slot()
     def _autosave_file(self):
-        if self.current_file_path: self._save_file_content(self.current_file_path, self.code_editor.toPlainText())
-    def closeEvent(self, event): self.autosave_timer.stop(); super().closeEvent(event)
-    def _refresh_file_tree(self): self.file_tree.clear(); self._populate_tree(self.project_root, self.file_tree.invisibleRootItem())
-    def _populate_tree(self, folder_path: str, parent_item: QTreeWidgetItem):
-        for name in os.listdir(folder_path):
-            if name.startswith('.'): continue
-            path = os.path.join(folder_path, name); item = QTreeWidgetItem([name]); item.setData(0, Qt.ItemDataRole.UserRole, path)
-            if os.path.isdir(path): self._populate_tree(path, item)
-            parent_item.addChild(item)
+        document = self.code_editor.document()
+        if not self.current_file_path or not document.isModified() or self.large_doc: return
+        self._autosave_revision = document.revision()
+        self.autosave_writer.submit(
+            self.current_file_path, self.code_editor.toPlainText(),
+            lambda path, status, error: self.autosave_finished.emit(path, status, error or "")
+        )
+    @Slot(str, str, str)
+    def _on_autosave_finished(self, path: str, status: str, error: str):
+        if status == "error":
+            self.debug_console.append(f"❌ 파일 저장 실패: {error}"); return
+        if status == "stale": return # 다른 경로로 더 새 내용이 저장됨
+        if status == "saved": notify_file_changed(path)
+        # 저장 도중 추가 입력이 없었을 때만 '저장됨'으로 표시
+        if path == self.current_file_path and self.code_editor.document().revision() == self._autosave_revision:
+            self.code_editor.document().setModified(False)
+    def closeEvent(self, event):
+        self.prefetch_timer.stop()
+        if self._prefetch_future is not None: self._prefetch_future.cancel()
+        self.autosave_timer.stop()
+        self._autosave_file() # 남은 변경 사항 저장
+        self.autosave_writer.shutdown(wait=True)
+        self._close_large_file()
+        if self.project_search_thread: self.project_search_thread.wait()
+        super().closeEvent(event)
+    def _refresh_file_tree(self):
+        self.file_tree.refresh(self.project_root)
+        self.project_index_stale = True # 외부 변경(실행 결과물 등)은 다음 검색 때 반영
     def _open_file_in_editor(self, item: Optional[QTreeWidgetItem] = None, column: int = 0, file_path: Optional[str] = None):
         if item: file_path = item.data(0, Qt.ItemDataRole.UserRole)
         if not file_path or os.path.isdir(file_path): return
+        self.autosave_timer.stop(); self._autosave_file() # 이전 파일의 남은 변경 사항 저장
+        self.autosave_writer.flush() # 같은 파일을 다시 여는 경우 대기 중인 쓰기가 끝난 내용을 읽도록
+        if is_large_file(file_path):
+            self._open_large_file(file_path); return
+        self._close_large_file()
         try:
             with open(file_path, 'r', encoding='utf-8') as f: content = f.read()
             self.code_editor.setPlainText(content)
+            self.code_editor.document().setModified(False)
+            self.autosave_writer.mark_saved(file_path, content)
             self.setWindowTitle(f"EIDOS Code Editor (Lite) - {os.path.basename(file_path)}")
             self.current_file_path = file_path
+            self._update_ai_history_buttons()
+            self._schedule_suggestion_prefetch()
         except Exception as e: QMessageBox.critical(self, "파일 열기 오류", f"파일을 열 수 없습니다: {e}")
-    def _save_file(self):
+    def _save_file(self, wait: bool = False):
+        """ (Lite) 쓰기 스레드에서 저장 (wait=True면 완료까지 대기: 실행/되돌리기처럼 디스크 내용이 기준인 경우) """
         if not self.current_file_path: QMessageBox.warning(self, "저장 오류", "파일이 선택되지 않았습니다."); return
-        self._save_file_content(self.current_file_path, self.code_editor.toPlainText())
+        if self.large_doc: self._save_large_page(); return
+        self.autosave_timer.stop()
+        self._autosave_revision = self.code_editor.document().revision()
+        future = self._save_file_content(self.current_file_path, self.code_editor.toPlainText())
+        if wait: future.result()
     def _file_tree_context_menu(self, pos: QPoint):
-        item = self.file_tree.itemAt(pos); menu = QMenu(self)
+        item = self.file_tree.path_item_at(pos); menu = QMenu(self)
         if item:
             is_dir = os.path.isdir(item.data(0, Qt.ItemDataRole.UserRole))
             if is_dir:
@@ -645,14 +1186,58 @@ class CodeEditorWindow(QWidget):
             try:
                 if os.path.isdir(file_path): shutil.rmtree(file_path)
                 else: os.remove(file_path)
+                notify_path_removed(file_path)
                 self._refresh_file_tree()
             except Exception as e: QMessageBox.critical(self, "삭제 오류", f"삭제 실패: {e}")
+    def _apply_ai_edit(self, file_path: str, new_code: str, label: str, load: bool):
+        """ (Lite) AI 수정 결과를 스냅샷(이전: 에디터 버퍼, 이후: 새 코드)으로 기록하며 저장합니다. """
+        if self.snapshot_store.contains(file_path):
+            before = self.code_editor.toPlainText() if load else None
+            self.autosave_writer.discard_pending(file_path) # 대기 중인 자동 저장이 AI 수정을 덮어쓰지 않도록
+            changeset_id = self.snapshot_store.begin(label)
+            try: self.snapshot_store.write(changeset_id, file_path, new_code, before=before)
+            finally: self.snapshot_store.commit(changeset_id)
+            self.autosave_writer.mark_saved(file_path, new_code)
+            saved = True
+        else: # 샌드박스 밖 파일: 기록 없이 기존 방식 (열려 있으면 자동 저장 대상)
+            saved = False
+            if not load: self._save_file_content(file_path, new_code)
+        if load:
+            self.autosave_timer.stop()
+            self.code_editor.setPlainText(new_code)
+            self.code_editor.document().setModified(not saved)
+    def _update_ai_history_buttons(self):
+        path = self.current_file_path
+        tracked = bool(path) and not self.large_doc and self.snapshot_store.contains(path)
+        self.undo_ai_button.setEnabled(tracked and self.snapshot_store.can_undo_file(path))
+        self.redo_ai_button.setEnabled(tracked and self.snapshot_store.can_redo_file(path))
+    def _reload_after_ai_history(self, result: Optional[dict], tag: str):
+        if result is None:
+            self.debug_console.append(f"ℹ️ [{tag}] 적용할 AI 수정 기록이 없습니다. (AI 수정 이후 직접 편집한 경우 포함)")
+        elif result["conflicts"]:
+            self.debug_console.append(f"⚠️ [{tag}] AI 수정 이후 파일이 바뀌어 덮어쓰지 않았습니다: {', '.join(result['conflicts'])}")
+        else:
+            if os.path.exists(self.current_file_path):
+                with open(self.current_file_path, 'r', encoding='utf-8') as f: content = f.read()
+                self.code_editor.setPlainText(content); self.code_editor.document().setModified(False)
+                self.autosave_writer.mark_saved(self.current_file_path, content)
+            else: # AI가 새로 만든 파일의 생성을 되돌림
+                self.code_editor.clear(); self.code_editor.document().setModified(False)
+                self.current_file_path = None; self._refresh_file_tree()
+            self.debug_console.append(f"✅ [{tag}] '{result['label']}' (스냅샷 {result['changeset']})")
+        self._update_ai_history_buttons()
     @Slot()
     def _undo_ai_modification(self):
-        if self.code_before_ai_modification is None: return
-        self.code_editor.setPlainText(self.code_before_ai_modification)
-        self.debug_console.append("✅ [Undo] AI 수정 내용을 되돌렸습니다.")
-        self.code_before_ai_modification = None; self.undo_ai_button.setEnabled(False)
+        if not self.current_file_path: return
+        if self.code_editor.document().isModified(): self._save_file(wait=True) # 되돌리기 기준은 디스크 내용
+        self.autosave_writer.discard_pending(self.current_file_path)
+        self._reload_after_ai_history(self.snapshot_store.undo_file(self.current_file_path), "Undo")
+    @Slot()
+    def _redo_ai_modification(self):
+        if not self.current_file_path: return
+        if self.code_editor.document().isModified(): self._save_file(wait=True)
+        self.autosave_writer.discard_pending(self.current_file_path)
+        self._reload_after_ai_history(self.snapshot_store.redo_file(self.current_file_path), "Redo")
     @Slot(QRect, int)
     def _safe_update_line_number_area(self, rect, dy):
         try:
@@ -666,14 +1251,160 @@ class CodeEditorWindow(QWidget):
     def _show_search_bar(self): self.search_bar.setVisible(True); self.search_input.setFocus()
     @Slot()
     def _hide_search_bar(self): self.search_bar.setVisible(False); self.code_editor.setFocus()
+    # --- [Lite] 프로젝트 검색 ---
+    @Slot()
+    def _run_project_search(self):
+        query = self.project_search_input.text()
+        if not query.strip() or (self.project_search_thread and self.project_search_thread.isRunning()): return
+        self.project_search_results.clear()
+        # 작업 공간이 비활성 프로젝트의 색인을 내렸을 수 있으므로 매번 레지스트리에서 가져옴
+        self.project_index = get_project_index(self.project_root)
+        self.project_search_thread = ProjectSearchThread(self.project_index, query, refresh=self.project_index_stale, parent=self)
+        self.project_index_stale = False
+        self.project_search_thread.results_ready.connect(self._on_project_search_results)
+        self.project_search_thread.start()
+
+    @Slot(str, list)
+    def _on_project_search_results(self, query: str, results: list):
+        for result in results:
+            item = QListWidgetItem(f"{result['path']}:{result['line']}  {result['text'].strip()}")
+            item.setData(Qt.ItemDataRole.UserRole, (result["abs_path"], result["line"]))
+            item.setToolTip("\n".join(result["before"] + [result["text"]] + result["after"]))
+            self.project_search_results.addItem(item)
+        self.debug_console.append(f"🔍 [프로젝트 검색] '{query}': {len(results)}건")
+
+    @Slot(QListWidgetItem)
+    def _open_project_search_result(self, item: QListWidgetItem):
+        file_path, line = item.data(Qt.ItemDataRole.UserRole)
+        if file_path != self.current_file_path: self._open_file_in_editor(file_path=file_path)
+        if file_path != self.current_file_path or self.large_doc: return
+        cursor = QTextCursor(self.code_editor.document().findBlockByNumber(line - 1))
+        cursor.select(QTextCursor.SelectionType.LineUnderCursor)
+        self.code_editor.setTextCursor(cursor); self.code_editor.centerCursor(); self.code_editor.setFocus()
+
+    # --- [Lite] 대용량 파일 모드 ---
+    def _open_large_file(self, file_path: str):
+        """
+        (Lite) 임계값 초과 파일을 mmap 페이지 단위로 엽니다.
+        편집한 페이지는 저장/페이지 이동/검색/닫기 때 파일에 반영합니다. (자동 저장은 매번 파일 전체를 다시 쓰게 되므로 하지 않음)
+        실행/AI 수정/AI 되돌리기는 파일 전체 내용이 필요하므로 비활성화합니다.
+        """
+        self._close_large_file()
+        try:
+            self.large_doc = LargeFileDocument(file_path)
+        except Exception as e:
+            QMessageBox.critical(self, "파일 열기 오류", f"파일을 열 수 없습니다: {e}"); return
+        self.current_file_path = file_path
+        for button in (self.run_button, self.eidos_edit_button, self.undo_ai_button, self.redo_ai_button): button.setEnabled(False)
+        # 줄 번호 폭: 전체 줄 수를 세지 않고 바이트 수(상한)로 계산
+        self.line_number_area.total_lines = max(1, self.large_doc.size)
+        self.large_file_bar.setVisible(True)
+        self._load_large_page(0)
+        self.setWindowTitle(f"EIDOS Code Editor (Lite) - {os.path.basename(file_path)} [대용량 모드]")
+        self.debug_console.append(f"📦 [대용량 모드] {self.large_doc.size / (1024 * 1024):.1f}MB, {self.large_doc.page_count}페이지 "
+                                  f"(페이지 단위 편집: 저장/페이지 이동 시 반영, 실행/AI 수정은 파일 전체가 필요해 비활성화)")
+
+    def _close_large_file(self):
+        self._save_large_page() # 남은 페이지 편집 반영
+        if self.large_search_thread: self.large_search_thread.cancel(); self.large_search_thread = None
+        if not self.large_doc: return
+        self.large_doc.close(); self.large_doc = None
+        for button in (self.run_button, self.eidos_edit_button): button.setEnabled(True)
+        self.line_number_area.line_offset = 0; self.line_number_area.total_lines = None
+        self.large_file_bar.setVisible(False); self.large_search_results.clear(); self.large_search_results.setVisible(False)
+
+    def _save_large_page(self) -> bool:
+        """ (Lite) 편집한 현재 페이지를 파일에 반영합니다. (나머지 바이트는 그대로 복사, 원자적 교체) 실패하면 False """
+        document = self.code_editor.document()
+        if not self.large_doc or not document.isModified(): return True
+        # 검색 스레드가 mmap을 읽는 중일 수 있고, 기존 결과의 바이트 위치는 저장 후 맞지 않음
+        if self.large_search_thread: self.large_search_thread.cancel(); self.large_search_thread = None
+        had_results = self.large_search_results.count() > 0
+        self.large_search_results.clear(); self.large_search_results.setVisible(False)
+        path = self.large_doc.path
+        self.autosave_writer.discard_pending(path)
+        try:
+            # 히스토리 보관은 하드링크가 안 되면 파일 전체를 복사하므로 대용량 모드에서는 남기지 않음
+            self.large_doc.replace_page(self.large_page, self.code_editor.toPlainText())
+        except Exception as e:
+            self.debug_console.append(f"❌ 파일 저장 실패: {e}"); return False
+        document.setModified(False)
+        notify_file_changed(path)
+        self.line_number_area.total_lines = max(1, self.large_doc.size)
+        self._update_large_page_bar(self.line_number_area.line_offset)
+        self.debug_console.append(f"💾 [대용량 모드] 페이지 {self.large_page + 1} 저장" + (" (검색 결과는 다시 검색 필요)" if had_results else ""))
+        return True
+
+    def _update_large_page_bar(self, first_line: int):
+        page = self.large_page
+        self.large_page_label.setText(f"📦 대용량 모드 - 페이지 {page + 1}/{self.large_doc.page_count} ({first_line + 1}번째 줄부터)")
+        self.large_prev_button.setEnabled(page > 0); self.large_next_button.setEnabled(page < self.large_doc.page_count - 1)
+
+    def _load_large_page(self, page: int, line_in_page: Optional[int] = None):
+        if not self.large_doc or not self._save_large_page(): return # 저장 실패 시 편집 내용을 버리지 않도록 이동하지 않음
+        page = max(0, min(page, self.large_doc.page_count - 1))
+        first_line, text = self.large_doc.read_page(page)
+        self.large_page = page
+        self.line_number_area.line_offset = first_line
+        self.code_editor.setPlainText(text); self.code_editor.document().setModified(False)
+        self._update_line_number_area_width()
+        self._update_large_page_bar(first_line)
+        if line_in_page is not None:
+            cursor = QTextCursor(self.code_editor.document().findBlockByNumber(line_in_page))
+            cursor.select(QTextCursor.SelectionType.LineUnderCursor)
+            self.code_editor.setTextCursor(cursor); self.code_editor.centerCursor()
+
+    def _start_large_search(self, term: str):
+        if not self._save_large_page(): return # 편집 내용까지 검색되도록 먼저 반영
+        if self.large_search_thread: self.large_search_thread.cancel()
+        self.large_search_results.clear(); self.large_search_results.setVisible(True)
+        self.large_search_thread = LargeFileSearchThread(self.large_doc, term, self)
+        self.large_search_thread.results_found.connect(self._on_large_search_results)
+        self.large_search_thread.search_finished.connect(self._on_large_search_finished)
+        self.large_search_thread.start()
+
+    @Slot(list)
+    def _on_large_search_results(self, batch: list):
+        for offset, line_no, line_text in batch:
+            item = QListWidgetItem(f"{line_no + 1}: {line_text}"); item.setData(Qt.ItemDataRole.UserRole, offset)
+            self.large_search_results.addItem(item)
+        if self.large_search_results.currentRow() < 0:
+            self.large_search_results.setCurrentRow(0); self._goto_large_search_result(self.large_search_results.item(0))
+
+    @Slot(str, int)
+    def _on_large_search_finished(self, term: str, count: int):
+        self.debug_console.append(f"🔎 [대용량 검색] '{term}': {count}개 줄에서 발견")
+
+    @Slot(QListWidgetItem)
+    def _goto_large_search_result(self, item: QListWidgetItem):
+        if not self.large_doc or item is None: return
+        if self.code_editor.document().isModified(): self._save_large_page(); return # 저장하면 결과 위치가 달라지므로 다시 검색
+        offset = item.data(Qt.ItemDataRole.UserRole)
+        page = self.large_doc.page_for_offset(offset)
+        self._load_large_page(page, line_in_page=self.large_doc.line_in_page(page, offset))
+
+    def _step_large_search(self, step: int) -> bool:
+        """ 같은 검색어의 결과가 이미 있으면 다음/이전 결과로 이동 """
+        thread = self.large_search_thread
+        if not thread or thread.term != self.search_input.text() or self.large_search_results.count() == 0: return False
+        row = (self.large_search_results.currentRow() + step) % self.large_search_results.count()
+        self.large_search_results.setCurrentRow(row); self._goto_large_search_result(self.large_search_results.item(row))
+        return True
+
     @Slot()
     def _find_next(self):
         search_term = self.search_input.text();
+        if self.large_doc:
+            if search_term and not self._step_large_search(1): self._start_large_search(search_term)
+            return
         if search_term and not self.code_editor.find(search_term):
             self.code_editor.moveCursor(QTextCursor.MoveOperation.Start); self.code_editor.find(search_term)
     @Slot()
     def _find_prev(self):
         search_term = self.search_input.text();
+        if self.large_doc:
+            if search_term and not self._step_large_search(-1): self._start_large_search(search_term)
+            return
         if search_term and not self.code_editor.find(search_term, QTextDocument.FindFlag.FindBackward):
             self.code_editor.moveCursor(QTextCursor.MoveOperation.End); self.code_editor.find(search_term, QTextDocument.FindFlag.FindBackward)
             
@@ -701,6 +1432,13 @@ class ChatWindow(QWidget):
         chat_title.setObjectName("SubTitle")
         title_layout.addWidget(chat_title)
         title_layout.addStretch()
+
+        # [Lite] 작업 공간: 선택한 프로젝트의 컨텍스트(기록/캐시)로 요청을 보냄
+        title_layout.addWidget(QLabel("📁 프로젝트:", self))
+        self.project_combo = QComboBox(self)
+        self.project_combo.setMinimumWidth(160)
+        title_layout.addWidget(self.project_combo)
+        self._refresh_project_list()
         
         self.settings_button = QPushButton("⚙️ 설정", self)
         self.settings_button.setFixedSize(60, 30)
@@ -709,9 +1447,14 @@ class ChatWindow(QWidget):
         
         chat_layout.addLayout(title_layout)
         
-        self.chat_log = QTextEdit(self)
+        self.chat_log = QTextBrowser(self)
         self.chat_log.setObjectName("ChatLog")
         self.chat_log.setReadOnly(True)
+        self.chat_log.setOpenLinks(False) # 계획 '전체 단계 보기' 링크는 직접 처리
+        self.chat_log.anchorClicked.connect(self._on_chat_link_clicked)
+        # [Lite] 세부 보기용 최근 계획 (Core가 만든 계획 객체를 참조만 함, 채팅 로그에는 요약만 넣음)
+        self._plan_views: "OrderedDict[int, tuple]" = OrderedDict()
+        self._next_plan_id = 0
         chat_layout.addWidget(self.chat_log)
         right_layout.addWidget(chat_frame)
 
@@ -794,27 +1537,37 @@ class ChatWindow(QWidget):
         self.chat_log.insertHtml(html)
         self.chat_log.insertPlainText("\n"); self.chat_log.moveCursor(QTextCursor.End)
 
-    def _format_plan_to_html(self, plan_json: str, editor_type: str, project_dir: Optional[str]) -> str:
-        """ (Lite) 작업 계획 JSON을 HTML로 포매팅 (기존과 동일) """
-        try:
-            plan_list = json.loads(plan_json)
-            html = f"""<div style='background-color:#F0F8FF; color:#00008B; padding:10px; border-radius:10px; margin:5px; margin-right: 50px; font-style: italic; border: 1px solid #D0E0F0;'>
-                <b>⚙️ EIDOS-Lite 작업 계획 수신</b><br>
-                <b>프로젝트:</b> {project_dir or 'N/A'}<br>
-                <b>에디터 유형:</b> {editor_type}<br>
-                <b>실행 단계:</b>
-                <ol style='margin-left: -20px; margin-top: 5px;'>"""
-            for i, step in enumerate(plan_list):
-                tool = step.get("tool", "N/A"); args = step.get("args", {})
-                args_str = ""
-                if "query" in args: args_str = f"({args['query'][:30]}...)"
-                elif "filepath" in args: args_str = f"({args['filepath']})"
-                elif "file_structure" in args: args_str = f"(파일 {len(args['file_structure'])}개 생성)"
-                html += f"<li><b>{tool}</b> {args_str}</li>"
-            html += "</ol></div>"
-            return html
-        except Exception as e:
-            return f"<div style='background-color:#FFDDDD; color:#8B0000;'><b>❌ 계획 파싱 오류:</b> {e}</div>"
+    def _format_plan_to_html(self, plan_id: int, summary: dict, editor_type: str, project_dir: Optional[str]) -> str:
+        """ (Lite) 작업 계획 요약을 HTML로 포매팅 (앞 몇 단계 + 도구별 개수, 전체 단계는 세부 보기 링크로) """
+        tools = ", ".join(f"{html.escape(tool)} ×{count}" for tool, count in summary["tools"].items())
+        files = f", 파일 {summary['file_count']}개" if summary["file_count"] else ""
+        plan_html = f"""<div style='background-color:#F0F8FF; color:#00008B; padding:10px; border-radius:10px; margin:5px; margin-right: 50px; font-style: italic; border: 1px solid #D0E0F0;'>
+            <b>⚙️ EIDOS-Lite 작업 계획 수신</b><br>
+            <b>프로젝트:</b> {html.escape(project_dir or 'N/A')}<br>
+            <b>에디터 유형:</b> {editor_type}<br>
+            <b>실행 단계:</b> {summary['step_count']}단계 ({tools}{files})
+            <ol style='margin-left: -20px; margin-top: 5px;'>"""
+        for step in summary["steps"]:
+            plan_html += f"<li><b>{html.escape(step['tool'])}</b> {html.escape(step['label'])}</li>"
+        remaining = summary["step_count"] - len(summary["steps"])
+        link_text = f"📋 전체 단계 보기 (외 {remaining}단계)" if remaining > 0 else "📋 세부 보기"
+        plan_html += f"</ol><a href='plan:{plan_id}'>{link_text}</a></div>"
+        return plan_html
+
+    def _keep_plan_view(self, plan: list, summary: dict) -> int:
+        self._next_plan_id += 1
+        self._plan_views[self._next_plan_id] = (plan, summary)
+        while len(self._plan_views) > plan_view_module.PLAN_VIEWS_KEPT:
+            self._plan_views.popitem(last=False)
+        return self._next_plan_id
+
+    @Slot(QUrl)
+    def _on_chat_link_clicked(self, url: QUrl):
+        if url.scheme() != "plan": return
+        view = self._plan_views.get(int(url.path())) if url.path().isdigit() else None
+        if view is None:
+            QMessageBox.information(self, "작업 계획", "오래된 계획이라 세부 정보가 더 이상 보관되어 있지 않습니다."); return
+        PlanDetailDialog(view[0], view[1], self).exec()
 
     def dropEvent(self, event: QDropEvent):
         if event.mimeData().hasUrls():
@@ -843,16 +1596,18 @@ class ChatWindow(QWidget):
         self.append_message(user_text, "user")
         self.input_line.clear()
         
-        final_prompt = user_text
+        # [Lite] 첨부 파일은 경로만 넘기고, Core가 샌드박스로 가져와 관련 청크만 프롬프트에 넣음
+        history_entry = user_text
         if file_paths_to_send:
-            path_list = "\n".join([f"FILE_PATH:{p}" for p in file_paths_to_send])
-            final_prompt = f"[첨부 파일 목록]\n{path_list}\n\n[사용자 지시]\n{user_text}"
-            
-        self.chat_history.append(f"👤 사용자: {final_prompt}")
+            history_entry += f" [첨부: {', '.join(os.path.basename(p) for p in file_paths_to_send)}]"
+        self.chat_history.append(f"👤 사용자: {history_entry}")
         history_list = list(self.chat_history)
         
         self.eidos_worker.submit_task(
-            self.eidos_worker._process_async(final_prompt, history_list)
+            self.eidos_worker._process_async(
+                user_text, history_list, project_dir=self.project_combo.currentData(),
+                attachment_paths=list(file_paths_to_send)
+            )
         )
     
         self.current_attached_file_paths = []; self.attached_file_label.setText("첨부된 파일 없음")
@@ -860,6 +1615,15 @@ class ChatWindow(QWidget):
         
         self.append_message("<i>[EIDOS-Lite가 응답 생성 중...]</i>", "eidos") # [Lite] 프로그레스 바 대신 텍스트
 
+    def _refresh_project_list(self):
+        """ (Lite) 프로젝트 목록 갱신 (선택 유지). 첫 항목은 샌드박스 전체(프로젝트 없음). """
+        current = self.project_combo.currentData()
+        self.project_combo.blockSignals(True); self.project_combo.clear()
+        self.project_combo.addItem("(샌드박스 전체)", None)
+        for name in list_projects(SAFE_BASE_PATH): self.project_combo.addItem(name, name)
+        index = self.project_combo.findData(current)
+        self.project_combo.setCurrentIndex(max(0, index)); self.project_combo.blockSignals(False)
+
     @Slot(str, str, object)
     def on_eidos_response(self, natural_text: str, reasoning_log: str, exec_task_state: object):
         """ (Lite) 단순화된 응답 처리 (감정, TTS, 작업 분해 제거) ""
@@ -874,10 +1638,11 @@ class ChatWindow(QWidget):
             self.append_message(reasoning_log, "reasoning")
             
         if isinstance(exec_task_state, dict):
-            plan_json = exec_task_state.get("plan_json")
-            if plan_json:
+            plan = exec_task_state.get("plan")
+            if plan:
                 plan_html = self._format_plan_to_html(
-                    plan_json, 
+                    self._keep_plan_view(plan, exec_task_state["plan_summary"]),
+                    exec_task_state["plan_summary"],
                     exec_task_state.get("editor_type", "NONE"), 
                     exec_task_state.get("project_dir")
                 )
@@ -894,6 +1659,7 @@ class ChatWindow(QWidget):
         if isinstance(exec_task_state, dict):
             project_dir_name = exec_task_state.get("project_dir")
             editor_type = exec_task_state.get("editor_type", "NONE")
+            if project_dir_name: self._refresh_project_list() # 계획이 만든 새 프로젝트 반영
             
             if project_dir_name and editor_type != "NONE":
                 project_path = os.path.join("eidos_files", project_dir_name)
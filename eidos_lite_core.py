@@ -1,12 +1,50 @@
 import json
 import asyncio
+import contextlib
+import hashlib
 import os
+import time
+from collections import OrderedDict
 from typing import List, Tuple, Optional, Dict, Any
 
 # [Lite] 단순화된 LLM 모듈 임포트
 import lite_llm_module
 # [Lite] Pro Lock이 제거된 도구 모듈 임포트
 import execution_module
+# [Lite] 플래너 응답 스키마/로컬 검증/복구
+import plan_schema_module
+# [Lite] 세션 단위 도구 결과 메모 캐시
+from tool_cache_module import ToolResultCache
+# [Lite] 자동 디버거 (오류 지문/영역 추출/시도 제한)
+import auto_debug_module
+# [Lite] AI 편집 스냅샷 저장소 (계획 단위 되돌리기/다시 실행)
+import snapshot_store_module
+# [Lite] 다중 프로젝트 작업 공간 (프로젝트별 기록/캐시/자동 디버거 컨텍스트)
+import workspace_module
+# [Lite] 첨부 파일 수집 (샌드박스 세션 폴더 + 청크 추출 캐시)
+import attachment_module
+# [Lite] 성능 지표 (꺼져 있으면 기록 비용 없음)
+import metrics_module
+# [Lite] 계획 단계 결과 저장소 ($PREV_STEP_RESULT / $STEPn_RESULT 참조)
+from result_store_module import StepResultStore, has_step_reference
+# [Lite] 이벤트 루프 모니터 (설정에서 켜면 워커가 설치, 경고는 추론 로그에 추가)
+import loop_monitor_module
+# [Lite] 작업 종류별 실행 풀 (io/llm/cpu)
+from executor_pool_module import run_in_pool
+# [Lite] ast 심볼 색인 (커서 위치 심볼 + 의존성으로 코드 프롬프트 구성)
+import symbol_index_module
+# [Lite] 여러 파일에 걸친 코드 수정 (색인 기반 파일 선택 + 검증)
+import project_modify_module
+# [Lite] 요청 분류 (규칙 + 로컬 분류기, 짧은 대화는 플래너 생략)
+import triage_module
+# [Lite] 계획 요약 (GUI/로그에는 요약만, 큰 인수는 세부 보기에서 필요할 때)
+import plan_view_module
+
+# 로컬 복구로도 계획이 유효하지 않을 때 허용하는 재계획(LLM 재호출) 횟수
+MAX_REPLAN_ATTEMPTS = 1
+# [Lite] 코드 추천 미리 계산(prefetch): 에디터가 이 시간(ms) 동안 입력이 없으면 백그라운드에서 추천 생성
+SUGGESTION_PREFETCH_IDLE_MS = 4000
+SUGGESTION_CACHE_SIZE = 32
 
 class EidosLiteCore:
     """
@@ -21,48 +59,304 @@ class EidosLiteCore:
         self.project_root = os.path.abspath("eidos_files")
         print(f"🔒 [Lite Core] 샌드박스 루트: {self.project_root}")
         
-        # [Lite] 사용 가능한 도구 (실제 함수) 맵
-        # (execution_module에서 가져옴)
-        self.tool_functions = {
-            "perform_web_search": execution_module.perform_web_search,
-            "calculate_math": execution_module.calculate_math,
-            "read_file": execution_module.read_file,
-            "write_file": execution_module.write_file,
-            "write_project_files_async": execution_module.write_project_files_async,
-            # 'write_text'는 LLM을 직접 호출하므로 _execute_task에서 별도 처리
-        }
+        # [Lite] 사용 가능한 도구는 execution_module.TOOL_REGISTRY (데코레이터 등록)에서 가져옵니다.
+        # (함수 + 실행 메타데이터: pure / side_effects / parallel_safe / latency / executor)
+        self.tool_registry = execution_module.TOOL_REGISTRY
+        # [Lite] 턴을 넘어 유지되는 도구 결과 캐시 (pure / 파일 mtime / TTL 정책)
+        self.tool_cache = ToolResultCache()
+        # [Lite] 코드 에디터 자동 디버거 상태 (세션 단위)
+        self.auto_fix_engine = auto_debug_module.AutoFixEngine()
+        # [Lite] 코드 추천 캐시 (코드 + 최근 대화 해시 -> 추천)와 진행 중인 추천 요청 공유
+        self.suggestion_cache: "OrderedDict[str, str]" = OrderedDict()
+        self._suggestion_inflight: Dict[str, asyncio.Task] = {}
+        self._suggestion_waiters: Dict[str, int] = {}
+        self._foreground_requests = 0 # 진행 중인 사용자 요청 수 (prefetch는 이때 양보)
+        # [Lite] 계획 실행 중 도구의 파일 쓰기를 변경 묶음으로 기록
+        self.snapshot_store = snapshot_store_module.get_snapshot_store(execution_module.SAFE_BASE_PATH)
+        # [Lite] project_dir가 주어진 요청은 프로젝트별 컨텍스트를 사용 (지연 활성화, 메모리 예산 초과 시 비활성화)
+        self.workspace = workspace_module.WorkspaceManager(self.project_root)
+        # [Lite] 첨부 파일은 샌드박스의 세션 폴더로 가져와 관련 청크만 프롬프트에 넣음
+        self.attachment_store = attachment_module.AttachmentStore(execution_module.SAFE_BASE_PATH)
+        self.loop_monitor: Optional[loop_monitor_module.LoopMonitor] = None
+        # [Lite] 요청 분류기 (플래너의 CHAT/PLAN 판정으로 계속 학습, 샌드박스에 저장)
+        self.triage_classifier = triage_module.TriageClassifier(
+            triage_module.model_path(execution_module.SAFE_BASE_PATH)
+        )
         
-        # [Lite] LLM 프롬프트에 주입할 도구 설명 문자열
-        self.available_tools_str = "\n".join(
-            f"- {name}: {info['description']}" 
-            for name, info in execution_module.AVAILABLE_TOOLS.items()
+        # [Lite] LLM 프롬프트에 주입할 도구 설명 문자열 (시그니처 + 실행 특성 포함)
+        self.available_tools_str = execution_module.describe_tools_for_prompt()
+        # [Lite] 플래너 응답을 제약할 스키마 (AVAILABLE_TOOLS 파라미터에서 파생)
+        self.plan_response_schema = plan_schema_module.build_plan_response_schema(
+            execution_module.AVAILABLE_TOOLS
         )
 
     # --- GUI 연동을 위한 필수 메서드 (단순화) ---
 
-    async def request_modification_suggestion_async(self, current_code: str, chat_history: List[str]) -> str:
-        """ [Lite] (Worker -> Core) AI 추천 요청을 LLM 모듈로 전달 """
-        return await lite_llm_module.generate_modification_suggestion_async(current_code, chat_history)
+    async def _symbol_context(self, current_code: str, current_file_path: Optional[str], cursor_line: Optional[int],
+                              budget_chars: int = symbol_index_module.SYMBOL_CONTEXT_BUDGET) -> Optional[Dict[str, Any]]:
+        """ (Helper) 파이썬 파일이면 커서 위치 심볼 + 의존성 컨텍스트 (색인 생성/파싱은 io 풀에서) """
+        if not current_file_path or not cursor_line or not current_file_path.endswith(".py"):
+            return None
+        root = symbol_index_module.project_root_for(current_file_path, execution_module.SAFE_BASE_PATH)
+        index = symbol_index_module.get_symbol_index(root)
+        return await run_in_pool("io", index.context_for, current_file_path, current_code, cursor_line, budget_chars)
+
+    async def _suggestion_code(self, current_code: str, current_file_path: Optional[str], cursor_line: Optional[int]) -> str:
+        """ (Helper) 추천 프롬프트에 넣을 코드: 커서 위치 심볼 컨텍스트, 없으면 파일 앞부분 """
+        context = await self._symbol_context(current_code, current_file_path, cursor_line,
+                                             lite_llm_module.SUGGESTION_CODE_CHARS)
+        return context["text"] if context else current_code[:lite_llm_module.SUGGESTION_CODE_CHARS]
+
+    async def request_modification_suggestion_async(self, current_code: str, chat_history: List[str],
+                                                    current_file_path: Optional[str] = None,
+                                                    cursor_line: Optional[int] = None) -> str:
+        """ [Lite] (Worker -> Core) AI 추천 요청. 미리 계산된 추천이 있거나 계산 중이면 그 결과를 사용 """
+        current_code = await self._suggestion_code(current_code, current_file_path, cursor_line)
+        key = self._suggestion_key(current_code, chat_history)
+        cached = self.suggestion_cache.get(key)
+        if cached is not None:
+            self.suggestion_cache.move_to_end(key)
+            metrics_module.CACHE_LOOKUPS.inc(cache="suggestion", result="hit")
+            return cached
+        metrics_module.CACHE_LOOKUPS.inc(cache="suggestion", result="shared" if key in self._suggestion_inflight else "miss")
+        self._suggestion_waiters[key] = self._suggestion_waiters.get(key, 0) + 1
+        try:
+            return await asyncio.shield(self._suggestion_task(key, current_code, chat_history))
+        finally:
+            self._suggestion_waiters[key] -= 1
+            if not self._suggestion_waiters[key]: del self._suggestion_waiters[key]
+
+    async def prefetch_modification_suggestion_async(self, current_code: str, chat_history: List[str],
+                                                     current_file_path: Optional[str] = None,
+                                                     cursor_line: Optional[int] = None) -> bool:
+        """
+        [Lite] (Worker -> Core) 추천을 미리 계산해 캐시합니다. (낮은 우선순위)
+        사용자 요청이 진행 중이면 건너뛰고, 취소되면(버퍼 변경) 다른 대기자가 없을 때 요청도 취소합니다.
+        반환: 캐시에 추천이 준비되었는지 여부
+        """
+        current_code = await self._suggestion_code(current_code, current_file_path, cursor_line)
+        key = self._suggestion_key(current_code, chat_history)
+        if key in self.suggestion_cache: return True
+        if self._foreground_requests: return False
+        task = self._suggestion_task(key, current_code, chat_history)
+        try:
+            await asyncio.shield(task)
+        except asyncio.CancelledError:
+            if not task.done() and not self._suggestion_waiters.get(key): task.cancel()
+            raise
+        return key in self.suggestion_cache
+
+    @staticmethod
+    def _suggestion_key(current_code: str, chat_history: List[str]) -> str:
+        """ (Helper) 추천 프롬프트에 실제로 들어가는 범위(코드 컨텍스트 + 최근 대화)의 해시 """
+        prompt_input = "\n".join(chat_history[-lite_llm_module.SUGGESTION_HISTORY_TURNS:]) + "\0" + \
+            current_code[:lite_llm_module.SUGGESTION_CODE_CHARS]
+        return hashlib.sha1(prompt_input.encode("utf-8", "replace")).hexdigest()
+
+    def _suggestion_task(self, key: str, current_code: str, chat_history: List[str]) -> asyncio.Task:
+        """ (Helper) 같은 키의 추천 요청은 하나만 실행하고 결과를 캐시에 저장 """
+        task = self._suggestion_inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(lite_llm_module.generate_modification_suggestion_async(current_code, chat_history))
+            self._suggestion_inflight[key] = task
+            def _store(done: asyncio.Task):
+                self._suggestion_inflight.pop(key, None)
+                if done.cancelled() or done.exception() is not None: return
+                suggestion = done.result()
+                if isinstance(suggestion, lite_llm_module.LLMFailure): return # 실패는 캐시하지 않음
+                self.suggestion_cache[key] = suggestion
+                while len(self.suggestion_cache) > SUGGESTION_CACHE_SIZE: self.suggestion_cache.popitem(last=False)
+            task.add_done_callback(_store)
+        return task
 
     async def request_code_modification_async(self, 
                                             current_code: str, 
                                             user_request: str, 
                                             new_file_name: Optional[str],
-                                            current_file_path: Optional[str]) -> Dict[str, str]:
-        """ [Lite] (Worker -> Core) 코드 수정 요청을 LLM 모듈로 전달 """
-        # (Lite 버전에서는 RAG(CodeVectorDB)를 사용하지 않고, 
-        #  llm_module이 코드를 잘라서 처리하는 Fallback 로직에 의존합니다)
+                                            current_file_path: Optional[str],
+                                            cursor_line: Optional[int] = None) -> Dict[str, str]:
+        """
+        [Lite] (Worker -> Core) 코드 수정 요청을 LLM 모듈로 전달.
+        파이썬 파일이 SYMBOL_SCOPE_MIN_CHARS보다 길고 커서가 함수/클래스 안이면 그 심볼만 수정합니다.
+        (심볼 + import + 의존 심볼만 보내고, 결과는 해당 줄 범위에 끼워 넣음) 새 파일 분리도 같은 컨텍스트를 사용합니다.
+        """
+        context = None
+        if len(current_code) > symbol_index_module.SYMBOL_SCOPE_MIN_CHARS:
+            context = await self._symbol_context(current_code, current_file_path, cursor_line)
+        if context and not (new_file_name and new_file_name.strip()):
+            new_region, prompt_chars = await lite_llm_module.modify_symbol_async(
+                context, user_request, os.path.basename(current_file_path))
+            if not new_region.strip():
+                raise RuntimeError(f"'{context['qualname']}' 심볼 수정 응답이 비어 있습니다.")
+            print(f"🎯 [Lite Core] 심볼 단위 수정: {context['qualname']} ({context['start_line']}~{context['end_line']}줄, "
+                  f"프롬프트 {prompt_chars}자 / 파일 {len(current_code)}자)")
+            return {"filepath": "CURRENT", "symbol": context["qualname"],
+                    "code": auto_debug_module.replace_region(current_code, context["start_line"], context["end_line"], new_region)}
         json_str = await lite_llm_module.modify_code_async(
             current_code, 
             user_request, 
             new_file_name,
-            relevant_chunks=None # [Lite] RAG 없음
+            relevant_chunks=context["text"] if context else None
         )
         try:
             return json.loads(json_str)
         except json.JSONDecodeError:
             return {"filepath": "CURRENT", "code": f"[LLM 파싱 오류]\n{json_str}"}
 
+    async def request_project_modification_async(self,
+                                                 user_request: str,
+                                                 project_root: str,
+                                                 current_file_path: Optional[str] = None,
+                                                 current_code: Optional[str] = None,
+                                                 cursor_line: Optional[int] = None) -> Dict[str, Any]:
+        """
+        [Lite] (Worker -> Core) 여러 파일에 걸친 코드 수정.
+        색인(심볼 + 검색)으로 관련 파일을 고르고, 합계가 PROJECT_MODIFY_BATCH_CHARS 이하면 요청 1회(일괄),
+        넘으면 파일별 요청을 PROJECT_MODIFY_CONCURRENCY개씩 병렬로 보냅니다.
+        수정안을 모두 검증한 뒤 하나의 스냅샷 변경 묶음으로 적용합니다. (되돌리기 한 번으로 전체 복원, 실패 시 아무것도 적용 안 함)
+        선택한 파일 중 하나라도 LLM 요청이 실패하면 일부만 적용하지 않고 전체를 중단합니다.
+        반환: {"changeset", "files"(수정된 상대 경로), "selected", "skipped", "mode"(batch/parallel), "prompt_chars"}
+        """
+        cursor_symbol = None
+        if current_code and cursor_line and (current_file_path or "").endswith(".py"):
+            parsed = symbol_index_module.parse_symbols(current_code)
+            symbol = symbol_index_module.find_symbol_at(parsed["symbols"], cursor_line) if parsed else None
+            cursor_symbol = symbol["qualname"] if symbol else None
+        selection = await run_in_pool("io", project_modify_module.select_files,
+                                      project_root, user_request, current_file_path, cursor_symbol)
+        paths = [p for p in selection["files"] if self.snapshot_store.contains(p)]
+        if not paths:
+            raise RuntimeError("수정할 파일을 찾지 못했습니다. (요청에 함수/클래스/파일 이름을 포함하세요)")
+
+        def _read_all() -> Dict[str, str]:
+            contents = {}
+            for path in paths:
+                if current_code is not None and current_file_path and path == os.path.realpath(current_file_path):
+                    contents[path] = current_code  # 에디터의 미저장 버퍼 기준
+                    continue
+                try:
+                    with open(path, "r", encoding="utf-8") as f: contents[path] = f.read()
+                except (OSError, UnicodeDecodeError):
+                    pass
+            return contents
+
+        by_path = await run_in_pool("io", _read_all)
+        root = os.path.realpath(project_root)
+        originals = {os.path.relpath(path, root): content for path, content in by_path.items()}
+        total_chars = sum(len(content) for content in originals.values())
+        print(f"🧩 [Lite Core] 프로젝트 수정: 파일 {len(originals)}개 선택 ({total_chars}자), 검색어 {selection['terms']}")
+
+        if total_chars <= project_modify_module.PROJECT_MODIFY_BATCH_CHARS:
+            mode = "batch"
+            edits, prompt_chars = await lite_llm_module.modify_project_files_async(originals, user_request)
+            if isinstance(edits, lite_llm_module.LLMFailure):
+                raise RuntimeError(f"LLM 요청 실패, 아무 파일도 변경하지 않았습니다: {edits}")
+        else:
+            mode = "parallel"
+            outlines = {rel: project_modify_module.outline(rel, content) for rel, content in originals.items()}
+            semaphore = asyncio.Semaphore(project_modify_module.PROJECT_MODIFY_CONCURRENCY)
+
+            async def _modify_one(rel: str) -> Tuple[str, Optional[str], int]:
+                others = "\n\n".join(f"=== {other} ===\n{text}" for other, text in outlines.items() if other != rel)
+                async with semaphore:
+                    code, chars = await lite_llm_module.modify_project_file_async(rel, originals[rel], user_request, others)
+                return rel, code, chars
+
+            results = await asyncio.gather(*(_modify_one(rel) for rel in originals))
+            failures = [f"{rel}: {code}" for rel, code, _ in results if isinstance(code, lite_llm_module.LLMFailure)]
+            if failures:
+                raise RuntimeError("LLM 요청 실패, 아무 파일도 변경하지 않았습니다: " + "; ".join(failures))
+            edits = {rel: code for rel, code, _ in results if code is not None}
+            prompt_chars = sum(chars for _, _, chars in results)
+
+        edits = {rel: code for rel, code in edits.items() if originals.get(rel) != code}
+        errors = project_modify_module.validate_edits(originals, edits)
+        if errors:
+            raise RuntimeError("수정안 검증 실패, 아무 파일도 변경하지 않았습니다: " + "; ".join(errors))
+        manifest = None
+        if edits:
+            before = {}
+            if current_code is not None and current_file_path:
+                before[os.path.realpath(current_file_path)] = current_code
+            manifest = await run_in_pool(
+                "io", self.snapshot_store.write_many, f"프로젝트 수정: {user_request[:40]}",
+                {os.path.join(root, rel): code for rel, code in edits.items()}, before)
+        return {"changeset": manifest["id"] if manifest else None, "files": sorted(edits),
+                "selected": sorted(originals), "skipped": selection["skipped"],
+                "mode": mode, "prompt_chars": prompt_chars}
+
+    async def request_auto_fix_async(self,
+                                     current_code: str,
+                                     error_output: str,
+                                     current_file_path: Optional[str]) -> Dict[str, Any]:
+        """
+        [Lite] (Worker -> Core) 자동 디버거 요청.
+        오류 지문별 시도 횟수를 제한하고, 실패 영역 + 요약 트레이스백만 LLM에 보냅니다.
+        반환: {"filepath": "CURRENT", "code": 수정된 전체 코드, "auto_fix": 요약} 또는
+              {"auto_fix_stopped": True, "message": ...}
+        """
+        engine = self._auto_fix_engine_for(current_file_path)
+        prepared = engine.prepare_fix(current_code, error_output, current_file_path)
+        summary = {"fingerprint": prepared["fingerprint"], "exc_type": prepared["exc_type"],
+                   "start_line": prepared["start_line"], "end_line": prepared["end_line"]}
+
+        if prepared["action"] == "stop":
+            return {"auto_fix_stopped": True, "message": prepared["message"], "auto_fix": summary}
+
+        if prepared["action"] == "cached":
+            fixed_region, prompt_chars, latency = prepared["cached_fix"], 0, 0.0
+            summary["cached"] = True
+        else:
+            started = time.monotonic()
+            fixed_region, prompt_chars = await lite_llm_module.fix_code_region_async(
+                prepared["region"], prepared["traceback"],
+                prepared["start_line"], prepared["end_line"],
+                os.path.basename(current_file_path or "current.py"),
+                failed_attempts=prepared["failed_attempts"]
+            )
+            latency = time.monotonic() - started
+            summary["cached"] = False
+
+        if not fixed_region.strip() or fixed_region.strip() == prepared["region"].strip():
+            # 빈 응답/변경 없음도 시도로 집계 (같은 요청 무한 반복 방지)
+            engine.record_attempt(current_file_path, prepared, prepared["region"], prompt_chars, latency)
+            return {"auto_fix_stopped": True, "auto_fix": summary,
+                    "message": "AI가 유효한 수정안을 반환하지 않았습니다."}
+
+        engine.record_attempt(current_file_path, prepared, fixed_region, prompt_chars, latency)
+        summary["prompt_tokens"] = prompt_chars // 4
+        summary["latency"] = latency
+        new_code = auto_debug_module.replace_region(
+            current_code, prepared["start_line"], prepared["end_line"], fixed_region
+        )
+        return {"filepath": "CURRENT", "code": new_code, "auto_fix": summary}
+
+    def undo_plan(self, changeset_id: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """ [Lite] 계획 실행 하나(기본: 가장 최근)의 파일 변경을 모두 되돌립니다. """
+        return self.snapshot_store.undo(changeset_id)
+
+    def redo_plan(self) -> Optional[Dict[str, Any]]:
+        """ [Lite] 마지막으로 되돌린 계획 실행을 다시 적용합니다. """
+        return self.snapshot_store.redo()
+
+    def report_run_success(self, current_file_path: Optional[str]) -> Optional[str]:
+        """ [Lite] 코드 실행 성공을 자동 디버거에 알리고, 해결된 버그 보고를 반환합니다. """
+        return self._auto_fix_engine_for(current_file_path).record_success(current_file_path)
+
+    def _auto_fix_engine_for(self, file_path: Optional[str]) -> auto_debug_module.AutoFixEngine:
+        """ (Helper) 파일이 속한 프로젝트의 자동 디버거 (프로젝트 밖이면 세션 공용) """
+        project_context = self.workspace.context_for_path(file_path)
+        return project_context.auto_fix_engine if project_context else self.auto_fix_engine
+
+    @contextlib.contextmanager
+    def _foreground_request(self):
+        """ (Helper) 사용자 요청 진행 표시 (취소/예외로 끝나도 해제되어야 prefetch가 다시 동작) """
+        self._foreground_requests += 1
+        try:
+            yield
+        finally:
+            self._foreground_requests -= 1
+
     # --- [Lite] 핵심 process_input (단순화된 버전) ---
 
     async def process_input(
@@ -71,7 +365,8 @@ class EidosLiteCore:
         image_input: Optional[bytes], # (Lite 버전에선 무시됨)
         chat_history: List[str],
         project_dir: Optional[str] = None, # (Lite 버전에선 사용됨)
-        user_text_short: Optional[str] = None
+        user_text_short: Optional[str] = None,
+        attachment_paths: Optional[List[str]] = None
     ) -> Tuple[
         None, str, None, float, bool, List,
         Optional[Dict], Optional[dict], str, str, float, dict
@@ -81,59 +376,121 @@ class EidosLiteCore:
         LLM을 호출하여 도구 계획을 세우고, 실행합니다.
         """
         print(f"\n--- EIDOS-Lite Cycle Start (Input: '{text_input[:50]}...') ---")
-        
-        reasoning_log = ""
-        natural_text = ""
-        exec_task_state = None # GUI에 전달할 계획/에디터 정보
+        with self._foreground_request():
+            reasoning_log = ""
+            natural_text = ""
+            exec_task_state = None # GUI에 전달할 계획/에디터 정보
+            succeeded = False # 요청 처리 성공 여부 (배치 실행기의 재시도/학습 판단용, 응답 문구로 추측하지 않음)
+            project_context = None
+            speculation = None
+            user_text = text_input # 첨부 발췌를 붙이기 전의 원래 지시 (프로젝트 기록용)
 
-        try:
-            # 1. [LLM 호출 1] 도구 사용 계획 생성
-            plan_json_str = await lite_llm_module.generate_tool_use_plan_async(
-                text_input, chat_history, self.available_tools_str
-            )
+            try:
+                # 0. [Lite] 프로젝트 컨텍스트: 다른 프로젝트의 대화 기록이 섞이지 않도록 이 프로젝트의 기록을 사용
+                if project_dir:
+                    project_context = self.workspace.activate(project_dir)
+                    chat_history = project_context.history_for(text_input)
+
+                # 0b. [Lite] 첨부 파일: 샌드박스로 가져오고(캐시 적중 시 비용 없음) 지시와 관련된 청크만 프롬프트에 추가
+                if attachment_paths:
+                    attachments = await run_in_pool("io", self.attachment_store.ingest_many, attachment_paths)
+                    cached_count = sum(1 for a in attachments if a.get("cached"))
+                    reasoning_log += f"[Lite Core] 첨부 {len(attachments)}개 수집 (캐시 적중 {cached_count}개)\n"
+                    text_input = attachment_module.build_attachment_prompt(attachments, text_input) + \
+                        f"\n\n[사용자 지시]\n{text_input}"
+
+                # 0c. [Lite] 요청 분류: 인사/짧은 대화는 플래너(큰 모델)를 거치지 않고 바로 대답
+                triage = triage_module.classify(user_text, self.triage_classifier, has_attachments=bool(attachment_paths))
+                metrics_module.TRIAGE.inc(route=triage["route"], source=triage["source"])
+                reasoning_log += f"[Lite Core] 요청 분류: {triage['route']} ({triage['reason']})\n"
+
+                if triage["route"] == triage_module.ROUTE_CHAT:
+                    plan_result, plan_log = {"is_chat": True, "plan": [], "errors": [], "repairs": []}, ""
+                else:
+                    # 1. [LLM 호출 1] 도구 사용 계획 생성 (스키마 제약 + 로컬 검증/복구)
+                    #    계획이 스트리밍되는 동안 완성된 읽기 전용 단계는 미리 실행 (쓰기는 계획 검증 후 실행)
+                    speculation = {"steps": {}, "safe_base_path": self._safe_base_path(project_dir),
+                                   "tool_cache": project_context.tool_cache if project_context else self.tool_cache}
+                    plan_result, plan_log = await self._generate_validated_plan_async(text_input, chat_history, speculation)
+                    if not plan_result["errors"]:
+                        self._learn_triage(user_text, triage_module.ROUTE_CHAT if plan_result["is_chat"] else triage_module.ROUTE_TOOL)
             
-            # 2. 계획/대화 분기
-            if "CHAT" in plan_json_str.upper():
-                # 2a. 단순 대화
-                print("  [Lite Core] 'CHAT' 모드 감지. 단순 응답 생성...")
-                reasoning_log = "[Lite Core] 단순 대화로 분류됨."
-                natural_text = await lite_llm_module.get_llm_response_async(
-                    f"사용자의 마지막 말에 대해 친근하게 대답하세요: '{text_input}'"
-                )
+                # 2. 계획/대화 분기
+                if plan_result["is_chat"]:
+                    # 2a. 단순 대화
+                    print("  [Lite Core] 'CHAT' 모드 감지. 단순 응답 생성...")
+                    reasoning_log += "[Lite Core] 단순 대화로 분류됨."
+                    metrics_module.PLANS.inc(result="chat")
+                    natural_text = await lite_llm_module.get_llm_response_async(
+                        f"사용자의 마지막 말에 대해 친근하게 대답하세요: '{text_input}'", profile="chat"
+                    )
+                    succeeded = not isinstance(natural_text, lite_llm_module.LLMFailure)
             
-            else:
-                # 2b. 도구 사용
-                print(f"  [Lite Core] 'TASK' 모드 감지. 계획 수신:\n{plan_json_str}")
-                reasoning_log = f"[Lite Core] 도구 사용 계획 수신.\n{plan_json_str}"
+                elif plan_result["errors"]:
+                    # 2b. 복구/재계획 후에도 유효하지 않은 계획
+                    error_summary = "; ".join(plan_result["errors"])
+                    natural_text = f"작업 계획 파싱 실패. (오류: {error_summary})"
+                    reasoning_log += f"[Lite Core] 계획 검증 실패.\n{plan_log}"
+                    metrics_module.PLANS.inc(result="failed")
+                    metrics_module.PLAN_FAILURES.inc(stage="validation")
+            
+                else:
+                    # 2c. 도구 사용
+                    plan = plan_result["plan"] # 검증된 계획 객체 (요청 처리 중 JSON으로 다시 직렬화/파싱하지 않음)
+                    plan_summary = plan_view_module.summarize_plan(plan)
+                    plan_log_str = plan_view_module.plan_log_text(plan, plan_summary)
+                    print(f"  [Lite Core] 'TASK' 모드 감지. 계획 수신:\n{plan_log_str}")
+                    reasoning_log += f"[Lite Core] 도구 사용 계획 수신.{plan_log}\n{plan_log_str}"
                 
-                # [Lite] GUI가 계획을 표시하고 에디터를 열 수 있도록 exec_task_state 설정
-                # (eidos_v4_0_core.py L3314의 로직과 유사하게)
-                editor_type_str = "CODE" if "write_project" in plan_json_str or ".py" in plan_json_str else "DOCUMENT"
-                project_dir_str = self._extract_project_dir_from_plan_helper(plan_json_str)
+                    # [Lite] GUI가 계획을 표시하고 에디터를 열 수 있도록 exec_task_state 설정
+                    # (eidos_v4_0_core.py L3314의 로직과 유사하게)
+                    editor_type_str = self._editor_type_for_plan(plan)
+                    project_dir_str = self._extract_project_dir_from_plan_helper(plan) or project_dir
                 
-                exec_task_state = {
-                    "plan_json": plan_json_str,
-                    "editor_type": editor_type_str,
-                    "project_dir": project_dir_str,
-                    "evaluation_criteria": None # [Lite] QA 기능 없음
-                }
+                    exec_task_state = {
+                        "plan": plan,        # (참조 전달, GUI는 세부 보기에서 페이지 단위로만 읽음)
+                        "plan_summary": plan_summary,
+                        "editor_type": editor_type_str,
+                        "project_dir": project_dir_str,
+                        "evaluation_criteria": None # [Lite] QA 기능 없음
+                    }
                 
-                # [Lite] (중요) AGI Core와 달리, Lite는 계획을 '즉시 실행'합니다.
-                # autonomous_tick_async가 없기 때문입니다.
-                print("  [Lite Core] 계획을 즉시 실행합니다...")
-                execution_result = await self._execute_task(
-                    plan_json_str, 
-                    project_dir_context=project_dir
-                )
+                    # [Lite] (중요) AGI Core와 달리, Lite는 계획을 '즉시 실행'합니다.
+                    # autonomous_tick_async가 없기 때문입니다.
+                    print("  [Lite Core] 계획을 즉시 실행합니다...")
+                    step_log: List[str] = []
+                    execution_result = await self._execute_task(
+                        plan, 
+                        project_dir_context=project_dir,
+                        step_log=step_log,
+                        tool_cache=project_context.tool_cache if project_context else None,
+                        speculative_steps=speculation["steps"]
+                    )
+                    if step_log:
+                        reasoning_log += "\n" + "\n".join(step_log)
                 
-                # 실행 결과를 자연어 응답으로 사용
-                natural_text = execution_result.replace("EVENT: ", "")
-                reasoning_log += f"\n[Lite Core] 실행 완료: {natural_text}"
+                    # 실행 결과를 자연어 응답으로 사용
+                    natural_text = execution_result.replace("EVENT: ", "")
+                    plan_ok = not isinstance(execution_result, execution_module.ToolFailure)
+                    succeeded = plan_ok
+                    metrics_module.PLANS.inc(result="ok" if plan_ok else "failed")
+                    if not plan_ok: metrics_module.PLAN_FAILURES.inc(stage="execution")
+                    reasoning_log += f"\n[Lite Core] 실행 완료: {natural_text}"
 
-        except Exception as e:
-            print(f"❌ [Lite Core] process_input 중 심각한 오류: {e}")
-            natural_text = f"[Lite Core 오류] {e}"
-            reasoning_log = f"오류 발생: {e}"
+            except Exception as e:
+                print(f"❌ [Lite Core] process_input 중 심각한 오류: {e}")
+                natural_text = f"[Lite Core 오류] {e}"
+                reasoning_log = f"오류 발생: {e}"
+                metrics_module.PLANS.inc(result="failed")
+                metrics_module.PLAN_FAILURES.inc(stage="exception")
+
+            if speculation:
+                self._discard_speculative_steps(speculation["steps"])
+            if self.loop_monitor:
+                loop_events = loop_monitor_module.format_events(self.loop_monitor.drain_events())
+                if loop_events: reasoning_log += "\n" + loop_events
+            if project_context:
+                project_context.record_turn(user_text, natural_text)
 
         # 3. AGI Core의 복잡한 반환값 대신, 단순화된 Stub 데이터 반환
         return (
@@ -148,25 +505,134 @@ class EidosLiteCore:
             reasoning_log,              # [중요] 추론 로그 (계획)
             natural_text,               # [중요] 자연어 응답 (실행 결과)
             1.0,                        # purity (없음)
-            {}                          # complex_states (없음)
+            {"succeeded": succeeded}    # complex_states: 처리 성공 여부 (실패한 단계/LLM 호출이면 False)
         )
 
+    def _learn_triage(self, text: str, label: str):
+        """ (Helper) 플래너 판정을 요청 분류기 예시로 학습 (일정 개수마다 io 풀에서 저장) """
+        if self.triage_classifier.learn(text, label):
+            run_in_pool("io", self.triage_classifier.save)
+
+    async def _generate_validated_plan_async(self, text_input: str, chat_history: List[str],
+                                             speculation: Optional[Dict[str, Any]] = None) -> Tuple[Dict[str, Any], str]:
+        """
+        [Helper] 플래너를 호출하고 응답을 로컬에서 검증/복구합니다.
+        로컬 복구로 해결되지 않는 경우에만 오류를 첨부해 재계획합니다. (최대 MAX_REPLAN_ATTEMPTS회)
+        speculation이 주어지면 응답을 스트리밍으로 받으며 완성된 읽기 전용 단계를 미리 실행합니다.
+        반환: (plan_schema_module.parse_planner_response 결과, 추론 로그용 문자열)
+        """
+        previous_errors = None
+        plan_log = ""
+        for attempt in range(MAX_REPLAN_ATTEMPTS + 1):
+            if speculation is not None:
+                raw_plan = await self._stream_plan_with_speculation(text_input, chat_history, previous_errors, speculation)
+            else:
+                raw_plan = await lite_llm_module.generate_tool_use_plan_async(
+                    text_input, chat_history, self.available_tools_str,
+                    response_schema=self.plan_response_schema,
+                    previous_errors=previous_errors
+                )
+            plan_result = plan_schema_module.parse_planner_response(raw_plan, execution_module.AVAILABLE_TOOLS)
+            if plan_result["repairs"]:
+                plan_log += f"\n[Lite Core] 계획 로컬 복구: {', '.join(plan_result['repairs'])}"
+            if plan_result["is_chat"] or not plan_result["errors"]:
+                return plan_result, plan_log
+
+            print(f"  [Lite Core] 계획 검증 실패 (시도 {attempt+1}): {plan_result['errors']}")
+            plan_log += f"\n[Lite Core] 계획 검증 실패 (시도 {attempt+1}): {'; '.join(plan_result['errors'])}"
+            previous_errors = plan_schema_module.format_errors_for_replan(plan_result["errors"], raw_plan)
+        return plan_result, plan_log
+
+    async def _stream_plan_with_speculation(self, text_input: str, chat_history: List[str],
+                                            previous_errors: Optional[str], speculation: Dict[str, Any]) -> str:
+        """
+        (Helper) 계획 JSON을 스트리밍으로 받으며 단계가 완성될 때마다 선실행 여부를 판단합니다.
+        선실행 대상: 레지스트리에서 선실행을 허용한(speculative) 싼 읽기 도구 중 직전 단계 결과를 쓰지 않으며 단독 검증을 통과한 단계.
+        (LLM 호출처럼 느린 도구는 계획이 바뀌면 낭비되므로 읽기 전용이어도 검증 후 실행)
+        (첫 쓰기 단계 이전의 단계만 선실행)
+        반환: 전체 응답 원문 (API 오류 시 오류 문자열 -> 검증 실패로 처리)
+        """
+        parser = plan_schema_module.IncrementalPlanParser()
+        chunks: List[str] = []
+        speculating = True # 쓰기(또는 해석 불가) 단계가 나오면 이후 단계는 그 결과를 볼 수 있어야 하므로 선실행 중단
+        try:
+            async for chunk in lite_llm_module.stream_tool_use_plan_async(
+                text_input, chat_history, self.available_tools_str,
+                response_schema=self.plan_response_schema,
+                previous_errors=previous_errors
+            ):
+                chunks.append(chunk)
+                for index, step in parser.feed(chunk):
+                    if speculating:
+                        speculating = self._maybe_speculate_step(index, step, speculation)
+        except Exception as e:
+            print(f"❌ [Lite Core] 계획 스트리밍 중 오류: {e}")
+            return f"LLM API 호출 실패: {type(e).__name__} - {e}"
+        return "".join(chunks)
+
+    def _maybe_speculate_step(self, index: int, step: Any, speculation: Dict[str, Any]) -> bool:
+        """
+        (Helper) 스트리밍 중 완성된 단계 하나를 (조건이 맞으면) 백그라운드에서 미리 실행합니다.
+        반환: 이후 단계도 선실행할 수 있는지 (쓰기/알 수 없는 단계 뒤로는 False)
+        """
+        if not isinstance(step, dict): return False
+        spec = self.tool_registry.get(step.get("tool"))
+        if not spec or spec["side_effects"]: return False
+        if not spec["speculative"]: return True  # 읽기 전용이지만 선실행 대상 아님 (뒤 단계는 계속 판단)
+        normalized, errors = plan_schema_module.validate_plan([step], execution_module.AVAILABLE_TOOLS, [])
+        if errors: return True
+        step = normalized[0]
+        if any(has_step_reference(v) for v in step["args"].values()): return True
+        steps = speculation["steps"]
+        previous = steps.get(index)
+        if previous is not None:
+            if previous[0] == step: return True  # 재계획에서 같은 단계 -> 진행 중인 결과 유지
+            previous[1].cancel()
+        step_log: List[str] = []
+        task = asyncio.ensure_future(self._run_step(
+            index, step, StepResultStore(), speculation["safe_base_path"], {}, step_log, speculation["tool_cache"]
+        ))
+        task.add_done_callback(lambda t: t.cancelled() or t.exception())  # 쓰이지 않은 실패는 조용히 버림
+        steps[index] = (step, task, step_log)
+        print(f"  [Lite Core] 단계 {index+1} '{step['tool']}' 선실행 시작 (계획 스트리밍 중)")
+        return True
+
+    @staticmethod
+    def _discard_speculative_steps(speculative_steps: Dict[int, Tuple[dict, "asyncio.Task", List[str]]]):
+        """ (Helper) 최종 계획에 쓰이지 않은 선실행 단계 취소 (읽기 전용이므로 결과만 버림) """
+        for _, task, _ in speculative_steps.values():
+            task.cancel()
+        speculative_steps.clear()
+
+    def _safe_base_path(self, project_dir_context: Optional[str]) -> str:
+        """ (Helper) 계획 실행 시 경로 보안 검사의 기준 폴더 (프로젝트가 주어지면 그 하위) """
+        if project_dir_context:
+            return os.path.normpath(os.path.join(self.project_root, project_dir_context))
+        return self.project_root
+
+    @staticmethod
+    def _editor_type_for_plan(task_list: list) -> str:
+        """ (Helper) 프로젝트 쓰기나 .py 파일을 다루는 계획이면 코드 에디터 (문자열 인수만 확인, 직렬화 없음) """
+        for task in task_list:
+            if str(task.get("tool", "")).startswith("write_project"): return "CODE"
+            if any(isinstance(value, str) and ".py" in value for value in task.get("args", {}).values()): return "CODE"
+        return "DOCUMENT"
+
     # --- eidos_v4_0_core.py에서 이식된 헬퍼 함수 2개 ---
     
-    def _extract_project_dir_from_plan_helper(self, exec_task_json: str) -> Optional[str]:
-        """ [Helper] JSON 계획을 파싱하여 eidos_files/ 하위의
+    def _extract_project_dir_from_plan_helper(self, task_list: list) -> Optional[str]:
+        """ [Helper] 파싱된 계획에서 eidos_files/ 하위의
             프로젝트 디렉토리 이름(첫 번째 폴더)을 추출합니다. (Sync)
-            (eidos_v4_0_core.py L3448에서 복사)
+            (eidos_v4_0_core.py L3448에서 복사, JSON 문자열 대신 계획 객체를 받음)
         """
         try:
-            task_list = json.loads(exec_task_json)
             if not isinstance(task_list, list): return None
             for task in task_list:
                 args = task.get("args", {})
                 if not args or not isinstance(args, dict): continue
                 target_path = None
                 if "file_structure" in args and isinstance(args["file_structure"], dict) and args["file_structure"]:
-                    target_path = list(args["file_structure"].keys())[0]
+                    target_path = next(iter(args["file_structure"]))
                 elif "filepath" in args and isinstance(args["filepath"], str):
                     target_path = args["filepath"]
                 elif "path" in args and isinstance(args["path"], str):
@@ -186,98 +652,176 @@ class EidosLiteCore:
         except Exception:
             return None
 
-    async def _execute_task(self, task_plan_json: str, project_dir_context: Optional[str] = None) -> str:
+    def _check_and_correct_path(self, rel_path: str, base_dir: str, must_exist: bool = False) -> str:
+        """ (Helper) eidos_v4_0_core.py L3736에서 복사된 보안 검사 """
+        abs_target = os.path.normpath(os.path.join(base_dir, rel_path))
+        if os.path.commonprefix([abs_target, base_dir]) != base_dir:
+            raise PermissionError(f"Security Error: Path is outside sandbox: {rel_path}")
+        if must_exist and not os.path.exists(abs_target):
+            raise FileNotFoundError(f"File not found: {rel_path}")
+        return abs_target
+
+    def _is_parallel_step(self, task: Any, first_in_batch: bool) -> bool:
+        """ (Helper) 병렬 배치에 넣을 수 있는 단계인지 (레지스트리 메타데이터 기반) """
+        if not isinstance(task, dict): return False
+        spec = self.tool_registry.get(task.get("tool"))
+        if not spec or not spec["parallel_safe"]: return False
+        if first_in_batch: return True
+        # 배치 중간 단계는 이전 단계 결과에 의존하면 안 됨
+        args = task.get("args", {})
+        return not any(has_step_reference(v) for v in args.values())
+
+    async def _run_step(self, index: int, task: dict, results: StepResultStore,
+                        safe_base_path: str, inflight: Dict[str, "asyncio.Future"],
+                        step_log: List[str], tool_cache: ToolResultCache) -> str:
+        """ (Helper) 단일 단계 실행: 경로 보안 검사 -> 플레이스홀더 교체 -> 캐시 확인 -> 도구 실행 """
+        tool_name = task.get("tool")
+        args_dict = dict(task.get("args", {}))
+        spec = self.tool_registry[tool_name]
+        print(f"  [Exec-Lite Step {index+1}] Tool: '{tool_name}' (executor={spec['executor']})")
+
+        # [Lite] 경로 보안 검사 (Core 로직 재사용)
+        if tool_name == "write_project_files_async":
+            original_file_dict = args_dict.get("file_structure", {})
+            corrected_file_dict = {}
+            for rel_path, content in original_file_dict.items():
+                safe_abs_path = self._check_and_correct_path(rel_path, safe_base_path)
+                corrected_file_dict[safe_abs_path] = content
+            args_dict["file_structure"] = corrected_file_dict
+        elif tool_name in ("write_file", "read_file"):
+            original_path = args_dict.get("filepath", args_dict.get("path"))
+            if original_path:
+                safe_abs_path = self._check_and_correct_path(
+                    original_path, 
+                    safe_base_path, 
+                    must_exist=(tool_name == "read_file")
+                )
+                args_dict["filepath"] = safe_abs_path
+
+        # 인수(Argument) 준비: 결과 참조 해석 (LLM 프롬프트 인수에는 잘라서 넣음)
+        args_dict = results.resolve_args(args_dict, spec["prompt_args"])
+
+        # [Lite] 캐시 가능한 도구는 세션 캐시(이전 턴 포함) 또는 실행 중인 동일 단계 결과를 재사용
+        cache_key = tool_cache.make_key(tool_name, args_dict, spec)
+        if cache_key is not None:
+            cached_result = tool_cache.get(cache_key)
+            if cached_result is not None:
+                print(f"  [Exec-Lite Step {index+1}] 캐시 적중.")
+                metrics_module.CACHE_LOOKUPS.inc(cache="tool", result="hit")
+                step_log.append(f"[Lite Core] 단계 {index+1} '{tool_name}' 캐시 적중 (재실행 생략)")
+                return cached_result
+            if cache_key in inflight:
+                print(f"  [Exec-Lite Step {index+1}] 동일 단계 결과 공유.")
+                metrics_module.CACHE_LOOKUPS.inc(cache="tool", result="shared")
+                step_log.append(f"[Lite Core] 단계 {index+1} '{tool_name}' 동일 단계 결과 공유")
+                return await inflight[cache_key]
+            metrics_module.CACHE_LOOKUPS.inc(cache="tool", result="miss")
+            inflight[cache_key] = asyncio.ensure_future(
+                execution_module.run_tool_async(tool_name, **args_dict)
+            )
+            current_result = await inflight[cache_key]
+            if not isinstance(current_result, execution_module.ToolFailure):
+                tool_cache.put(cache_key, current_result, spec)
+        else:
+            # 도구 실행 (레지스트리 executor에 따라 loop/thread/process)
+            current_result = await execution_module.run_tool_async(tool_name, **args_dict)
+        print(f"  [Exec-Lite Step {index+1}] 완료.")
+        return current_result
+
+    def _speculative_result(self, index: int, task: Any,
+                            speculative_steps: Dict[int, Tuple[dict, "asyncio.Task", List[str]]],
+                            step_log: List[str]):
+        """ (Helper) 최종 계획의 단계가 선실행한 단계와 같으면 그 결과를 기다리는 코루틴 (다르면 선실행 취소 후 None) """
+        entry = speculative_steps.pop(index, None)
+        if entry is None: return None
+        step, task_future, speculative_log = entry
+        if step != task:
+            task_future.cancel(); return None
+
+        async def _reuse() -> str:
+            result = await task_future
+            step_log.extend(speculative_log)
+            step_log.append(f"[Lite Core] 단계 {index+1} '{step['tool']}' 계획 스트리밍 중 선실행한 결과 사용")
+            return result
+        return _reuse()
+
+    async def _execute_task(self, task_list: list, project_dir_context: Optional[str] = None,
+                            step_log: Optional[List[str]] = None,
+                            tool_cache: Optional[ToolResultCache] = None,
+                            speculative_steps: Optional[Dict[int, Tuple[dict, "asyncio.Task", List[str]]]] = None) -> str:
         """
         [Helper] EIDOS Core (v18.21)에서 이식된 도구 실행기.
         (eidos_v4_0_core.py L3683에서 복사 및 단순화)
+        연속된 parallel_safe 단계는 하나의 배치로 묶어 동시에 실행합니다.
+        step_log가 주어지면 캐시 적중 등 단계별 메모를 추가합니다. (추론 로그용)
+        tool_cache가 없으면 세션 공용 캐시를 사용합니다. (프로젝트 컨텍스트는 자기 캐시를 넘김)
+        speculative_steps는 계획 스트리밍 중 미리 시작한 읽기 전용 단계입니다. (같은 단계면 결과 재사용)
+        계획이나 단계가 하나라도 실패하면 실행 결과를 execution_module.ToolFailure로 반환합니다.
         """
-        print(f"⚙️ [Exec-Lite] 작업 계획(JSON) 수신: '{task_plan_json}'")
-        
-        # [Lite] 이 맵은 __init__에서 설정한 self.tool_functions를 사용
-        available_tool_functions = self.tool_functions.copy()
+        if step_log is None: step_log = []
+        print(f"⚙️ [Exec-Lite] 작업 계획 수신: '{plan_view_module.plan_log_text(task_list)}'")
 
         # [Lite] 샌드박스 경로 설정 (project_root는 __init__에서 설정됨)
-        BASE_PATH = self.project_root 
-        if project_dir_context:
-            safe_base_path = os.path.normpath(os.path.join(BASE_PATH, project_dir_context))
-        else:
-            safe_base_path = BASE_PATH
-
-        def _check_and_correct_path(rel_path: str, base_dir: str, must_exist: bool = False) -> str:
-             """ (Helper) eidos_v4_0_core.py L3736에서 복사된 보안 검사 """
-             abs_target = os.path.normpath(os.path.join(base_dir, rel_path))
-             if os.path.commonprefix([abs_target, base_dir]) != base_dir:
-                 raise PermissionError(f"Security Error: Path is outside sandbox: {rel_path}")
-             if must_exist and not os.path.exists(abs_target):
-                 raise FileNotFoundError(f"File not found: {rel_path}")
-             return abs_target
-        
-        try:
-            task_list = json.loads(task_plan_json)
-        except Exception as e:
-            return f"EVENT: 작업 계획 파싱 실패. (오류: {e})"
+        safe_base_path = self._safe_base_path(project_dir_context)
+        if not isinstance(task_list, list):
+            return execution_module.ToolFailure(f"EVENT: 작업 계획 파싱 실패. (계획이 목록이 아님: {type(task_list).__name__})")
 
-        previous_step_result = "" 
-        final_result = ""
+        # [Lite] 이 계획의 모든 파일 쓰기를 하나의 변경 묶음(스냅샷)으로 기록
+        with self.snapshot_store.changeset(f"계획 실행 ({len(task_list)}단계)") as changeset_id:
+            result = await self._execute_task_list(task_list, safe_base_path, step_log, tool_cache or self.tool_cache,
+                                                   speculative_steps or {})
+        manifest = self.snapshot_store.get_manifest(changeset_id)
+        if manifest:
+            step_log.append(f"[Lite Core] 스냅샷 {changeset_id}: 파일 {len(manifest['files'])}개 변경 기록 (되돌리기 가능)")
+        return result
 
-        for i, task in enumerate(task_list):
-            try:
-                tool_name = task.get("tool")
-                args_dict = task.get("args", {})
-                print(f"  [Exec-Lite Step {i+1}] Tool: '{tool_name}'")
-
-                # [Lite] 'write_text'는 LLM을 직접 호출
-                if tool_name == "write_text":
-                    prompt = args_dict.get("prompt", "")
-                    if "$PREV_STEP_RESULT" in prompt:
-                        prompt = prompt.replace("$PREV_STEP_RESULT", previous_step_result)
-                    print("    -> (LLM 호출 중...)")
-                    current_result = await lite_llm_module.get_llm_response_async(prompt)
-                    previous_step_result = current_result
-                    final_result = current_result
-                    print(f"  [Exec-Lite Step {i+1}] 완료 (LLM).")
-                    continue
+    async def _execute_task_list(self, task_list: list, safe_base_path: str, step_log: List[str],
+                                 tool_cache: ToolResultCache,
+                                 speculative_steps: Dict[int, Tuple[dict, "asyncio.Task", List[str]]]) -> str:
+        """ (Helper) 파싱된 계획의 단계들을 순서대로(병렬 배치 포함) 실행합니다. """
+        results = StepResultStore() # 단계 결과는 여기에만 보관하고 참조로 넘김
+        final_note: Optional[str] = None
+        failed_steps: List[int] = [] # 실패 결과(ToolFailure)를 반환했거나 도구를 찾을 수 없던 단계 번호
+        inflight: Dict[str, asyncio.Future] = {}
 
-                func_to_call = available_tool_functions.get(tool_name)
-                if not func_to_call:
-                    final_result = f"'{tool_name}' 도구를 찾을 수 없음."
-                    continue
+        i = 0
+        while i < len(task_list):
+            task = task_list[i]
+            tool_name = task.get("tool") if isinstance(task, dict) else None
+            if tool_name not in self.tool_registry:
+                final_note = f"'{tool_name}' 도구를 찾을 수 없음."
+                failed_steps.append(i + 1)
+                i += 1
+                continue
 
-                # [Lite] 경로 보안 검사 (Core 로직 재사용)
-                if tool_name in ("write_file", "read_file", "write_project_files_async"):
-                    if tool_name == "write_project_files_async":
-                        original_file_dict = args_dict.get("file_structure", {})
-                        corrected_file_dict = {}
-                        for rel_path, content in original_file_dict.items():
-                            safe_abs_path = _check_and_correct_path(rel_path, safe_base_path)
-                            corrected_file_dict[safe_abs_path] = content
-                        args_dict["file_structure"] = corrected_file_dict
-                    
-                    elif tool_name in ("write_file", "read_file"):
-                        original_path = args_dict.get("filepath", args_dict.get("path"))
-                        if original_path:
-                            safe_abs_path = _check_and_correct_path(
-                                original_path, 
-                                safe_base_path, 
-                                must_exist=(tool_name == "read_file")
-                            )
-                            args_dict["filepath"] = safe_abs_path
-
-                # 인수(Argument) 준비 (플레이스홀더 교체)
-                for key, value in args_dict.items():
-                    if isinstance(value, str) and "$PREV_STEP_RESULT" in value:
-                        args_dict[key] = value.replace("$PREV_STEP_RESULT", previous_step_result)
-
-                # 도구 실행 (비동기 호출)
-                current_result = await func_to_call(**args_dict)
-                
-                previous_step_result = current_result
-                final_result = current_result 
-                print(f"  [Exec-Lite Step {i+1}] 완료.")
+            batch = [i]
+            if self._is_parallel_step(task, first_in_batch=True):
+                while batch[-1] + 1 < len(task_list) and self._is_parallel_step(task_list[batch[-1] + 1], first_in_batch=False):
+                    batch.append(batch[-1] + 1)
+            if len(batch) > 1:
+                print(f"  [Exec-Lite] 단계 {batch[0]+1}~{batch[-1]+1} 병렬 실행.")
 
-            except Exception as e:
-                print(f"❌ [Exec-Lite] '{tool_name}' 실행 중 오류: {e}")
-                return f"EVENT: 작업 '{tool_name}' 실행 중 오류 발생: {e}"
+            batch_results = await asyncio.gather(
+                *(self._speculative_result(j, task_list[j], speculative_steps, step_log)
+                  or self._run_step(j, task_list[j], results, safe_base_path, inflight, step_log, tool_cache)
+                  for j in batch),
+                return_exceptions=True
+            )
+            for j, result in zip(batch, batch_results):
+                if isinstance(result, BaseException):
+                    failed_tool = task_list[j].get("tool")
+                    print(f"❌ [Exec-Lite] '{failed_tool}' 실행 중 오류: {result}")
+                    return execution_module.ToolFailure(f"EVENT: 작업 '{failed_tool}' 실행 중 오류 발생: {result}")
+                if isinstance(result, execution_module.ToolFailure): failed_steps.append(j + 1)
+                results.put(j + 1, result)
+                final_note = None
+            i = batch[-1] + 1
 
+        # 최종 결과는 미리보기만 (긴 파일/글 전체가 대화 기록과 다음 프롬프트로 복사되지 않도록)
+        final_result = final_note if final_note is not None else results.preview()
+        if failed_steps:
+            print(f"⚠️ [Exec-Lite] 계획 실행 완료 (실패한 단계: {failed_steps})")
+            return execution_module.ToolFailure(f"EVENT: 작업 계획 실행 완료 (실패한 단계: {', '.join(map(str, failed_steps))}). "
+                                                f"최종 결과: {final_result}")
         print(f"✅ [Exec-Lite] 모든 계획 실행 완료.")
         return f"EVENT: 작업 계획 실행 완료. 최종 결과: {final_result}"
@@ -1,8 +1,17 @@
 import json
 import asyncio
 import os
+import time
 import sympy
 import aiohttp 
+from typing import Any, Callable, Dict, List, Optional
+
+import lite_llm_module
+import metrics_module
+import executor_pool_module
+import replay_module
+import project_search_module
+import snapshot_store_module
 
 SCRIPT_DIR_GLOBAL = os.path.dirname(os.path.abspath(__file__))
 SAFE_BASE_PATH = os.path.normpath(os.path.join(SCRIPT_DIR_GLOBAL, "eidos_files"))
@@ -29,33 +38,130 @@ try:
 except ImportError:
     print("⚠️ [Execution Module-Lite] Google Search Tool을(를) 찾을 수 없습니다. Fallback 시뮬레이션 모드로 유지됩니다.")
 
-AVAILABLE_TOOLS = {
-    "perform_web_search": {
-        "description": "최신 정보나 특정 주제에 대해 웹을 검색합니다. (예: '최신 AI 기술 동향')",
-        "parameters": {"query": "str", "num_results": "int"}
-    },
-    "calculate_math": {
-        "description": "정확한 수학 표현식(방정식, 미적분 등)을 계산합니다. (예: 'sqrt(16) * 2')",
-        "parameters": {"expression": "str"}
-    },
-    "write_text": {
-        "description": "주어진 프롬프트를 바탕으로 긴 글(보고서, 이메일, 코드 등)을 작성합니다. (LLM 호출)",
-        "parameters": {"prompt": "str"}
-    },
-    "read_file": {
-        "description": "지정된 경로의 파일 내용을 읽습니다. (경로: './eidos_files/' 내부)",
-        "parameters": {"filepath": "str"}
-    },
-    "write_file": {
-        "description": "지정된 경로에 텍스트 내용을 저장합니다. (경로: './eidos_files/' 내부)",
-        "parameters": {"filepath": "str", "content": "str"}
-    },
-    "write_project_files_async": {
-        "description": "여러 파일을 프로젝트 구조로 일괄 저장합니다. (경로: './eidos_files/' 내부)",
-        "parameters": {"file_structure": "dict"} 
-    }
-}
+# --- [Lite] 도구 레지스트리 ---
+# 각 도구는 @register_tool 데코레이터로 설명/파라미터 스키마와 실행 메타데이터를 한 곳에서 선언합니다.
+#   pure:          같은 인수 -> 같은 결과, 부작용 없음 (결과 캐시 가능)
+#   side_effects:  파일 쓰기 등 외부 상태를 바꾸는지 여부
+#   parallel_safe: 다른 병렬 안전 단계와 동시에 실행해도 되는지 여부
+#   latency:       예상 지연 등급 (LATENCY_*)
+#   executor:      실행 위치 (EXECUTOR_*). 동기 함수는 thread/process 풀에서 실행됩니다.
+#   pool:            (선택) 실행 풀 이름 (config.EXECUTOR_POOLS). 기본: thread -> "io", process -> "cpu"
+#   cache_ttl:       (선택) 세션 캐시 만료 시간(초). pure가 아니어도 이 시간 동안 결과 재사용
+#   cache_file_args: (선택) 파일 경로 인수 이름. 파일의 mtime/크기가 바뀌면 캐시 무효화
+#   prompt_args:     (선택) LLM 프롬프트로 들어가는 인수 이름. 이전 단계 결과를 넣을 때 길이를 제한
+#   speculative:     (선택) 계획 스트리밍 중 선실행 허용. 부작용이 없고 pure/캐시 가능하며 느리지 않은(LATENCY_SLOW 아님)
+#                    도구에만 적용 (계획이 바뀌면 결과를 버리므로 싼 읽기만)
+
+LATENCY_FAST = "fast"      # 수 ms (로컬 파일, 간단한 계산)
+LATENCY_MEDIUM = "medium"  # 수백 ms (웹 검색)
+LATENCY_SLOW = "slow"      # 수 초 이상 (LLM 호출)
+
+EXECUTOR_LOOP = "loop"        # 이벤트 루프에서 직접 await (비동기 I/O)
+EXECUTOR_THREAD = "thread"    # 스레드 풀 (블로킹 I/O)
+EXECUTOR_PROCESS = "process"  # 프로세스 풀 (CPU 바운드, GIL 회피)
+_DEFAULT_POOL_FOR_EXECUTOR = {EXECUTOR_THREAD: "io", EXECUTOR_PROCESS: "cpu"}
+
+TOOL_REGISTRY: Dict[str, Dict[str, Any]] = {}
+
+class ToolFailure(str):
+    """
+    [Lite] 도구가 실패했음을 알리는 결과 문자열.
+    계획 실행은 일반 결과처럼 이어 가지만(다음 단계/응답에 오류 내용 전달), 캐시/메트릭/기록은 실패로 처리합니다.
+    (결과 내용에 '실패' 같은 단어가 있는지로 판단하지 않도록 도구가 직접 표시)
+    """
+
+def register_tool(name: Optional[str] = None, *,
+                  description: str,
+                  parameters: Dict[str, str],
+                  required: Optional[List[str]] = None,
+                  pure: bool = False,
+                  side_effects: bool = False,
+                  parallel_safe: bool = False,
+                  latency: str = LATENCY_FAST,
+                  executor: str = EXECUTOR_LOOP,
+                  pool: Optional[str] = None,
+                  cache_ttl: Optional[float] = None,
+                  cache_file_args: Optional[List[str]] = None,
+                  prompt_args: Optional[List[str]] = None,
+                  speculative: bool = False):
+    """ [Lite] 도구 함수를 레지스트리에 등록하는 데코레이터 """
+    def decorator(func: Callable) -> Callable:
+        tool_name = name or func.__name__
+        TOOL_REGISTRY[tool_name] = {
+            "func": func,
+            "description": description,
+            "parameters": parameters,
+            "required": list(required) if required is not None else list(parameters.keys()),
+            "pure": pure,
+            "side_effects": side_effects,
+            "parallel_safe": parallel_safe and not side_effects,
+            "latency": latency,
+            "executor": executor,
+            "pool": pool or _DEFAULT_POOL_FOR_EXECUTOR.get(executor),
+            "cache_ttl": cache_ttl,
+            "cache_file_args": list(cache_file_args or []),
+            "prompt_args": list(prompt_args or []),
+            "speculative": speculative and not side_effects and latency != LATENCY_SLOW
+                           and bool(pure or cache_ttl or cache_file_args),
+        }
+        return func
+    return decorator
+
+async def run_tool_async(tool_name: str, **kwargs) -> str:
+    """
+    [Lite] 레지스트리 메타데이터(executor)에 따라 도구를 실행합니다.
+    기록 모드면 인수/결과/시간을 기록하고, 재생 모드(replay_tools)면 도구를 실행하지 않고 기록된 결과를 돌려줍니다.
+    """
+    spec = TOOL_REGISTRY.get(tool_name)
+    if spec is None:
+        raise KeyError(f"'{tool_name}' 도구를 찾을 수 없음.")
+    func = spec["func"]
+    recorder, replayer = replay_module.get_recorder(), replay_module.get_replayer()
+    if replayer is not None and not replayer.replay_tools: replayer = None
+    key = replay_module.tool_key(tool_name, kwargs) if recorder or replayer else None
+    record_started = recorder.now() if recorder else 0.0
+    started = time.perf_counter()
+    status = "error"
+    result, error = None, None
+    try:
+        if replayer is not None:
+            text, failed = await replayer.tool_result(key)
+            result = ToolFailure(text) if failed else text
+        elif asyncio.iscoroutinefunction(func):
+            result = await func(**kwargs)
+        else:
+            result = await executor_pool_module.run_in_pool(spec["pool"], func, **kwargs)
+        status = "error" if isinstance(result, ToolFailure) else "ok"
+        return result
+    except Exception as e:
+        error = e
+        raise
+    finally:
+        metrics_module.TOOL_DURATION.observe(time.perf_counter() - started, tool=tool_name, status=status)
+        if recorder: recorder.record_tool(key, record_started, tool_name, kwargs, result, error,
+                                          failed=isinstance(result, ToolFailure))
+
+def describe_tools_for_prompt() -> str:
+    """ [Lite] 플래너 프롬프트용 도구 목록 (시그니처 + 실행 특성) """
+    lines = []
+    for name, spec in TOOL_REGISTRY.items():
+        params = ", ".join(f"{p}: {t}" for p, t in spec["parameters"].items())
+        traits = ["쓰기" if spec["side_effects"] else "읽기 전용"]
+        if spec["parallel_safe"]: traits.append("병렬 실행 가능")
+        if spec["latency"] == LATENCY_SLOW: traits.append("느림")
+        lines.append(f"- {name}({params}) [{', '.join(traits)}]: {spec['description']}")
+    return "\n".join(lines)
 
+@register_tool(
+    description="최신 정보나 특정 주제에 대해 웹을 검색합니다. (예: '최신 AI 기술 동향')",
+    parameters={"query": "str", "num_results": "int"},
+    required=["query"],
+    parallel_safe=True,
+    latency=LATENCY_MEDIUM,
+    executor=EXECUTOR_LOOP,
+    cache_ttl=600,
+    speculative=True,
+)
 async def perform_web_search(query: str, num_results: int = 3) -> str:
     """ [Lite] 웹 검색을 수행하고 '원본 스니펫'을 반환합니다. (LLM 요약 제거) """
     print(f"  🔎 [Exec-Lite] 웹 검색: '{query}'")
@@ -83,19 +189,21 @@ async def perform_web_search(query: str, num_results: int = 3) -> str:
         return combined_snippets
 
     except Exception as e:
-        return f"'{query}' 검색 중 오류 발생: {e}"
+        return ToolFailure(f"'{query}' 검색 중 오류 발생: {e}")
 
+@register_tool(
+    description="주어진 프롬프트를 바탕으로 긴 글(보고서, 이메일, 코드 등)을 작성합니다. (LLM 호출)",
+    parameters={"prompt": "str"},
+    parallel_safe=True,
+    latency=LATENCY_SLOW,
+    executor=EXECUTOR_LOOP,
+    prompt_args=["prompt"],
+)
 async def write_text(prompt: str) -> str:
-    """
-    [Lite] 이 함수는 Core에 의해 가로채어질 것입니다.
-    Core는 이 prompt를 lite_llm_module.get_llm_response_async로 전달합니다.
-    """
-    print(f"  ✍️ [Exec-Lite] 글 작성 요청 (Core가 처리해야 함): '{prompt[:50]}...'")
-    # 이 함수는 Core의 _execute_task에서 직접 호출되지 않고,
-    # Core가 'write_text' 도구 이름을 감지하고 LLM을 대신 호출합니다.
-    # 만약 이 함수가 직접 호출된다면(잘못된 설계), LLM 모듈을 임포트해야 합니다.
-    # 여기서는 Core가 중개한다고 가정하고, 프롬프트 자체를 반환합니다. (Core가 처리하도록)
-    return f"[TOOL_PASSTHROUGH] {prompt}"
+    """ [Lite] LLM을 호출하여 긴 글을 작성합니다. """
+    print(f"  ✍️ [Exec-Lite] 글 작성 요청: '{prompt[:50]}...'")
+    text = await lite_llm_module.get_llm_response_async(prompt, profile="text")
+    return ToolFailure(text) if isinstance(text, lite_llm_module.LLMFailure) else text
 
 def _get_safe_path(filepath: str) -> str:
     """ (HELPER) 경로를 검증하고 샌드박스 내부의 절대 경로를 반환합니다. """
@@ -111,48 +219,62 @@ def _get_safe_path(filepath: str) -> str:
         raise PermissionError(f"Security Error: '{real_target}'이(가) 샌드박스 '{real_base}' 외부에 있습니다.")
     return target_path
 
-async def read_file(**kwargs) -> str:
+@register_tool(
+    description="지정된 경로의 파일 내용을 읽습니다. (경로: './eidos_files/' 내부)",
+    parameters={"filepath": "str"},
+    parallel_safe=True,
+    latency=LATENCY_FAST,
+    executor=EXECUTOR_THREAD,
+    cache_file_args=["filepath"],
+    speculative=True,
+)
+def read_file(**kwargs) -> str:
     filepath = kwargs.get('filepath', kwargs.get('path'))
     if filepath is None:
-        return "파일 읽기 실패: 'filepath' 인수가 필요합니다."
+        return ToolFailure("파일 읽기 실패: 'filepath' 인수가 필요합니다.")
     
     print(f"  📄 [Exec-Lite] 파일 읽기: '{filepath}'")
     try:
         target_path = _get_safe_path(filepath)
-
-        def sync_read():
-            if not os.path.exists(target_path):
-                 raise FileNotFoundError(f"File not found: '{filepath}'")
-            with open(target_path, 'r', encoding='utf-8') as f:
-                content = f.read()
-            return content
-
-        content = await asyncio.to_thread(sync_read)
+        if not os.path.exists(target_path):
+             raise FileNotFoundError(f"File not found: '{filepath}'")
+        with open(target_path, 'r', encoding='utf-8') as f:
+            content = f.read()
         return f"파일 '{filepath}' 내용:\n{content}"
     except Exception as e:
-        return f"파일 '{filepath}' 읽기 실패: {e}"
+        return ToolFailure(f"파일 '{filepath}' 읽기 실패: {e}")
 
-async def write_file(**kwargs) -> str:
+@register_tool(
+    description="지정된 경로에 텍스트 내용을 저장합니다. (경로: './eidos_files/' 내부)",
+    parameters={"filepath": "str", "content": "str"},
+    side_effects=True,
+    latency=LATENCY_FAST,
+    executor=EXECUTOR_THREAD,
+)
+def write_file(**kwargs) -> str:
     filepath = kwargs.get('filepath', kwargs.get('path'))
     content = kwargs.get('content')
     if filepath is None or content is None:
-        return "파일 쓰기 실패: 'filepath'와 'content' 인수가 필요합니다."
+        return ToolFailure("파일 쓰기 실패: 'filepath'와 'content' 인수가 필요합니다.")
 
     print(f"  💾 [Exec-Lite] 파일 쓰기: '{filepath}'")
     try:
         target_path = _get_safe_path(filepath)
-
-        def sync_write():
-            os.makedirs(os.path.dirname(target_path), exist_ok=True)
-            with open(target_path, 'w', encoding='utf-8') as f:
-                f.write(content)
-
-        await asyncio.to_thread(sync_write)
+        # [Lite] AI 쓰기는 스냅샷 저장소에 기록 (되돌리기/다시 실행/diff 가능)
+        snapshot_store_module.write_text(target_path, content, SAFE_BASE_PATH, label=f"write_file: {filepath}")
         return f"파일 '{filepath}'에 내용 저장을 완료했습니다."
     except Exception as e:
-        return f"파일 '{filepath}' 쓰기 실패: {e}"
+        return ToolFailure(f"파일 '{filepath}' 쓰기 실패: {e}")
 
-async def write_project_files_async(**kwargs) -> str:
+@register_tool(
+    description="여러 파일을 프로젝트 구조로 일괄 저장합니다. (경로: './eidos_files/' 내부)",
+    parameters={"file_structure": "dict"},
+    side_effects=True,
+    latency=LATENCY_FAST,
+    executor=EXECUTOR_THREAD,
+)
+def write_project_files_async(**kwargs) -> str:
+    # (이름은 기존 계획/프롬프트 호환을 위해 유지. 레지스트리가 스레드 풀에서 실행합니다.)
     print(f"  💾 [Exec-Lite] 프로젝트 일괄 쓰기...")
     try:
         file_dict = kwargs.get('file_structure')
@@ -160,20 +282,14 @@ async def write_project_files_async(**kwargs) -> str:
             raise ValueError("'file_structure'가 딕셔너리가 아닙니다.")
 
         written_files = []
-
-        def sync_write_all():
-            for relative_path, content in file_dict.items():
-                if not isinstance(content, str): continue
-                
-                # [Lite] Pro Lock 제거, _get_safe_path 헬퍼 사용
-                target_path = _get_safe_path(relative_path)
-                
-                os.makedirs(os.path.dirname(target_path), exist_ok=True)
-                with open(target_path, 'w', encoding='utf-8') as f:
-                    f.write(content)
-                written_files.append(relative_path)
-
-        await asyncio.to_thread(sync_write_all)
+        for relative_path, content in file_dict.items():
+            if not isinstance(content, str): continue
+            
+            # [Lite] Pro Lock 제거, _get_safe_path 헬퍼 사용
+            target_path = _get_safe_path(relative_path)
+            
+            snapshot_store_module.write_text(target_path, content, SAFE_BASE_PATH, label="write_project_files_async")
+            written_files.append(relative_path)
         
         return json.dumps({
             "status": "success",
@@ -181,17 +297,50 @@ async def write_project_files_async(**kwargs) -> str:
             "files_written": written_files,
         })
     except Exception as e:
-        return f"프로젝트 쓰기 실패: {e}"
+        return ToolFailure(f"프로젝트 쓰기 실패: {e}")
 
-async def calculate_math(expression: str) -> str:
+@register_tool(
+    description="프로젝트 전체('./eidos_files/')에서 문자열을 검색해 일치하는 줄과 주변 줄을 '파일:줄' 형식으로 반환합니다. (여러 파일을 read_file로 읽기 전에 먼저 사용)",
+    parameters={"query": "str", "max_results": "int"},
+    required=["query"],
+    parallel_safe=True,
+    latency=LATENCY_FAST,
+    executor=EXECUTOR_THREAD,
+)
+def search_project(query: str, max_results: int = 20) -> str:
+    print(f"  🔍 [Exec-Lite] 프로젝트 검색: '{query}'")
+    try:
+        index = project_search_module.get_project_index(SAFE_BASE_PATH)
+        results = index.search(query, max_results=max(1, int(max_results)))
+        return project_search_module.format_search_results(query, results, max_results)
+    except Exception as e:
+        return ToolFailure(f"'{query}' 프로젝트 검색 실패: {e}")
+
+@register_tool(
+    description="정확한 수학 표현식(방정식, 미적분 등)을 계산합니다. (예: 'sqrt(16) * 2')",
+    parameters={"expression": "str"},
+    pure=True,
+    parallel_safe=True,
+    latency=LATENCY_MEDIUM,
+    executor=EXECUTOR_PROCESS,
+    speculative=True,
+)
+def calculate_math(expression: str) -> str:
     print(f"  🧮 [Exec-Lite] 수학 계산: '{expression}'")
-    def sync_calculate():
-        try:
-            result_obj = sympy.sympify(expression)
-            if hasattr(result_obj, 'doit'): result_obj = result_obj.doit()
-            if hasattr(result_obj, 'evalf'): result_obj = result_obj.evalf()
-            return f"계산 결과: {expression} = {str(result_obj)}"
-        except Exception as e:
-            return f"오류: '{expression}' 계산 중 오류 발생: {e}"
-
-    return await asyncio.to_thread(sync_calculate)
+    try:
+        result_obj = sympy.sympify(expression)
+        if hasattr(result_obj, 'doit'): result_obj = result_obj.doit()
+        if hasattr(result_obj, 'evalf'): result_obj = result_obj.evalf()
+        return f"계산 결과: {expression} = {str(result_obj)}"
+    except Exception as e:
+        return ToolFailure(f"오류: '{expression}' 계산 중 오류 발생: {e}")
+
+# [Lite] 플래너/검증기가 사용하는 도구 설명 (레지스트리에서 파생, 기존 형식 유지)
+AVAILABLE_TOOLS = {
+    name: {
+        "description": spec["description"],
+        "parameters": spec["parameters"],
+        "required": spec["required"],
+    }
+    for name, spec in TOOL_REGISTRY.items()
+}
@@ -0,0 +1,149 @@
+import asyncio
+import concurrent.futures
+import contextvars
+import functools
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+
+import config
+import metrics_module
+
+# [Lite] 이름 있는 실행 풀 기본값 (config.py의 EXECUTOR_POOLS로 덮어쓸 수 있음)
+#   io:  파일 읽기/쓰기, 첨부 수집, 프로젝트 검색 (블로킹 I/O)
+#   llm: Gemini SDK 호출 (수 초씩 걸리는 블로킹 네트워크 호출)
+#   cpu: SymPy 등 CPU 바운드 작업 (프로세스 풀, GIL 회피)
+DEFAULT_POOLS: Dict[str, Dict[str, Any]] = {
+    "io": {"kind": "thread", "max_workers": 8},
+    "llm": {"kind": "thread", "max_workers": 8},
+    "cpu": {"kind": "process", "max_workers": None},  # None: min(4, CPU 수)
+}
+
+POOL_IN_FLIGHT = metrics_module.REGISTRY.gauge("eidos_pool_in_flight", "실행 풀에 제출되어 끝나지 않은 작업 수", ["pool"])
+POOL_TASK_DURATION = metrics_module.REGISTRY.histogram("eidos_pool_task_seconds", "실행 풀 작업의 제출~완료 시간 (대기 포함)", ["pool"])
+
+
+class ExecutorPool:
+    """
+    [Lite] 크기가 정해진 이름 있는 executor (thread/process).
+    작업 종류별로 풀을 나눠, 느린 LLM 호출이 쌓여도 파일 I/O가 밀리지 않게 합니다.
+    제출/완료 시점에 진행 중 작업 수를 세어 사용률(바쁜 작업자 수의 시간 평균 / 최대 작업자 수)을 계산합니다.
+    """
+    def __init__(self, name: str, kind: str = "thread", max_workers: Optional[int] = None):
+        if kind not in ("thread", "process"):
+            raise ValueError(f"'{name}' 풀: 알 수 없는 종류 '{kind}' (thread/process)")
+        self.name = name
+        self.kind = kind
+        self.max_workers = max(1, max_workers or min(4, os.cpu_count() or 1))
+        self._executor: Optional[concurrent.futures.Executor] = None
+        self._lock = threading.Lock()
+        self._created = time.monotonic()
+        self._in_flight = 0
+        self._busy_integral = 0.0   # 바쁜 작업자 수 x 시간 (초)
+        self._last_change = self._created
+        self.submitted = 0
+        self.completed = 0
+        self.failed = 0
+        self.peak_in_flight = 0
+
+    def _get_executor(self) -> concurrent.futures.Executor:
+        # 프로세스 풀은 처음 쓸 때 만듦 (GUI 시작 시 자식 프로세스 생성 비용 회피)
+        with self._lock:
+            if self._executor is None:
+                if self.kind == "process":
+                    self._executor = concurrent.futures.ProcessPoolExecutor(max_workers=self.max_workers)
+                else:
+                    self._executor = concurrent.futures.ThreadPoolExecutor(
+                        max_workers=self.max_workers, thread_name_prefix=f"eidos-{self.name}")
+            return self._executor
+
+    def _change_in_flight(self, delta: int):
+        with self._lock:
+            now = time.monotonic()
+            self._busy_integral += min(self._in_flight, self.max_workers) * (now - self._last_change)
+            self._last_change = now
+            self._in_flight += delta
+            self.peak_in_flight = max(self.peak_in_flight, self._in_flight)
+        POOL_IN_FLIGHT.inc(delta, pool=self.name)
+
+    def run(self, func: Callable, *args, **kwargs) -> asyncio.Future:
+        """
+        [Lite] func를 이 풀에서 실행하는 future를 반환합니다. (await하지 않아도 실행됨)
+        스레드 풀은 asyncio.to_thread처럼 현재 contextvars를 복사해 실행합니다. (스냅샷 변경 묶음 등 전달)
+        """
+        loop = asyncio.get_running_loop()
+        if self.kind == "process":
+            call = functools.partial(func, *args, **kwargs)
+        else:
+            call = functools.partial(contextvars.copy_context().run, func, *args, **kwargs)
+        self.submitted += 1
+        self._change_in_flight(1)
+        started = time.perf_counter()
+        future = loop.run_in_executor(self._get_executor(), call)
+
+        def _done(f: asyncio.Future):
+            self._change_in_flight(-1)
+            if f.cancelled() or f.exception() is not None: self.failed += 1
+            else: self.completed += 1
+            POOL_TASK_DURATION.observe(time.perf_counter() - started, pool=self.name)
+
+        future.add_done_callback(_done)
+        return future
+
+    def stats(self) -> Dict[str, Any]:
+        """ [Lite] {"kind", "max_workers", "active", "queued", "submitted", "completed", "failed", "peak", "utilization"} """
+        with self._lock:
+            now = time.monotonic()
+            busy = self._busy_integral + min(self._in_flight, self.max_workers) * (now - self._last_change)
+            elapsed = now - self._created
+            in_flight = self._in_flight
+        active = min(in_flight, self.max_workers)
+        return {"kind": self.kind, "max_workers": self.max_workers,
+                "active": active, "queued": in_flight - active,
+                "submitted": self.submitted, "completed": self.completed, "failed": self.failed,
+                "peak": self.peak_in_flight,
+                "utilization": busy / (elapsed * self.max_workers) if elapsed > 0 else 0.0}
+
+    def shutdown(self, wait: bool = True):
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None: executor.shutdown(wait=wait)
+
+
+def _load_pools() -> Dict[str, ExecutorPool]:
+    configured = getattr(config, "EXECUTOR_POOLS", {}) or {}
+    pools = {}
+    for name in dict.fromkeys(list(DEFAULT_POOLS) + list(configured)):
+        options = dict(DEFAULT_POOLS.get(name, {"kind": "thread", "max_workers": None}), **configured.get(name, {}))
+        pools[name] = ExecutorPool(name, options["kind"], options["max_workers"])
+    return pools
+
+
+_POOLS: Dict[str, ExecutorPool] = _load_pools()
+
+
+def get_pool(name: str) -> ExecutorPool:
+    pool = _POOLS.get(name)
+    if pool is None:
+        raise KeyError(f"'{name}' 실행 풀이 없습니다. (config.EXECUTOR_POOLS 확인)")
+    return pool
+
+
+def run_in_pool(name: str, func: Callable, *args, **kwargs) -> asyncio.Future:
+    """ [Lite] get_pool(name).run(...)의 단축형 """
+    return get_pool(name).run(func, *args, **kwargs)
+
+
+def all_pools() -> Dict[str, ExecutorPool]:
+    return dict(_POOLS)
+
+
+def pool_stats() -> Dict[str, Dict[str, Any]]:
+    """ [Lite] 풀 이름별 사용량 (통계 패널/루프 모니터용) """
+    return {name: pool.stats() for name, pool in _POOLS.items()}
+
+
+def shutdown_pools(wait: bool = True):
+    """ [Lite] 종료 시 호출. 다음에 run()하면 executor를 다시 만듭니다. """
+    for pool in _POOLS.values(): pool.shutdown(wait=wait)
@@ -0,0 +1,166 @@
+import mmap
+import os
+import threading
+from typing import Callable, Iterator, List, Optional, Tuple
+
+from autosave_module import atomic_write_chunks
+
+# [Lite] 대용량 파일 모드 설정
+LARGE_FILE_THRESHOLD = 2 * 1024 * 1024   # 이 크기(바이트)를 넘으면 대용량 모드로 엽니다.
+PAGE_BYTES = 256 * 1024                  # 한 페이지(에디터에 올리는 분량)의 대략적인 크기
+_COUNT_CHUNK = 4 * 1024 * 1024           # 줄 수 계산 / 페이지 저장 시 한 번에 읽는 크기
+SEARCH_BATCH_SIZE = 50                   # 검색 결과를 이 개수 단위로 전달
+MAX_SEARCH_RESULTS = 5000
+MAX_RESULT_LINE_CHARS = 200
+
+
+def is_large_file(path: str) -> bool:
+    try:
+        return os.path.getsize(path) > LARGE_FILE_THRESHOLD
+    except OSError:
+        return False
+
+
+class LargeFileDocument:
+    """
+    [Lite] 메모리 매핑(mmap) 기반 대용량 파일.
+    파일을 줄 경계에 맞춘 바이트 페이지로 나누고, 요청된 페이지만 디코딩합니다.
+    페이지 시작 줄 번호는 필요할 때 앞에서부터 누적 계산하여 캐시합니다.
+    편집은 페이지 단위로 반영합니다. (replace_page: 나머지 바이트는 디코딩하지 않고 그대로 복사)
+    """
+    def __init__(self, path: str, page_bytes: int = PAGE_BYTES):
+        self.path = path
+        self.page_bytes = page_bytes
+        self._page_starts: List[int] = [0]      # 페이지별 시작 바이트 (줄 경계)
+        self._page_lines: List[int] = [0]       # 페이지별 시작 줄 번호 (0-based)
+        self._open()
+
+    def _open(self):
+        self._file = open(self.path, "rb")
+        self.size = os.fstat(self._file.fileno()).st_size
+        # 길이 0인 파일은 mmap할 수 없음
+        self._mm: Optional[mmap.mmap] = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if self.size else None
+        self.page_count = max(1, -(-self.size // self.page_bytes))
+
+    def close(self):
+        if self._mm is not None:
+            self._mm.close()
+            self._mm = None
+        self._file.close()
+
+    def _count_newlines(self, start: int, end: int) -> int:
+        count = 0
+        for pos in range(start, end, _COUNT_CHUNK):
+            count += self._mm[pos:min(end, pos + _COUNT_CHUNK)].count(b"\n")
+        return count
+
+    def _page_start(self, k: int) -> int:
+        """ 페이지 k의 시작 바이트 (k*page_bytes 이후 첫 줄 시작) """
+        if k <= 0 or self._mm is None:
+            return 0
+        if k >= self.page_count:
+            return self.size
+        newline = self._mm.find(b"\n", k * self.page_bytes)
+        return self.size if newline == -1 else newline + 1
+
+    def _ensure_page_index(self, k: int):
+        while len(self._page_starts) <= k:
+            prev = len(self._page_starts) - 1
+            start = self._page_start(prev + 1)
+            self._page_lines.append(self._page_lines[prev] + self._count_newlines(self._page_starts[prev], start))
+            self._page_starts.append(start)
+
+    def read_page(self, k: int) -> Tuple[int, str]:
+        """ [Lite] 페이지 k를 읽습니다. 반환: (첫 줄 번호(0-based), 텍스트) """
+        if self._mm is None:
+            return 0, ""
+        k = max(0, min(k, self.page_count - 1))
+        self._ensure_page_index(k + 1)
+        start, end = self._page_starts[k], self._page_starts[k + 1]
+        return self._page_lines[k], self._mm[start:end].decode("utf-8", "replace")
+
+    def _copy_range(self, start: int, end: int) -> Iterator[bytes]:
+        for pos in range(start, end, _COUNT_CHUNK):
+            yield self._mm[pos:min(end, pos + _COUNT_CHUNK)]
+
+    def replace_page(self, k: int, text: str, history_limit: int = 0):
+        """
+        [Lite] 페이지 k의 내용을 text로 바꿔 파일에 원자적으로 저장하고 다시 엽니다.
+        (페이지 앞뒤 바이트는 mmap에서 조각 단위로 복사, 페이지 k 이전의 색인은 그대로 유지)
+        페이지 안의 잘못된 UTF-8 바이트는 읽을 때 대체 문자로 바뀌었으므로, 편집한 페이지에서는 대체 문자로 저장됩니다.
+        """
+        k = max(0, min(k, self.page_count - 1))
+        if self._mm is None:
+            start = end = 0
+        else:
+            self._ensure_page_index(k + 1)
+            start, end = self._page_starts[k], self._page_starts[k + 1]
+
+        def chunks() -> Iterator[bytes]:
+            if self._mm is not None: yield from self._copy_range(0, start)
+            yield text.encode("utf-8")
+            if self._mm is not None: yield from self._copy_range(end, self.size)
+
+        try:
+            atomic_write_chunks(self.path, chunks(), history_limit=history_limit, before_replace=self.close)
+        except BaseException:
+            if self._file.closed: self._open() # 교체 직전에 닫은 뒤 실패: 원본은 그대로이므로 다시 엶
+            raise
+        del self._page_starts[k + 1:], self._page_lines[k + 1:]
+        self._open()
+
+    def page_for_offset(self, offset: int) -> int:
+        """ 바이트 오프셋이 속한 페이지 번호 """
+        for k in range(self.page_count):
+            self._ensure_page_index(k + 1)
+            if offset < self._page_starts[k + 1]:
+                return k
+        return self.page_count - 1
+
+    def total_lines(self) -> int:
+        """ 전체 줄 수 (마지막 페이지까지 인덱싱) """
+        if self._mm is None:
+            return 1
+        self._ensure_page_index(self.page_count)
+        last_line_open = not self._mm[self.size - 1:self.size] == b"\n"
+        return self._page_lines[self.page_count] + (1 if last_line_open else 0)
+
+    def search(self, term: str, cancel_event: threading.Event,
+               on_batch: Callable[[List[Tuple[int, int, str]]], None],
+               start_offset: int = 0) -> int:
+        """
+        [Lite] 파일 전체에서 term을 찾아 (바이트 오프셋, 줄 번호(0-based), 줄 내용) 결과를
+        SEARCH_BATCH_SIZE개씩 on_batch로 전달합니다. (백그라운드 스레드에서 호출)
+        반환: 찾은 결과 수
+        """
+        if self._mm is None or not term:
+            return 0
+        needle = term.encode("utf-8")
+        mm = self._mm
+        batch: List[Tuple[int, int, str]] = []
+        found = 0
+        line_no = self._count_newlines(0, start_offset)
+        last_pos = start_offset
+        pos = mm.find(needle, start_offset)
+        while pos != -1 and not cancel_event.is_set() and found < MAX_SEARCH_RESULTS:
+            line_no += self._count_newlines(last_pos, pos)
+            line_start = mm.rfind(b"\n", 0, pos) + 1
+            line_end = mm.find(b"\n", pos)
+            if line_end == -1: line_end = self.size
+            line_text = mm[line_start:min(line_end, line_start + MAX_RESULT_LINE_CHARS)].decode("utf-8", "replace")
+            batch.append((pos, line_no, line_text))
+            found += 1
+            if len(batch) >= SEARCH_BATCH_SIZE:
+                on_batch(batch)
+                batch = []
+            # 같은 줄의 추가 일치는 건너뛰고 다음 줄부터 검색 (결과는 줄 단위)
+            last_pos = pos
+            pos = mm.find(needle, line_end)
+        if batch and not cancel_event.is_set():
+            on_batch(batch)
+        return found
+
+    def line_in_page(self, k: int, offset: int) -> int:
+        """ 페이지 k 안에서 오프셋이 위치한 줄 (0-based, 페이지 기준) """
+        self._ensure_page_index(k + 1)
+        return self._count_newlines(self._page_starts[k], offset)
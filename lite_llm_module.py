@@ -1,99 +1,379 @@
 import google.generativeai as genai
 import asyncio
+import functools
+import hashlib
 import json
+import threading
+import time
+from collections import OrderedDict
+import config
 from config import GEMINI_API_KEY
-from typing import Optional, Dict, List
+import metrics_module
+from executor_pool_module import run_in_pool
+import replay_module
+from typing import Any, AsyncIterator, Optional, Dict, List, Tuple, Union
+
+MODEL_NAME = 'gemini-1.5-pro'
+FAST_MODEL_NAME = 'gemini-1.5-flash'   # 짧은 응답(추천, 대화)용 작고 빠른 모델
+JSON_MAX_OUTPUT_TOKENS = 32768         # JSON 모드에서 프로필에 max_output_tokens가 없을 때의 상한
+# [Lite] 프롬프트 접두부(규칙 + 도구 목록)를 시스템 지시로 가진 모델 핸들 수 상한
+PROMPT_PREFIX_MODELS_MAX = 8
 
 try:
     genai.configure(api_key=GEMINI_API_KEY)
-    model = genai.GenerativeModel('gemini-1.5-pro')
+    model = genai.GenerativeModel(MODEL_NAME)
 except Exception as e:
     print(f"❌ Gemini API 설정 중 오류 발생: {e}")
     model = None
 
-async def get_llm_response_async(prompt: str, response_mime_type: Optional[str] = None) -> str:
-    """ [Lite] Gemini API를 호출하는 기본 래퍼 함수 """
+# [Lite] 호출 위치별 생성 설정 (config.py의 GENERATION_PROFILES로 키 단위 덮어쓰기 가능)
+#   model: 사용할 모델 / max_output_tokens, temperature, stop_sequences: None이면 모델 기본값
+#   계획과 코드 생성만 큰 모델을 쓰고, 짧게 끝나야 하는 호출은 빠른 모델 + 작은 출력 상한을 사용
+DEFAULT_GENERATION_PROFILES: Dict[str, Dict] = {
+    "default":    {"model": MODEL_NAME, "max_output_tokens": None, "temperature": None, "stop_sequences": None},
+    "plan":       {"model": MODEL_NAME, "max_output_tokens": 32768, "temperature": 0.2},
+    "code":       {"model": MODEL_NAME, "max_output_tokens": 32768, "temperature": 0.2},
+    "text":       {"model": MODEL_NAME, "max_output_tokens": 8192},
+    "chat":       {"model": FAST_MODEL_NAME, "max_output_tokens": 1024, "temperature": 0.7},
+    "suggestion": {"model": FAST_MODEL_NAME, "max_output_tokens": 64, "temperature": 0.3, "stop_sequences": ["\n\n"]},
+}
+
+def _load_generation_profiles() -> Dict[str, Dict]:
+    configured = getattr(config, "GENERATION_PROFILES", {}) or {}
+    base = DEFAULT_GENERATION_PROFILES["default"]
+    return {name: dict(base, **DEFAULT_GENERATION_PROFILES.get(name, {}), **configured.get(name, {}))
+            for name in dict.fromkeys(list(DEFAULT_GENERATION_PROFILES) + list(configured))}
+
+GENERATION_PROFILES: Dict[str, Dict] = _load_generation_profiles()
+
+def get_generation_profile(name: str) -> Dict:
+    profile = GENERATION_PROFILES.get(name)
+    if profile is None:
+        raise KeyError(f"'{name}' 생성 프로필이 없습니다. (config.GENERATION_PROFILES 확인)")
+    return profile
+
+_models: Dict[str, object] = {}
+_models_lock = threading.Lock()
+
+def _model_for(model_name: str):
+    """ (Helper) 모델 이름별 핸들. 기본 모델은 전역 model을 그대로 사용 """
+    if model_name == MODEL_NAME:
+        return model
+    with _models_lock:
+        handle = _models.get(model_name)
+        if handle is None:
+            handle = _models[model_name] = genai.GenerativeModel(model_name)
+        return handle
+
+# [Lite] 코드 추천 프롬프트에 들어가는 범위 (추천 캐시 키도 이 범위로 계산)
+# (파이썬 파일은 파일 앞부분 대신 커서 위치 심볼 + 의존성을 이 길이 안에서 보냄)
+SUGGESTION_CODE_CHARS = 2000
+SUGGESTION_HISTORY_TURNS = 10
+
+
+class LLMFailure(str):
+    """
+    [Lite] get_llm_response_async가 돌려주는 오류 응답 문자열 (API 예외, 차단, 설정 오류).
+    기존 호출부는 문자열로 그대로 쓰고, 성공 여부가 필요한 곳(Core, 배치 실행기)은 타입으로 구분합니다.
+    """
+
+
+class LLMRateLimiter:
+    """
+    [Lite] LLM 호출 속도 제한 (토큰 버킷). 분당 calls_per_minute회, 최대 burst회까지 연속 허용.
+    set_rate_limiter()로 설치하면 모든 get_llm_response_async 호출이 공유합니다. (배치 실행기 등)
+    """
+    def __init__(self, calls_per_minute: float, burst: int = 1):
+        self.interval = 60.0 / calls_per_minute
+        self.burst = max(1, burst)
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+        self.waited_seconds = 0.0
+
+    async def acquire(self):
+        async with self._lock:  # 대기 순서대로 토큰을 받음
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self.burst, self._tokens + (now - self._updated) / self.interval)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                delay = (1 - self._tokens) * self.interval
+                self.waited_seconds += delay
+                await asyncio.sleep(delay)
+
+
+_rate_limiter: Optional[LLMRateLimiter] = None
+
+def set_rate_limiter(limiter: Optional[LLMRateLimiter]):
+    """ [Lite] 공유 LLM 속도 제한기를 설치합니다. (None이면 해제) """
+    global _rate_limiter
+    _rate_limiter = limiter
+
+def _record_usage(prompt_chars: int, response, text: str, profile: str):
+    """ (Helper) 토큰 사용량 지표 (응답의 usage_metadata 우선, 없으면 글자 수/4 추정) """
+    usage = getattr(response, "usage_metadata", None)
+    input_tokens = getattr(usage, "prompt_token_count", None) or prompt_chars // 4
+    output_tokens = getattr(usage, "candidates_token_count", None) or len(text) // 4
+    metrics_module.LLM_TOKENS.inc(input_tokens, direction="input", profile=profile)
+    metrics_module.LLM_TOKENS.inc(output_tokens, direction="output", profile=profile)
+
+
+class PromptPrefixCache:
+    """
+    [Lite] (모델, 고정 프롬프트 접두부)별 모델 핸들. 접두부는 모델의 시스템 지시로 한 번만 설정합니다.
+    접두부 문자열을 매 호출 다시 만들고 이어 붙이지 않을 뿐, 시스템 지시도 API 요청마다 전송되어 입력 토큰으로 과금됩니다.
+    (제공자 컨텍스트 캐시는 최소 크기(수만 토큰)가 있어 현재 약 1.3k자인 플래너 접두부에는 쓸 수 없음)
+    """
+    def __init__(self):
+        self._models: "OrderedDict[str, Any]" = OrderedDict()  # 모델 이름 + 접두부 해시 -> 모델 핸들
+        self._lock = threading.Lock()
+
+    def model_for(self, prefix: str, model_name: str = MODEL_NAME):
+        key = model_name + ":" + hashlib.sha1(prefix.encode("utf-8")).hexdigest()
+        with self._lock:
+            target_model = self._models.get(key)
+            if target_model is None:
+                target_model = self._models[key] = genai.GenerativeModel(model_name, system_instruction=prefix)
+                while len(self._models) > PROMPT_PREFIX_MODELS_MAX:
+                    self._models.popitem(last=False)
+            return target_model
+
+
+_prefix_cache = PromptPrefixCache()
+
+def _generation_config(response_mime_type: Optional[str], response_schema: Optional[Dict], profile: Dict):
+    """ (Helper) 프로필의 출력 상한/온도/중단 시퀀스 + JSON 모드 설정 (설정할 것이 없으면 None) """
+    options = {key: profile[key] for key in ("max_output_tokens", "temperature", "stop_sequences")
+               if profile.get(key) is not None}
+    if response_mime_type == "application/json":
+        options.setdefault("max_output_tokens", JSON_MAX_OUTPUT_TOKENS)
+        options.update(response_mime_type="application/json", response_schema=response_schema)
+    return genai.GenerationConfig(**options) if options else None
+
+def _target_model(profile: Dict, static_prefix: Optional[str]):
+    """ (Helper) 프로필의 모델 (고정 접두부가 있으면 접두부를 가진 모델) """
+    if static_prefix:
+        return _prefix_cache.model_for(static_prefix, profile["model"])
+    return _model_for(profile["model"])
+
+async def get_llm_response_async(prompt: str, 
+                                 response_mime_type: Optional[str] = None,
+                                 response_schema: Optional[Dict] = None,
+                                 static_prefix: Optional[str] = None,
+                                 profile: str = "default") -> str:
+    """
+    [Lite] Gemini API를 호출하는 기본 래퍼 함수.
+    static_prefix가 주어지면 매 호출 같은 접두부는 PromptPrefixCache의 모델(시스템 지시)로 보내고
+    prompt에는 동적 부분만 담습니다.
+    profile은 호출 위치별 생성 설정(GENERATION_PROFILES)의 이름으로, 모델과 출력 상한/온도/중단 시퀀스를 정합니다.
+    기록 모드면 요청/응답/시간을 기록하고, 재생 모드면 API 대신 기록된 응답을 돌려줍니다. (replay_module)
+    """
+    recorder, replayer = replay_module.get_recorder(), replay_module.get_replayer()
+    if recorder is None and replayer is None:
+        return await _call_llm_async(prompt, response_mime_type, response_schema, static_prefix, profile)
+    key = replay_module.llm_key(prompt, static_prefix, response_mime_type, response_schema, get_generation_profile(profile))
+    if replayer is not None:
+        text, failed = await replayer.llm_response(key)
+        return LLMFailure(text) if failed else text
+    started = recorder.now()
+    text = await _call_llm_async(prompt, response_mime_type, response_schema, static_prefix, profile)
+    recorder.record_llm(key, started, prompt, static_prefix, text, failed=isinstance(text, LLMFailure))
+    return text
+
+async def _call_llm_async(prompt: str,
+                          response_mime_type: Optional[str],
+                          response_schema: Optional[Dict],
+                          static_prefix: Optional[str],
+                          profile_name: str) -> str:
     if not model:
-        return "[LLM 설정 오류: API 키 또는 모델 초기화 실패]"
+        return LLMFailure("[LLM 설정 오류: API 키 또는 모델 초기화 실패]")
     
+    profile = get_generation_profile(profile_name)
+    if _rate_limiter is not None:
+        await _rate_limiter.acquire()
+    started = time.perf_counter()
+    labels = {"profile": profile_name, "model": profile["model"]}
     try:
-        generation_config = None
-        if response_mime_type == "application/json":
-            generation_config = genai.GenerationConfig(
-                response_mime_type="application/json",
-                max_output_tokens=32768
-            )
-        
-        response = await asyncio.to_thread(
-            model.generate_content, 
+        generation_config = _generation_config(response_mime_type, response_schema, profile)
+        target_model = _target_model(profile, static_prefix)
+        response = await run_in_pool(
+            "llm",
+            target_model.generate_content, 
             prompt, 
             generation_config=generation_config
         )
 
+        metrics_module.LLM_LATENCY.observe(time.perf_counter() - started, status="ok", **labels)
         if hasattr(response, 'text'):
+            if metrics_module.REGISTRY.enabled:
+                _record_usage(len(prompt) + len(static_prefix or ""), response, response.text, profile_name)
             return response.text
         else:
              if response.prompt_feedback.block_reason:
                  reason = response.prompt_feedback.block_reason
-                 return f"[LLM 응답 차단됨: {reason}]"
-             return "[LLM 응답 오류: 알 수 없는 형식]"
+                 return LLMFailure(f"[LLM 응답 차단됨: {reason}]")
+             return LLMFailure("[LLM 응답 오류: 알 수 없는 형식]")
 
     except Exception as e:
+        metrics_module.LLM_LATENCY.observe(time.perf_counter() - started, status="error", **labels)
         print(f"❌ [LLM Async] API 호출 중 예외 발생: {e}")
-        return f"LLM API 호출 실패: {type(e).__name__} - {e}"
+        return LLMFailure(f"LLM API 호출 실패: {type(e).__name__} - {e}")
 
-async def generate_tool_use_plan_async(
-    user_input: str, 
-    chat_history: List[str], 
-    available_tools_str: str
-) -> str:
+async def stream_llm_response_async(prompt: str,
+                                    response_mime_type: Optional[str] = None,
+                                    response_schema: Optional[Dict] = None,
+                                    static_prefix: Optional[str] = None,
+                                    profile: str = "default") -> AsyncIterator[str]:
     """
-    [EIDOS-Lite의 두뇌] 사용자 입력과 도구 목록을 받아 '도구 사용 계획(JSON)'을 생성합니다.
+    [Lite] get_llm_response_async의 스트리밍 버전. 응답 텍스트 조각을 도착하는 대로 내보냅니다.
+    (SDK의 동기 스트림은 별도 스레드에서 읽음) API 오류는 예외로 전달됩니다.
+    기록/재생 모드에서는 조각별 도착 시각까지 기록/재생합니다.
     """
-    history_str = "\n".join(chat_history[-10:])
+    recorder, replayer = replay_module.get_recorder(), replay_module.get_replayer()
+    key = replay_module.llm_key(prompt, static_prefix, response_mime_type, response_schema,
+                                get_generation_profile(profile)) if recorder or replayer else None
+    if replayer is not None:
+        async for chunk in replayer.llm_stream(key):
+            yield chunk
+        return
+    record_started = recorder.now() if recorder else 0.0
+    recorded_chunks: List[Tuple[float, str]] = []
+    if not model:
+        raise RuntimeError("LLM 설정 오류: API 키 또는 모델 초기화 실패")
+    profile_name, profile = profile, get_generation_profile(profile)
+    if _rate_limiter is not None:
+        await _rate_limiter.acquire()
+    started = time.perf_counter()
+    labels = {"profile": profile_name, "model": profile["model"]}
+    loop = asyncio.get_running_loop()
+    queue: asyncio.Queue = asyncio.Queue()
+    finished = object()
+    target_model = _target_model(profile, static_prefix)
+    generation_config = _generation_config(response_mime_type, response_schema, profile)
 
-    prompt = f"""
-    당신은 사용자 요청을 '도구 사용 계획'으로 변환하는 AI 플래너입니다.
-    사용자 요청이 단순 대화('안녕', '고마워')라면 "CHAT"라고만 응답하세요.
-    그렇지 않다면, 사용 가능한 도구를 활용하여 JSON 계획을 생성하세요.
+    def produce():
+        try:
+            for chunk in target_model.generate_content(prompt, generation_config=generation_config, stream=True):
+                text = chunk.text
+                if text: loop.call_soon_threadsafe(queue.put_nowait, text)
+            loop.call_soon_threadsafe(queue.put_nowait, finished)
+        except Exception as e:
+            loop.call_soon_threadsafe(queue.put_nowait, e)
 
-    [사용 가능한 도구]
-    {available_tools_str}
+    run_in_pool("llm", produce)  # 소비자가 중간에 멈춰도 스트림은 스레드에서 끝까지 읽힘
+    received = []
+    while True:
+        item = await queue.get()
+        if item is finished: break
+        if isinstance(item, Exception):
+            metrics_module.LLM_LATENCY.observe(time.perf_counter() - started, status="error", **labels)
+            if recorder: recorder.record_llm_stream(key, record_started, prompt, static_prefix, recorded_chunks, error=item)
+            raise item
+        received.append(item)
+        if recorder: recorded_chunks.append((recorder.now() - record_started, item))
+        yield item
+    if recorder: recorder.record_llm_stream(key, record_started, prompt, static_prefix, recorded_chunks)
+    metrics_module.LLM_LATENCY.observe(time.perf_counter() - started, status="ok", **labels)
+    if metrics_module.REGISTRY.enabled:
+        _record_usage(len(prompt) + len(static_prefix or ""), None, "".join(received), profile_name)
 
-    [최근 대화]
-    {history_str}
+# [Lite] 플래너 프롬프트: 고정 접두부(역할 + 규칙 + 도구 목록)와 호출마다 바뀌는 본문을 분리해 미리 만들어 둠
+_PLANNER_INTRO = """당신은 사용자 요청을 '도구 사용 계획'으로 변환하는 AI 플래너입니다.
+사용자 요청이 단순 대화('안녕', '고마워')라면 {"mode": "CHAT"}로만 응답하세요.
+그렇지 않다면, 사용 가능한 도구를 활용하여 JSON 계획을 생성하세요.
 
-    [사용자 요청]
-    "{user_input}"
+[사용 가능한 도구]
+"""
+_PLANNER_RULES = """
+[규칙]
+1.  사용자 요청이 단순 대화(인사, 감정표현)면, {"mode": "CHAT"}로만 응답합니다.
+2.  파일 경로는 항상 './eidos_files/'로 시작해야 합니다.
+3.  `write_project_files_async`의 코드 내용은 `\\n`과 `\\"`로 이스케이프해야 합니다.
+4.  계획은 {"mode": "PLAN", "plan": [{"tool": "...", "args": {...}}]} 형식이어야 합니다.
+5.  `file_structure`는 [{"path": "...", "content": "..."}] 리스트로 작성합니다.
+6.  이전 단계 결과는 `$PREV_STEP_RESULT`(직전 단계) 또는 `$STEP2_RESULT`(2번째 단계)처럼 참조합니다. (결과 내용을 직접 옮겨 적지 않음)
+"""
+_PLANNER_DYNAMIC_TEMPLATE = """[최근 대화]
+{history_str}
+
+[사용자 요청]
+"{user_input}"
+{replan_section}
+[JSON 응답]
+"""
+_PLANNER_REPLAN_TEMPLATE = """
+[이전 계획 검증 오류 (반드시 수정)]
+{previous_errors}
+"""
+
+@functools.lru_cache(maxsize=8)
+def build_planner_prefix(available_tools_str: str) -> str:
+    """ [Lite] 플래너 고정 접두부 (도구 목록이 같으면 같은 문자열 객체를 재사용) """
+    return _PLANNER_INTRO + available_tools_str + "\n" + _PLANNER_RULES
 
-    [규칙]
-    1.  사용자 요청이 단순 대화(인사, 감정표현)면, 다른 텍스트 없이 "CHAT"라고만 응답합니다.
-    2.  파일 경로는 항상 './eidos_files/'로 시작해야 합니다.
-    3.  `write_project_files_async`의 코드 내용은 `\\n`과 `\\"`로 이스케이프해야 합니다.
-    4.  'Plan'은 JSON 리스트 형식이어야 합니다.
+def build_planner_prompt(user_input: str, chat_history: List[str], previous_errors: Optional[str] = None) -> str:
+    """ [Lite] 플래너 동적 본문 (최근 대화 + 사용자 요청 + 재계획 오류) """
+    return _PLANNER_DYNAMIC_TEMPLATE.format(
+        history_str="\n".join(chat_history[-10:]),
+        user_input=user_input,
+        replan_section=_PLANNER_REPLAN_TEMPLATE.format(previous_errors=previous_errors) if previous_errors else "",
+    )
 
-    [JSON 계획 (또는 "CHAT")]
+async def generate_tool_use_plan_async(
+    user_input: str, 
+    chat_history: List[str], 
+    available_tools_str: str,
+    response_schema: Optional[Dict] = None,
+    previous_errors: Optional[str] = None
+) -> str:
     """
-    return await get_llm_response_async(prompt, response_mime_type="application/json")
+    [EIDOS-Lite의 두뇌] 사용자 입력과 도구 목록을 받아 '도구 사용 계획(JSON)'을 생성합니다.
+    response_schema가 주어지면 응답이 스키마로 제약되며,
+    previous_errors는 로컬 검증에 실패한 이전 계획의 오류 요약입니다. (재계획 시에만 사용)
+    규칙/도구 목록은 고정 접두부로 재사용되고, 호출마다 보내는 본문은 대화/요청 부분뿐입니다.
+    """
+    return await get_llm_response_async(
+        build_planner_prompt(user_input, chat_history, previous_errors),
+        response_mime_type="application/json", response_schema=response_schema,
+        static_prefix=build_planner_prefix(available_tools_str), profile="plan"
+    )
+
+def stream_tool_use_plan_async(
+    user_input: str,
+    chat_history: List[str],
+    available_tools_str: str,
+    response_schema: Optional[Dict] = None,
+    previous_errors: Optional[str] = None
+) -> AsyncIterator[str]:
+    """ [Lite] generate_tool_use_plan_async와 같은 프롬프트로 계획 JSON을 스트리밍합니다. (단계별 선실행용) """
+    return stream_llm_response_async(
+        build_planner_prompt(user_input, chat_history, previous_errors),
+        response_mime_type="application/json", response_schema=response_schema,
+        static_prefix=build_planner_prefix(available_tools_str), profile="plan"
+    )
 
 async def generate_modification_suggestion_async(current_code: str, chat_history: List[str]) -> str:
-    """ (Lite) 코드 편집기용 AI 추천 생성기 (기존과 동일) """
-    if not model: return "LLM 오류"
-    history_str = "\n".join(chat_history[-10:])
+    """ (Lite) 코드 편집기용 AI 추천 생성기. current_code는 파일 앞부분 또는 심볼 색인이 고른 컨텍스트 """
+    if not model: return LLMFailure("LLM 오류")
+    history_str = "\n".join(chat_history[-SUGGESTION_HISTORY_TURNS:])
     prompt = f"""
     AI 코드 리뷰어입니다. 사용자가 다음에 수행할 만한 '가장 논리적인 작업 1가지'를 '매우 짧게' 추천하세요.
     (10단어 이내 한국어, "..."으로 끝, 다른 설명 금지)
     [최근 대화]
     {history_str}
     [현재 코드]
-    {current_code[:2000]}...
+    {current_code[:SUGGESTION_CODE_CHARS]}...
     [추천 작업]
     """
     try:
-        response_text = await get_llm_response_async(prompt)
+        response_text = await get_llm_response_async(prompt, profile="suggestion")
+        if isinstance(response_text, LLMFailure): return response_text # 실패 표시(타입)를 유지해야 캐시에 남지 않음
         return response_text.strip().replace('"', '')
     except Exception as e:
-        return f"추천 생성 실패: {e}"
+        return LLMFailure(f"추천 생성 실패: {e}")
 
 async def modify_code_async(current_code: str, 
                             user_request: str, 
@@ -118,9 +398,10 @@ async def modify_code_async(current_code: str,
     reconstruction_instruction = ""
 
     if relevant_chunks and relevant_chunks.strip():
-        prompt_code_label = "[관련 코드 조각 (RAG)]"
+        prompt_code_label = "[관련 코드 조각]"
         code_context = relevant_chunks
-        reconstruction_instruction = "[RAG 지시] [관련 코드 조각]은 원본 코드의 일부입니다. 이 조각들을 참고하여 [현재 코드]의 '전체'를 수정/복원해야 합니다."
+        if target_filepath_for_json == "CURRENT":
+            reconstruction_instruction = "[RAG 지시] [관련 코드 조각]은 원본 코드의 일부입니다. 이 조각들을 참고하여 [현재 코드]의 '전체'를 수정/복원해야 합니다."
     elif len(current_code) > MAX_CODE_LENGTH:
         print(f"❌ [LLM CodeModify] RAG 실패 및 코드가 너무 깁니다 ({len(current_code)}자). LLM 호출을 중단합니다.")
         return json.dumps({
@@ -148,7 +429,7 @@ async def modify_code_async(current_code: str,
     [JSON 응답]
     """
     try:
-        response_text = await get_llm_response_async(prompt, response_mime_type="application/json")
+        response_text = await get_llm_response_async(prompt, response_mime_type="application/json", profile="code")
         try:
             parsed_dict = json.loads(response_text)
             return json.dumps(parsed_dict)
@@ -156,3 +437,175 @@ async def modify_code_async(current_code: str,
             return json.dumps({"filepath": "CURRENT", "code": response_text.strip()})
     except Exception as e:
         return json.dumps({"filepath": "CURRENT", "code": f"[LLM 오류: {e}]\n\n{current_code}"})
+
+async def modify_symbol_async(symbol_context: Dict, user_request: str, file_name: str) -> Tuple[str, int]:
+    """
+    (Lite) 커서 위치 심볼만 수정합니다. (심볼 색인이 만든 컨텍스트: 대상 심볼 + import + 의존 심볼 + 호출 위치)
+    반환: (수정된 심볼 코드, 프롬프트 길이(문자)) / 실패 시 심볼 코드는 빈 문자열
+    """
+    if not model:
+        return "", 0
+    start_line, end_line = symbol_context["start_line"], symbol_context["end_line"]
+    prompt = f"""
+    AI 코드 어시스턴트입니다. '반드시' [JSON 스키마]에 맞춰 응답하세요.
+    [지시] [사용자 요청]에 맞게 '{file_name}'의 {symbol_context['kind']} '{symbol_context['qualname']}'만 수정합니다.
+    반환하는 코드는 {start_line}~{end_line}번째 줄(데코레이터 포함)을 그대로 대체합니다.
+    들여쓰기를 유지하고, 의존 심볼/호출하는 곳은 참고용이며 수정할 수 없습니다.
+    호출하는 곳이 있으면 시그니처 호환성을 유지하세요.
+
+    {symbol_context['text']}
+
+    [사용자 요청]
+    "{user_request}"
+
+    [JSON 스키마 (필수)]
+    {{
+      "code": "[여기에 수정된 '{symbol_context['qualname']}' 전체 코드를 작성]"
+    }}
+
+    [JSON 응답]
+    """
+    try:
+        response_text = await get_llm_response_async(prompt, response_mime_type="application/json", profile="code")
+        try:
+            code = json.loads(response_text).get("code", "")
+        except (json.JSONDecodeError, AttributeError):
+            code = ""
+        return (code if isinstance(code, str) else ""), len(prompt)
+    except Exception as e:
+        print(f"❌ [LLM CodeModify] 심볼 수정 실패: {e}")
+        return "", len(prompt)
+
+async def modify_project_files_async(files: Dict[str, str], user_request: str) -> Tuple[Union[Dict[str, str], LLMFailure], int]:
+    """
+    (Lite) 프로젝트 수정 (일괄): 선택한 파일들을 한 번의 요청으로 보내고, 바뀐 파일의 전체 코드만 받습니다.
+    반환: ({상대 경로: 수정된 전체 코드}, 프롬프트 길이(문자)) / 실패 시 dict 대신 LLMFailure (빈 dict는 '변경 없음')
+    """
+    if not model:
+        return LLMFailure("LLM 오류"), 0
+    file_blocks = "\n\n".join(f"=== {path} ===\n{content}" for path, content in files.items())
+    prompt = f"""
+    AI 코드 어시스턴트입니다. '반드시' [JSON 스키마]에 맞춰 응답하세요.
+    [지시] [사용자 요청]을 [프로젝트 파일] 전체에 걸쳐 일관되게 적용합니다. (이름 변경 시 정의와 모든 사용처를 함께 수정)
+    수정이 필요한 파일만 "edits"에 넣고, 각 파일은 '수정된 전체 코드'를 반환합니다.
+    filepath는 아래 '=== 경로 ==='의 경로를 그대로 사용하며, 목록에 없는 파일은 만들 수 없습니다.
+
+    [프로젝트 파일]
+    {file_blocks}
+
+    [사용자 요청]
+    "{user_request}"
+
+    [JSON 스키마 (필수)]
+    {{
+      "edits": [{{"filepath": "[경로]", "code": "[수정된 전체 코드]"}}]
+    }}
+
+    [JSON 응답]
+    """
+    try:
+        response_text = await get_llm_response_async(prompt, response_mime_type="application/json", profile="code")
+        if isinstance(response_text, LLMFailure): return response_text, len(prompt)
+        try:
+            edits = json.loads(response_text).get("edits", [])
+            return {e["filepath"]: e["code"] for e in edits if isinstance(e, dict) and "filepath" in e and "code" in e}, len(prompt)
+        except (json.JSONDecodeError, AttributeError, TypeError):
+            return LLMFailure("[LLM 응답 오류: JSON 형식이 아님]"), len(prompt)
+    except Exception as e:
+        print(f"❌ [LLM ProjectModify] 일괄 수정 실패: {e}")
+        return LLMFailure(f"LLM API 호출 실패: {type(e).__name__} - {e}"), len(prompt)
+
+async def modify_project_file_async(filepath: str, content: str, user_request: str,
+                                    project_outline: str) -> Tuple[Optional[str], int]:
+    """
+    (Lite) 프로젝트 수정 (파일별): 파일 하나의 전체 코드 + 다른 선택 파일의 개요만 보냅니다.
+    반환: (수정된 전체 코드 / 변경 불필요 시 None / 실패 시 LLMFailure, 프롬프트 길이(문자))
+    """
+    if not model:
+        return LLMFailure("LLM 오류"), 0
+    prompt = f"""
+    AI 코드 어시스턴트입니다. '반드시' [JSON 스키마]에 맞춰 응답하세요.
+    [지시] 여러 파일에 걸친 [사용자 요청]을 적용하는 중입니다. 이번에는 '{filepath}'만 수정합니다.
+    다른 파일도 같은 요청으로 동시에 수정되므로, [다른 파일 개요]의 이름과 시그니처가 요청대로 바뀐다고 가정하세요.
+    이 파일에 바꿀 것이 없으면 "changed": false로 응답합니다.
+
+    [다른 파일 개요]
+    {project_outline}
+
+    [현재 파일: {filepath}]
+    {content}
+
+    [사용자 요청]
+    "{user_request}"
+
+    [JSON 스키마 (필수)]
+    {{
+      "changed": true,
+      "code": "[수정된 전체 코드 (changed가 false면 빈 문자열)]"
+    }}
+
+    [JSON 응답]
+    """
+    try:
+        response_text = await get_llm_response_async(prompt, response_mime_type="application/json", profile="code")
+        if isinstance(response_text, LLMFailure): return response_text, len(prompt)
+        try:
+            parsed = json.loads(response_text)
+            code = parsed.get("code")
+            return (code if parsed.get("changed") and isinstance(code, str) and code.strip() else None), len(prompt)
+        except (json.JSONDecodeError, AttributeError):
+            return LLMFailure("[LLM 응답 오류: JSON 형식이 아님]"), len(prompt)
+    except Exception as e:
+        print(f"❌ [LLM ProjectModify] '{filepath}' 수정 실패: {e}")
+        return LLMFailure(f"LLM API 호출 실패: {type(e).__name__} - {e}"), len(prompt)
+
+async def fix_code_region_async(region_code: str,
+                                trimmed_traceback: str,
+                                start_line: int,
+                                end_line: int,
+                                file_name: str,
+                                failed_attempts: Optional[List[str]] = None) -> Tuple[str, int]:
+    """
+    (Lite) 자동 디버거용: 실패한 영역(줄 범위)만 받아 수정된 영역 코드를 반환합니다.
+    반환: (수정된 영역 코드, 프롬프트 길이(문자)) / 실패 시 영역 코드는 빈 문자열
+    """
+    if not model:
+        return "", 0
+
+    failed_section = ""
+    if failed_attempts:
+        joined = "\n---\n".join(attempt[:1500] for attempt in failed_attempts[-2:])
+        failed_section = f"""
+    [이미 실패한 수정 시도 (같은 오류가 재발함, 반복 금지)]
+    {joined}
+"""
+
+    prompt = f"""
+    AI 코드 디버거입니다. '반드시' [JSON 스키마]에 맞춰 응답하세요.
+    [지시] [오류 트레이스백]을 해결하도록 [수정 대상 코드]만 수정합니다.
+    반환하는 코드는 '{file_name}'의 {start_line}~{end_line}번째 줄을 그대로 대체합니다.
+    들여쓰기를 유지하고, 범위 밖 코드는 수정할 수 없습니다.
+
+    [오류 트레이스백 (요약)]
+    {trimmed_traceback}
+
+    [수정 대상 코드 ({start_line}~{end_line}줄)]
+    {region_code}
+{failed_section}
+    [JSON 스키마 (필수)]
+    {{
+      "code": "[여기에 수정된 대상 코드 전체를 작성]"
+    }}
+
+    [JSON 응답]
+    """
+    try:
+        response_text = await get_llm_response_async(prompt, response_mime_type="application/json", profile="code")
+        try:
+            fixed = json.loads(response_text).get("code", "")
+        except (json.JSONDecodeError, AttributeError):
+            fixed = ""
+        return (fixed if isinstance(fixed, str) else ""), len(prompt)
+    except Exception as e:
+        print(f"❌ [LLM AutoFix] 영역 수정 실패: {e}")
+        return "", len(prompt)
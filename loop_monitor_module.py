@@ -0,0 +1,162 @@
+import asyncio
+import sys
+import threading
+import time
+import traceback
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional
+
+import executor_pool_module
+import metrics_module
+
+# [Lite] 이벤트 루프 모니터 설정
+LOOP_MONITOR_INTERVAL = 0.1      # 하트비트 간격 (초)
+LOOP_LAG_WARN_MS = 100           # 하트비트가 이만큼 늦게 깨어나면 지연으로 기록
+SLOW_CALLBACK_MS = 250           # 루프가 이만큼 막혀 있으면 루프 스레드의 스택을 기록
+EXECUTOR_CHECK_EVERY = 10        # 하트비트 N번마다 executor 포화 확인
+STACK_DEPTH = 12                 # 기록할 스택 프레임 수 (안쪽부터)
+MAX_EVENTS = 50                  # 보관할 경고 수 (오래된 것부터 버림)
+
+LOOP_LAG = metrics_module.REGISTRY.histogram("eidos_loop_lag_seconds", "워커 이벤트 루프 하트비트 지연")
+EXECUTOR_BACKLOG = metrics_module.REGISTRY.gauge("eidos_executor_backlog", "executor 대기열에 쌓인 작업 수", ["executor"])
+
+
+def executor_stats(executor: Any) -> Optional[Dict[str, Any]]:
+    """
+    [Lite] executor 사용량 {"max_workers", "active", "queued", ...} (알 수 없는 executor면 None)
+    이름 있는 실행 풀(ExecutorPool)은 자체 통계를, ThreadPoolExecutor는 내부 대기열 크기를 사용합니다.
+    """
+    if isinstance(executor, executor_pool_module.ExecutorPool):
+        return executor.stats()
+    work_queue = getattr(executor, "_work_queue", None)
+    if work_queue is None:
+        return None
+    queued = work_queue.qsize()
+    threads = len(getattr(executor, "_threads", ()))
+    # 대기열에 작업이 남아 있으면 모든 스레드가 바쁜 상태
+    return {"max_workers": getattr(executor, "_max_workers", 0),
+            "active": threads if queued else None, "queued": queued}
+
+
+class LoopMonitor:
+    """
+    [Lite] asyncio 루프 상태 감시.
+      - 하트비트 코루틴: interval마다 깨어나 예정보다 늦은 시간(루프 지연)을 측정
+      - 감시 스레드: 하트비트가 SLOW_CALLBACK_MS 이상 멈추면 그 순간 루프 스레드의 스택을 기록
+        (어떤 동기 호출이 루프를 막았는지 확인용)
+      - 기본 executor(asyncio.to_thread)와 이름 있는 실행 풀(io/llm/cpu)의 대기열이 쌓이면 포화로 기록
+    경고는 drain_events()로 가져가 추론 로그에 붙입니다.
+    """
+    def __init__(self, loop: asyncio.AbstractEventLoop,
+                 interval: float = LOOP_MONITOR_INTERVAL,
+                 lag_warn_ms: float = LOOP_LAG_WARN_MS,
+                 slow_callback_ms: float = SLOW_CALLBACK_MS):
+        self.loop = loop
+        self.interval = interval
+        self.lag_warn = lag_warn_ms / 1000
+        self.slow_callback = slow_callback_ms / 1000
+        self._events: Deque[Dict[str, Any]] = deque(maxlen=MAX_EVENTS)
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._task: Optional[asyncio.Task] = None
+        self._loop_thread_id: Optional[int] = None
+        self._beat = time.monotonic()
+        self._captured: Optional[tuple] = None  # (멈춘 하트비트 시각, 스택)
+        self._saturated_executors: set = set()
+        self.samples = 0
+        self.total_lag = 0.0
+        self.max_lag = 0.0
+
+    def start(self):
+        """ 루프 스레드에서 호출합니다. """
+        self._loop_thread_id = threading.get_ident()
+        self._beat = time.monotonic()
+        self._task = self.loop.create_task(self._heartbeat())
+        threading.Thread(target=self._watch, name="eidos-loop-watchdog", daemon=True).start()
+        print(f"🩺 [LoopMonitor-Lite] 시작 (지연 경고 {self.lag_warn*1000:.0f}ms, 블로킹 기록 {self.slow_callback*1000:.0f}ms)")
+
+    def stop(self):
+        self._stopped.set()
+        if self._task is not None: self._task.cancel()
+
+    def _add_event(self, event: Dict[str, Any]):
+        event["time"] = time.strftime("%H:%M:%S")
+        with self._lock: self._events.append(event)
+
+    async def _heartbeat(self):
+        beats = 0
+        while not self._stopped.is_set():
+            previous_beat = self._beat
+            await asyncio.sleep(self.interval)
+            now = time.monotonic()
+            lag = max(0.0, now - previous_beat - self.interval)
+            self._beat = now
+            self.samples += 1; self.total_lag += lag; self.max_lag = max(self.max_lag, lag)
+            LOOP_LAG.observe(lag)
+
+            captured, self._captured = self._captured, None
+            if captured is not None and captured[0] == previous_beat:
+                self._add_event({"kind": "blocked", "ms": lag * 1000, "stack": captured[1]})
+            elif lag >= self.lag_warn:
+                self._add_event({"kind": "lag", "ms": lag * 1000})
+
+            beats += 1
+            if beats % EXECUTOR_CHECK_EVERY == 0:
+                self._check_executors()
+
+    def _watch(self):
+        """ (감시 스레드) 하트비트가 멈춘 동안 루프 스레드의 스택을 한 번 기록 """
+        while not self._stopped.wait(self.interval / 2):
+            beat = self._beat
+            if time.monotonic() - beat - self.interval < self.slow_callback: continue
+            if self._captured is not None and self._captured[0] == beat: continue
+            frame = sys._current_frames().get(self._loop_thread_id)
+            if frame is None: continue
+            stack = "".join(traceback.format_stack(frame)[-STACK_DEPTH:])
+            self._captured = (beat, stack)
+
+    def _executors(self) -> Dict[str, Any]:
+        """ 감시할 executor 목록 (기본 executor는 처음 to_thread가 호출된 뒤에 생김) """
+        executors: Dict[str, Any] = dict(executor_pool_module.all_pools())
+        default = getattr(self.loop, "_default_executor", None)
+        if default is not None: executors["default"] = default
+        return executors
+
+    def _check_executors(self):
+        saturated_now = set()
+        for name, executor in self._executors().items():
+            stats = executor_stats(executor)
+            if stats is None: continue
+            EXECUTOR_BACKLOG.set(stats["queued"], executor=name)
+            if stats["queued"] > 0:
+                saturated_now.add(name)
+                if name not in self._saturated_executors:  # 포화가 시작될 때 한 번만 기록
+                    self._add_event({"kind": "executor", "executor": name, **stats})
+        self._saturated_executors = saturated_now
+
+    def drain_events(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            events = list(self._events)
+            self._events.clear()
+        return events
+
+    def report(self) -> Dict[str, Any]:
+        executors = {name: executor_stats(executor) for name, executor in self._executors().items()}
+        return {"samples": self.samples,
+                "avg_lag_ms": self.total_lag / self.samples * 1000 if self.samples else 0.0,
+                "max_lag_ms": self.max_lag * 1000,
+                "executors": {name: stats for name, stats in executors.items() if stats is not None}}
+
+
+def format_events(events: List[Dict[str, Any]]) -> str:
+    """ [Lite] 추론 로그용 루프 경고 요약 """
+    lines = []
+    for event in events:
+        if event["kind"] == "blocked":
+            lines.append(f"[LoopMonitor] {event['time']} 이벤트 루프가 {event['ms']:.0f}ms 동안 막힘. 당시 스택:\n{event['stack'].rstrip()}")
+        elif event["kind"] == "lag":
+            lines.append(f"[LoopMonitor] {event['time']} 이벤트 루프 지연 {event['ms']:.0f}ms")
+        elif event["kind"] == "executor":
+            lines.append(f"[LoopMonitor] {event['time']} '{event['executor']}' executor 포화: 대기 {event['queued']}건 "
+                         f"(작업자 {event['max_workers']}개 모두 사용 중)")
+    return "\n".join(lines)
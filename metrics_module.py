@@ -0,0 +1,258 @@
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+# [Lite] 성능 지표 설정
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)  # 초
+METRICS_DEFAULT_HOST = "127.0.0.1"
+
+
+def _format_labels(labelnames: Tuple[str, ...], values: Tuple[str, ...], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(labelnames, values)]
+    if extra: pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_value(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+class _Metric:
+    """ (Helper) 레이블 값 조합별 값을 가진 지표. 레지스트리가 꺼져 있으면 기록 메서드는 즉시 반환합니다. """
+    kind = ""
+
+    def __init__(self, registry: "MetricsRegistry", name: str, help_text: str, labelnames: Iterable[str] = ()):
+        self._registry = registry
+        self.name = name
+        self.help = help_text
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[Tuple[str, ...], Any] = {}
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, Any]) -> Tuple[str, ...]:
+        return tuple(str(labels.get(name, "")) for name in self.labelnames)
+
+    def reset(self):
+        with self._lock: self._values.clear()
+
+    def label_values(self, label: str) -> List[str]:
+        """ 기록된 값이 있는 레이블 값 목록 (정렬) """
+        index = self.labelnames.index(label)
+        with self._lock: return sorted({key[index] for key in self._values})
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def inc(self, amount: float = 1, **labels):
+        if not self._registry.enabled: return
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels) -> float:
+        with self._lock: return self._values.get(self._key(labels), 0)
+
+    def total(self, **labels) -> float:
+        """ 주어진 레이블만 일치하는 값들의 합 (나머지 레이블은 모두 합산) """
+        fixed = {self.labelnames.index(k): str(v) for k, v in labels.items()}
+        with self._lock:
+            return sum(v for key, v in self._values.items() if all(key[i] == val for i, val in fixed.items()))
+
+    def _samples(self) -> List[str]:
+        with self._lock:
+            return [f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(v)}" for key, v in sorted(self._values.items())]
+
+
+class Gauge(_Metric):
+    kind = "gauge"
+
+    def set(self, value: float, **labels):
+        if not self._registry.enabled: return
+        with self._lock: self._values[self._key(labels)] = value
+
+    def inc(self, amount: float = 1, **labels):
+        if not self._registry.enabled: return
+        key = self._key(labels)
+        with self._lock: self._values[key] = self._values.get(key, 0) + amount
+
+    def dec(self, amount: float = 1, **labels):
+        self.inc(-amount, **labels)
+
+    def value(self, **labels) -> float:
+        with self._lock: return self._values.get(self._key(labels), 0)
+
+    _samples = Counter._samples
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, registry: "MetricsRegistry", name: str, help_text: str,
+                 labelnames: Iterable[str] = (), buckets: Iterable[float] = LATENCY_BUCKETS):
+        super().__init__(registry, name, help_text, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, **labels):
+        if not self._registry.enabled: return
+        key = self._key(labels)
+        with self._lock:
+            entry = self._values.get(key)
+            if entry is None:
+                entry = self._values[key] = [[0] * len(self.buckets), 0.0, 0]  # (버킷별 개수, 합, 개수)
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    entry[0][i] += 1; break
+            entry[1] += value
+            entry[2] += 1
+
+    def summary(self, **labels) -> Dict[str, float]:
+        """ 주어진 레이블과 일치하는 관측값 전체의 {count, sum, avg, p50, p95} (분위수는 버킷 상한 기준 근사) """
+        fixed = {self.labelnames.index(k): str(v) for k, v in labels.items()}
+        counts, total, count = [0] * len(self.buckets), 0.0, 0
+        with self._lock:
+            for key, entry in self._values.items():
+                if not all(key[i] == val for i, val in fixed.items()): continue
+                counts = [a + b for a, b in zip(counts, entry[0])]
+                total += entry[1]; count += entry[2]
+
+        def quantile(q: float) -> float:
+            target, running = q * count, 0
+            for bound, bucket_count in zip(self.buckets, counts):
+                running += bucket_count
+                if running >= target: return bound
+            return float("inf")
+
+        return {"count": count, "sum": total, "avg": total / count if count else 0.0,
+                "p50": quantile(0.5) if count else 0.0, "p95": quantile(0.95) if count else 0.0}
+
+    def _samples(self) -> List[str]:
+        lines = []
+        with self._lock:
+            for key, (bucket_counts, total, count) in sorted(self._values.items()):
+                running = 0
+                for bound, bucket_count in zip(self.buckets, bucket_counts):
+                    running += bucket_count
+                    bucket_labels = _format_labels(self.labelnames, key, f'le="{bound}"')
+                    lines.append(f"{self.name}_bucket{bucket_labels} {running}")
+                bucket_labels = _format_labels(self.labelnames, key, 'le="+Inf"')
+                lines.append(f"{self.name}_bucket{bucket_labels} {count}")
+                lines.append(f"{self.name}_sum{_format_labels(self.labelnames, key)} {_format_value(total)}")
+                lines.append(f"{self.name}_count{_format_labels(self.labelnames, key)} {count}")
+        return lines
+
+
+class MetricsRegistry:
+    """
+    [Lite] 프로세스 전역 성능 지표 (카운터/게이지/히스토그램).
+    기본은 꺼져 있으며, 꺼져 있으면 기록 호출은 플래그 확인 한 번으로 끝납니다.
+    render_prometheus()는 Prometheus 텍스트 형식(0.0.4)을 반환합니다.
+    """
+    def __init__(self):
+        self.enabled = False
+        self._metrics: Dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def _get_or_create(self, cls, name: str, *args, **kwargs):
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = cls(self, name, *args, **kwargs)
+            return metric
+
+    def counter(self, name: str, help_text: str, labelnames: Iterable[str] = ()) -> Counter:
+        return self._get_or_create(Counter, name, help_text, labelnames)
+
+    def gauge(self, name: str, help_text: str, labelnames: Iterable[str] = ()) -> Gauge:
+        return self._get_or_create(Gauge, name, help_text, labelnames)
+
+    def histogram(self, name: str, help_text: str, labelnames: Iterable[str] = (),
+                  buckets: Iterable[float] = LATENCY_BUCKETS) -> Histogram:
+        return self._get_or_create(Histogram, name, help_text, labelnames, buckets)
+
+    def enable(self): self.enabled = True
+
+    def disable(self): self.enabled = False
+
+    def reset(self):
+        with self._lock: metrics = list(self._metrics.values())
+        for metric in metrics: metric.reset()
+
+    def render_prometheus(self) -> str:
+        with self._lock: metrics = list(self._metrics.values())
+        lines = []
+        for metric in metrics:
+            lines.append(f"# HELP {metric.name} {metric.help}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            lines.extend(metric._samples())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = MetricsRegistry()
+
+# [Lite] Core/LLM/도구/워커 공용 지표
+LLM_LATENCY = REGISTRY.histogram("eidos_llm_latency_seconds", "LLM API 호출 지연 시간 (생성 프로필/모델별)", ["profile", "model", "status"])
+LLM_TOKENS = REGISTRY.counter("eidos_llm_tokens_total", "LLM 입력/출력 토큰 수 (사용량 정보가 없으면 글자 수/4 추정)", ["direction", "profile"])
+CACHE_LOOKUPS = REGISTRY.counter("eidos_cache_lookups_total", "캐시 조회 결과 (hit/shared/miss)", ["cache", "result"])
+TOOL_DURATION = REGISTRY.histogram("eidos_tool_duration_seconds", "도구 실행 시간", ["tool", "status"])
+WORKER_QUEUE_DEPTH = REGISTRY.gauge("eidos_worker_queue_depth", "EidosWorker 루프에 제출되어 끝나지 않은 작업 수")
+PLANS = REGISTRY.counter("eidos_plans_total", "처리한 요청의 결과 (chat/ok/failed)", ["result"])
+TRIAGE = REGISTRY.counter("eidos_triage_total", "요청 분류 결과 (chat이면 플래너 생략)", ["route", "source"])
+PLAN_FAILURES = REGISTRY.counter("eidos_plan_failures_total", "실패한 계획 (validation/execution/exception)", ["stage"])
+
+
+def cache_hit_ratio(cache: str) -> Optional[float]:
+    """ [Lite] 캐시 적중률 (공유된 진행 중 결과도 적중으로 계산). 조회가 없으면 None """
+    hits = CACHE_LOOKUPS.value(cache=cache, result="hit") + CACHE_LOOKUPS.value(cache=cache, result="shared")
+    total = hits + CACHE_LOOKUPS.value(cache=cache, result="miss")
+    return hits / total if total else None
+
+
+def snapshot() -> Dict[str, Any]:
+    """ [Lite] 통계 패널용 요약 """
+    return {
+        "llm": LLM_LATENCY.summary(),
+        "llm_errors": LLM_LATENCY.summary(status="error")["count"],
+        "tokens_in": LLM_TOKENS.total(direction="input"),
+        "tokens_out": LLM_TOKENS.total(direction="output"),
+        "llm_profiles": {profile: dict(LLM_LATENCY.summary(profile=profile),
+                                       tokens_out=LLM_TOKENS.total(direction="output", profile=profile))
+                         for profile in LLM_LATENCY.label_values("profile")},
+        "tool": TOOL_DURATION.summary(),
+        "tool_cache_hit_ratio": cache_hit_ratio("tool"),
+        "suggestion_cache_hit_ratio": cache_hit_ratio("suggestion"),
+        "queue_depth": WORKER_QUEUE_DEPTH.value(),
+        "plans": PLANS.total(),
+        "triage_chat": TRIAGE.total(route="chat"),
+        "triage_total": TRIAGE.total(),
+        "plan_failures": PLAN_FAILURES.total(),
+    }
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split("?")[0] not in ("/metrics", "/"):
+            self.send_error(404); return
+        body = REGISTRY.render_prometheus().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass  # 스크레이프마다 로그를 남기지 않음
+
+
+def start_metrics_server(port: int, host: str = METRICS_DEFAULT_HOST) -> ThreadingHTTPServer:
+    """ [Lite] 지표를 켜고 /metrics 엔드포인트를 데몬 스레드에서 제공합니다. (헤드리스 실행용) """
+    REGISTRY.enable()
+    server = ThreadingHTTPServer((host, port), _MetricsHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="eidos-metrics", daemon=True).start()
+    print(f"📈 [Metrics-Lite] Prometheus 엔드포인트: http://{host}:{server.server_address[1]}/metrics")
+    return server
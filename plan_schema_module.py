@@ -0,0 +1,295 @@
+import json
+import re
+from typing import Any, Dict, List, Tuple
+
+from result_store_module import has_step_reference
+
+# [Lite] AVAILABLE_TOOLS의 파라미터 타입 표기 -> 응답 스키마 타입
+_PARAM_SCHEMA_TYPES = {
+    "str": "string",
+    "int": "integer",
+    "float": "number",
+    "bool": "boolean",
+}
+
+# JSON 문자열 안에서 허용되는 이스케이프 문자 (그 외의 '\x'는 잘못된 이스케이프)
+_VALID_ESCAPE_CHARS = '"\\/bfnrtu'
+_ESCAPE_PAIR_RE = re.compile(r"\\(.)", re.DOTALL)
+_CODE_FENCE_RE = re.compile(r"^\s*```(?:json)?\s*|\s*```\s*$", re.IGNORECASE)
+_PLAN_ARRAY_RE = re.compile(r'"plan"\s*:\s*\[')
+
+
+def _param_schema(param_type: str) -> Dict[str, Any]:
+    """ (Helper) 단일 파라미터 타입을 응답 스키마로 변환합니다. """
+    if param_type == "dict":
+        # Gemini 스키마는 임의 키의 OBJECT를 표현할 수 없으므로
+        # {경로: 내용} 딕셔너리를 [{path, content}] 리스트로 받아 로컬에서 되돌립니다.
+        return {
+            "type": "array",
+            "description": "[{\"path\": 상대 경로, \"content\": 파일 내용}] 목록",
+            "items": {
+                "type": "object",
+                "properties": {
+                    "path": {"type": "string"},
+                    "content": {"type": "string"},
+                },
+                "required": ["path", "content"],
+            },
+        }
+    return {"type": _PARAM_SCHEMA_TYPES.get(param_type, "string")}
+
+
+def build_plan_response_schema(tools: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    [Lite] AVAILABLE_TOOLS로부터 플래너 응답 스키마를 생성합니다.
+    응답 형식: {"mode": "CHAT"} 또는 {"mode": "PLAN", "plan": [{"tool": ..., "args": {...}}]}
+    """
+    arg_properties: Dict[str, Any] = {}
+    for info in tools.values():
+        for param_name, param_type in info.get("parameters", {}).items():
+            arg_properties.setdefault(param_name, _param_schema(param_type))
+
+    return {
+        "type": "object",
+        "properties": {
+            "mode": {"type": "string", "enum": ["CHAT", "PLAN"]},
+            "plan": {
+                "type": "array",
+                "items": {
+                    "type": "object",
+                    "properties": {
+                        "tool": {"type": "string", "enum": list(tools.keys())},
+                        "args": {"type": "object", "properties": arg_properties},
+                    },
+                    "required": ["tool", "args"],
+                },
+            },
+        },
+        "required": ["mode"],
+    }
+
+
+def _fix_invalid_escapes(text: str) -> str:
+    """ (Helper) JSON에서 허용되지 않는 이스케이프(예: 윈도우 경로)의 역슬래시를 이중화합니다. """
+    return _ESCAPE_PAIR_RE.sub(
+        lambda m: m.group(0) if m.group(1) in _VALID_ESCAPE_CHARS else "\\\\" + m.group(1), text
+    )
+
+
+def _strip_code_fence(text: str) -> str:
+    return _CODE_FENCE_RE.sub("", text.strip())
+
+
+def _loads_with_repair(text: str, repairs: List[str]) -> Any:
+    """
+    (Helper) 플래너 응답 문자열을 JSON으로 파싱합니다.
+    저비용 복구(코드 펜스, 뒤따르는 텍스트, 문자열 내 개행, 잘못된 이스케이프)를 순서대로 시도합니다.
+    """
+    stripped = _strip_code_fence(text)
+    if stripped != text.strip():
+        repairs.append("코드 펜스 제거")
+    try:
+        return json.loads(stripped)
+    except json.JSONDecodeError:
+        pass
+
+    starts = [pos for pos in (stripped.find("{"), stripped.find("[")) if pos != -1]
+    if not starts:
+        raise ValueError("JSON 객체/리스트를 찾을 수 없습니다.")
+    body = stripped[min(starts):]
+
+    # strict=False: 문자열 안의 날(raw) 개행/탭을 허용 (코드 내용에서 흔함)
+    attempts = (
+        (body, json.JSONDecoder(), None),
+        (body, json.JSONDecoder(strict=False), "문자열 내 제어 문자 허용"),
+        (_fix_invalid_escapes(body), json.JSONDecoder(strict=False), "잘못된 이스케이프 수정"),
+    )
+    for candidate, decoder, label in attempts:
+        try:
+            parsed, end = decoder.raw_decode(candidate)
+        except json.JSONDecodeError:
+            continue
+        if label:
+            repairs.append(label)
+        if min(starts) > 0 or candidate[end:].strip():
+            repairs.append("앞뒤 텍스트 제거")
+        return parsed
+    raise ValueError("JSON 복구 실패")
+
+
+def _coerce_arg(name: str, value: Any, param_type: str, repairs: List[str]) -> Any:
+    """ (Helper) 인수 하나를 선언된 타입으로 맞춥니다. 맞출 수 없으면 ValueError. """
+    if param_type == "dict":
+        if isinstance(value, str):
+            value = _loads_with_repair(value, repairs)
+            repairs.append(f"'{name}' 문자열 -> 딕셔너리")
+        if isinstance(value, list):
+            converted = {}
+            for entry in value:
+                if not isinstance(entry, dict) or "path" not in entry:
+                    raise ValueError(f"'{name}' 항목 형식 오류: {entry!r:.80}")
+                converted[entry["path"]] = entry.get("content", "")
+            value = converted
+        if not isinstance(value, dict):
+            raise ValueError(f"'{name}'은(는) 딕셔너리여야 합니다.")
+        return value
+    if param_type == "int":
+        if isinstance(value, bool) or not isinstance(value, (int, str)):
+            raise ValueError(f"'{name}'은(는) 정수여야 합니다.")
+        if isinstance(value, str):
+            if has_step_reference(value):
+                return value
+            try:
+                value = int(value.strip())
+            except ValueError:
+                raise ValueError(f"'{name}'은(는) 정수여야 합니다.")
+            repairs.append(f"'{name}' 문자열 -> 정수")
+        return value
+    if param_type == "str" and not isinstance(value, str):
+        if isinstance(value, (dict, list)):
+            raise ValueError(f"'{name}'은(는) 문자열이어야 합니다.")
+        repairs.append(f"'{name}' -> 문자열")
+        return str(value)
+    return value
+
+
+def validate_plan(plan: Any, tools: Dict[str, Dict[str, Any]], repairs: List[str]) -> Tuple[List[dict], List[str]]:
+    """
+    [Lite] 계획(리스트)을 도구 스키마에 맞춰 검증/정규화합니다.
+    반환: (정규화된 계획, 오류 목록)
+    """
+    errors: List[str] = []
+    if isinstance(plan, dict) and "tool" in plan:
+        plan = [plan]
+        repairs.append("단일 단계 -> 리스트")
+    if not isinstance(plan, list) or not plan:
+        return [], ["계획이 비어 있거나 리스트가 아닙니다."]
+
+    normalized = []
+    for i, step in enumerate(plan):
+        if not isinstance(step, dict):
+            errors.append(f"단계 {i+1}: 객체가 아닙니다.")
+            continue
+        tool_name = step.get("tool")
+        tool_info = tools.get(tool_name)
+        if tool_info is None:
+            errors.append(f"단계 {i+1}: 알 수 없는 도구 '{tool_name}'.")
+            continue
+        args = step.get("args") or {}
+        if not isinstance(args, dict):
+            errors.append(f"단계 {i+1}: 'args'가 객체가 아닙니다.")
+            continue
+
+        params = tool_info.get("parameters", {})
+        required = tool_info.get("required", params.keys())
+        fixed_args = {}
+        for arg_name, value in args.items():
+            if value is None:  # JSON null은 인수가 없는 것으로 처리 (필수면 아래 누락 오류로 복구/재계획)
+                if arg_name not in required: repairs.append(f"'{arg_name}' null 제거")
+                continue
+            try:
+                fixed_args[arg_name] = _coerce_arg(arg_name, value, params[arg_name], repairs) if arg_name in params else value
+            except ValueError as e:
+                errors.append(f"단계 {i+1} ({tool_name}): {e}")
+        missing = [p for p in required
+                   if p not in fixed_args and not (p == "filepath" and "path" in fixed_args)]
+        if missing:
+            errors.append(f"단계 {i+1} ({tool_name}): 필수 인수 누락 {missing}")
+        normalized.append({"tool": tool_name, "args": fixed_args})
+    return normalized, errors
+
+
+def parse_planner_response(raw_text: str, tools: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    [Lite] 플래너 원문 응답을 로컬에서 파싱/복구/검증합니다. (LLM 재호출 없음)
+    반환 dict: {"is_chat", "plan", "errors", "repairs"}
+    """
+    repairs: List[str] = []
+    result: Dict[str, Any] = {"is_chat": False, "plan": [], "errors": [], "repairs": repairs}
+
+    text = (raw_text or "").strip()
+    if _strip_code_fence(text).strip('"\' .').upper() == "CHAT":
+        result["is_chat"] = True
+        return result
+
+    try:
+        parsed = _loads_with_repair(text, repairs)
+    except ValueError as e:
+        result["errors"] = [f"JSON 파싱 실패: {e}"]
+        return result
+
+    if isinstance(parsed, str) and parsed.strip().upper() == "CHAT":
+        result["is_chat"] = True
+        return result
+    if isinstance(parsed, dict) and "mode" in parsed:
+        if str(parsed.get("mode")).upper() == "CHAT":
+            result["is_chat"] = True
+            return result
+        parsed = parsed.get("plan")
+    elif isinstance(parsed, dict) and isinstance(parsed.get("plan"), list):
+        parsed = parsed["plan"]
+
+    result["plan"], result["errors"] = validate_plan(parsed, tools, repairs)
+    return result
+
+
+class IncrementalPlanParser:
+    """
+    [Lite] 스트리밍되는 플래너 응답에서 "plan" 배열의 단계를 완성되는 대로 꺼냅니다.
+    문자열/이스케이프를 추적하며 최상위 객체의 괄호 짝만 세므로, 조각마다 새로 들어온 부분만 훑습니다.
+    feed()는 [(단계 번호(0-based), 단계 dict 또는 파싱 실패 시 None), ...]를 반환합니다.
+    (최종 계획은 여전히 parse_planner_response로 전체를 검증합니다)
+    """
+    def __init__(self):
+        self._buffer = ""
+        self._pos = -1         # plan 배열 안에서 다음에 볼 위치 (-1: 아직 배열 시작 전)
+        self._depth = 0
+        self._in_string = False
+        self._escaped = False
+        self._step_start = 0
+        self.step_count = 0
+        self.done = False      # plan 배열이 닫힘
+
+    def feed(self, chunk: str) -> List[Tuple[int, Any]]:
+        self._buffer += chunk
+        steps: List[Tuple[int, Any]] = []
+        if self.done:
+            return steps
+        if self._pos < 0:
+            match = _PLAN_ARRAY_RE.search(self._buffer)
+            if not match:
+                return steps
+            self._pos = match.end()
+        buffer, i = self._buffer, self._pos
+        while i < len(buffer):
+            ch = buffer[i]
+            if self._in_string:
+                if self._escaped: self._escaped = False
+                elif ch == "\\": self._escaped = True
+                elif ch == '"': self._in_string = False
+            elif ch == '"':
+                self._in_string = True
+            elif ch == "{":
+                if self._depth == 0: self._step_start = i
+                self._depth += 1
+            elif ch == "}":
+                self._depth -= 1
+                if self._depth == 0:
+                    try:
+                        step = json.loads(buffer[self._step_start:i + 1], strict=False)
+                    except json.JSONDecodeError:
+                        step = None
+                    steps.append((self.step_count, step))
+                    self.step_count += 1
+            elif ch == "]" and self._depth == 0:
+                self.done = True
+                break
+            i += 1
+        self._pos = i
+        return steps
+
+
+def format_errors_for_replan(errors: List[str], raw_text: str, max_chars: int = 1500) -> str:
+    """ [Lite] 재계획 프롬프트에 넣을 오류 요약을 만듭니다. """
+    snippet = (raw_text or "")[:max_chars]
+    return "\n".join(f"- {e}" for e in errors) + f"\n[이전 응답 (일부)]\n{snippet}"
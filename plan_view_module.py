@@ -0,0 +1,110 @@
+import json
+from collections import Counter
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+# [Lite] 계획 표시 설정 (수천 개 파일을 쓰는 계획도 GUI에는 요약과 현재 페이지만 올림)
+PLAN_INLINE_STEPS = 5          # 채팅 로그에 바로 보여 주는 단계 수 (나머지는 세부 보기에서)
+PLAN_PAGE_SIZE = 50            # 세부 보기 한 페이지의 단계 수
+PLAN_FILES_PAGE_SIZE = 100     # file_structure 단계의 파일 목록 한 페이지
+ARG_PREVIEW_CHARS = 60         # 단계 요약에 보여 주는 인수 길이
+CONTENT_PREVIEW_CHARS = 4000   # 세부 보기에서 선택한 인수/파일 내용 미리보기 길이
+PLAN_LOG_MAX_CHARS = 2000      # 추론 로그/콘솔에 계획을 JSON으로 그대로 넣는 최대 길이
+PLAN_VIEWS_KEPT = 20           # GUI가 세부 보기용으로 참조를 유지하는 최근 계획 수
+
+_LOG_ENCODER = json.JSONEncoder(ensure_ascii=False)
+
+
+def _short(value: Any, limit: int = ARG_PREVIEW_CHARS) -> str:
+    text = value if isinstance(value, str) else json.dumps(value, ensure_ascii=False)
+    text = " ".join(text.split())
+    return text if len(text) <= limit else text[:limit] + "…"
+
+
+def _preview(text: str) -> str:
+    if len(text) <= CONTENT_PREVIEW_CHARS: return text
+    return text[:CONTENT_PREVIEW_CHARS] + f"\n… ({len(text):,}자 중 {CONTENT_PREVIEW_CHARS:,}자 표시)"
+
+
+def _files(step: Dict[str, Any]) -> List[Tuple[str, Any]]:
+    """ (Helper) file_structure를 (경로, 내용) 목록으로 (검증 후 {경로: 내용} / LLM 원본 [{path, content}] 모두 지원) """
+    files = step.get("args", {}).get("file_structure")
+    if isinstance(files, dict):
+        return list(files.items())
+    if isinstance(files, list):
+        return [(str(f.get("path", "?")), f.get("content", "")) for f in files if isinstance(f, dict)]
+    return []
+
+
+def step_label(step: Dict[str, Any]) -> str:
+    """ [Lite] 단계 한 줄 요약 (파일 내용 같은 큰 인수는 넣지 않음) """
+    args = step.get("args", {}) if isinstance(step.get("args"), dict) else {}
+    if "file_structure" in args:
+        files = _files(step)
+        names = ", ".join(path for path, _ in files[:3])
+        return f"파일 {len(files)}개 생성 ({names}{', …' if len(files) > 3 else ''})"
+    for key in ("filepath", "query", "expression", "prompt"):
+        if key in args:
+            return _short(args[key])
+    return ""
+
+
+def summarize_plan(plan: Sequence[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    [Lite] GUI 전달용 계획 요약 (크기가 단계 수와 무관하게 작음)
+    {"step_count", "tools": {도구: 횟수}, "file_count", "payload_chars", "steps": [{"tool", "label"}, ...] (앞 몇 단계)}
+    """
+    tools: Counter = Counter()
+    file_count = payload_chars = 0
+    for step in plan:
+        tools[step.get("tool", "N/A")] += 1
+        files = _files(step)
+        file_count += len(files) + (1 if "filepath" in step.get("args", {}) and step.get("tool") == "write_file" else 0)
+        payload_chars += sum(len(str(content)) for _, content in files)
+        payload_chars += len(str(step.get("args", {}).get("content", "")))
+    return {"step_count": len(plan), "tools": dict(tools.most_common()), "file_count": file_count,
+            "payload_chars": payload_chars,
+            "steps": [{"tool": step.get("tool", "N/A"), "label": step_label(step)} for step in plan[:PLAN_INLINE_STEPS]]}
+
+
+def page(items: Sequence[Any], page_index: int, page_size: int) -> Tuple[List[Tuple[int, Any]], int, int]:
+    """ [Lite] (현재 페이지의 (원래 인덱스, 항목) 목록, 보정된 페이지 번호, 페이지 수) """
+    page_count = max(1, -(-len(items) // page_size))
+    page_index = min(max(0, page_index), page_count - 1)
+    start = page_index * page_size
+    return [(start + i, item) for i, item in enumerate(items[start:start + page_size])], page_index, page_count
+
+
+def step_detail(step: Dict[str, Any]) -> str:
+    """ [Lite] 세부 보기에서 선택한 단계의 인수 (긴 값은 잘라서, file_structure는 파일 목록에서 따로 로드) """
+    lines = [f"도구: {step.get('tool', 'N/A')}"]
+    for key, value in (step.get("args") or {}).items():
+        if key == "file_structure":
+            lines.append(f"{key}: 파일 {len(_files(step))}개 (아래 목록에서 선택)")
+            continue
+        text = value if isinstance(value, str) else json.dumps(value, ensure_ascii=False)
+        lines.append(f"{key}: {_preview(text)}")
+    return "\n".join(lines)
+
+
+def step_files(step: Dict[str, Any]) -> List[Tuple[str, Any]]:
+    """ [Lite] file_structure 단계의 (경로, 내용) 목록 (없으면 빈 목록) """
+    return _files(step)
+
+
+def file_preview(entry: Tuple[str, Any]) -> str:
+    return _preview(str(entry[1]))
+
+
+def plan_log_text(plan: Sequence[Dict[str, Any]], summary: Optional[Dict[str, Any]] = None) -> str:
+    """ [Lite] 추론 로그/콘솔용 계획 표기: 작으면 JSON, 크면 요약 (한도를 넘는 순간 직렬화를 멈춤) """
+    chunks, size = [], 0
+    for chunk in _LOG_ENCODER.iterencode(plan):
+        chunks.append(chunk)
+        size += len(chunk)
+        if size > PLAN_LOG_MAX_CHARS: break
+    else:
+        return "".join(chunks)
+    if summary is None: summary = summarize_plan(plan)
+    tools = ", ".join(f"{tool} x{count}" for tool, count in summary["tools"].items())
+    return (f"(계획 {summary['step_count']}단계: {tools} / 파일 {summary['file_count']}개, "
+            f"내용 {summary['payload_chars']:,}자 - 전체는 계획 세부 보기에서 확인)")
@@ -0,0 +1,99 @@
+import ast
+import os
+import re
+from collections import Counter
+from typing import Any, Dict, List, Optional
+
+import symbol_index_module
+from project_search_module import get_project_index
+
+# [Lite] 프로젝트 단위(여러 파일) 코드 수정 설정
+PROJECT_MODIFY_MAX_FILES = 8            # 한 번에 수정 대상으로 고르는 최대 파일 수
+PROJECT_MODIFY_MAX_FILE_BYTES = 20000   # 이보다 큰 파일은 대상에서 제외 (전체 내용을 보내고 받으므로)
+PROJECT_MODIFY_BATCH_CHARS = 24000      # 선택한 파일 합계가 이 이하면 요청 1회로 일괄 수정, 넘으면 파일별 병렬 요청
+PROJECT_MODIFY_CONCURRENCY = 3          # 파일별 병렬 요청의 최대 동시 실행 수
+OUTLINE_MAX_LINES = 40                  # 파일별 요청에 첨부하는 다른 파일 개요(심볼 시그니처)의 줄 수
+_TERM_RE = re.compile(r"[A-Za-z_][A-Za-z0-9_]{2,}")
+_TEXT_EXTENSIONS = (".py", ".pyw", ".js", ".ts", ".html", ".css", ".json", ".md", ".txt", ".toml", ".cfg", ".ini", ".yaml", ".yml")
+
+
+def _request_terms(user_request: str) -> List[str]:
+    """ (Helper) 요청에서 식별자처럼 보이는 단어 (파일/심볼 선택용) """
+    return list(dict.fromkeys(_TERM_RE.findall(user_request)))
+
+
+def select_files(root: str, user_request: str, current_file_path: Optional[str] = None,
+                 cursor_symbol: Optional[str] = None,
+                 max_files: int = PROJECT_MODIFY_MAX_FILES) -> Dict[str, Any]:
+    """
+    [Lite] 요청과 관련된 파일을 색인으로 고릅니다. (파일 전체를 읽어 LLM에 고르게 하지 않음)
+      - 요청/커서 심볼의 이름을 정의하거나 참조(호출)하는 .py 파일 (심볼 색인)
+      - 요청의 식별자가 들어 있는 텍스트 파일 (트라이그램 검색 색인)
+      - 현재 파일은 항상 포함
+    반환: {"files": [절대 경로, ...] (관련도 순), "skipped": [(상대 경로, 이유), ...], "terms": [...]}
+    """
+    root = os.path.realpath(root)
+    terms = _request_terms(user_request)
+    if cursor_symbol: terms = list(dict.fromkeys(terms + [cursor_symbol.split(".")[-1]]))
+    scores: Counter = Counter()
+    symbols = symbol_index_module.get_symbol_index(root)
+    search = get_project_index(root)
+    for term in terms:
+        for definition in symbols.definitions(term): scores[definition["path"]] += 3
+        for caller in symbols.callers(term): scores[caller["path"]] += 2
+        for hit in search.search(term, max_results=max_files * 4, context_lines=0):
+            if hit["abs_path"].endswith(_TEXT_EXTENSIONS): scores[hit["abs_path"]] += 1
+    if current_file_path:
+        scores[os.path.realpath(current_file_path)] += 1000
+
+    files, skipped = [], []
+    for path, _ in scores.most_common():
+        rel_path = os.path.relpath(path, root)
+        try:
+            size = os.path.getsize(path)
+        except OSError:
+            if path == os.path.realpath(current_file_path or ""): files.append(path)  # 아직 저장 안 된 새 파일
+            continue
+        if size > PROJECT_MODIFY_MAX_FILE_BYTES:
+            skipped.append((rel_path, f"너무 큼 ({size} bytes)")); continue
+        if len(files) >= max_files:
+            skipped.append((rel_path, "최대 파일 수 초과")); continue
+        files.append(path)
+    return {"files": files, "skipped": skipped, "terms": terms}
+
+
+def outline(path: str, content: str, max_lines: int = OUTLINE_MAX_LINES) -> str:
+    """ [Lite] 파일 개요: 파이썬이면 함수/클래스 시그니처 줄, 아니면 앞부분 몇 줄 """
+    lines = content.splitlines()
+    parsed = symbol_index_module.parse_symbols(content) if path.endswith(".py") else None
+    if parsed is None:
+        return "\n".join(lines[:max_lines // 4])
+    picked = []
+    for symbol in parsed["symbols"]:
+        if symbol["kind"] == "variable": continue
+        for line_no in range(symbol["start_line"], symbol["end_line"] + 1):
+            text = lines[line_no - 1]
+            picked.append(text)
+            if text.rstrip().endswith(":"): break  # 데코레이터 + 시그니처까지
+        if len(picked) >= max_lines: break
+    return "\n".join(picked[:max_lines])
+
+
+def validate_edits(originals: Dict[str, str], edits: Dict[str, str]) -> List[str]:
+    """
+    [Lite] LLM이 돌려준 수정안을 적용 전에 검사합니다. 오류 목록을 반환 (비어 있으면 통과)
+      - 선택한 파일만 수정 가능 (다른 경로/루트 밖 경로 거부)
+      - .py 파일은 문법 검사 (하나라도 실패하면 전체를 적용하지 않음)
+    """
+    errors = []
+    for rel_path, code in edits.items():
+        if rel_path not in originals:
+            errors.append(f"'{rel_path}': 선택된 파일이 아님"); continue
+        if not isinstance(code, str):
+            errors.append(f"'{rel_path}': 코드가 문자열이 아님"); continue
+        if rel_path.endswith((".py", ".pyw")):
+            try:
+                ast.parse(code)
+            except SyntaxError as e:
+                errors.append(f"'{rel_path}': 문법 오류 ({e.msg}, {e.lineno}줄)")
+    return errors
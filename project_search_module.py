@@ -0,0 +1,240 @@
+import os
+import threading
+from collections import defaultdict
+from typing import Any, Callable, Dict, Iterator, List, Optional, Set, Tuple
+
+# [Lite] 프로젝트 검색 설정
+SEARCH_MAX_FILE_BYTES = 1024 * 1024   # 이보다 큰 파일은 색인하지 않음 (대용량 파일은 에디터의 대용량 모드 검색 사용)
+SEARCH_CONTEXT_LINES = 2              # 일치한 줄 앞뒤로 보여줄 줄 수
+SEARCH_MAX_RESULTS = 50
+MAX_RESULT_LINE_CHARS = 200
+_SKIP_DIR_NAMES = {"__pycache__", "node_modules", "venv"}  # 숨김 폴더('.'으로 시작)도 건너뜀
+_BINARY_SNIFF_BYTES = 8192
+_BYTES_PER_SET_ENTRY = 60  # 집합 항목 + 짧은 문자열의 대략적인 크기
+
+
+def _trigrams(text: str) -> Set[str]:
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+def _read_text(path: str) -> Optional[str]:
+    """ (Helper) 색인 대상 텍스트 파일을 읽습니다. 너무 크거나 바이너리면 None. """
+    try:
+        if os.path.getsize(path) > SEARCH_MAX_FILE_BYTES:
+            return None
+        with open(path, "rb") as f:
+            data = f.read()
+    except OSError:
+        return None
+    if b"\0" in data[:_BINARY_SNIFF_BYTES]:
+        return None
+    return data.decode("utf-8", "replace")
+
+
+class ProjectSearchIndex:
+    """
+    [Lite] 폴더 하나(샌드박스 또는 프로젝트)에 대한 트라이그램 역색인.
+    검색어의 트라이그램을 모두 가진 파일만 후보로 골라 실제 줄 단위로 확인합니다.
+    처음 검색할 때 한 번 전체 색인을 만들고, 이후에는 파일 쓰기 알림(update_file)으로 해당 파일만 갱신합니다.
+    외부에서 바뀐 파일은 refresh()가 (mtime, 크기) 비교로 찾아 다시 색인합니다.
+    """
+    def __init__(self, root: str):
+        self.root = os.path.realpath(root)
+        self._lock = threading.RLock()
+        self._files: Dict[str, Tuple[int, int, Set[str]]] = {}  # 경로 -> (mtime_ns, 크기, 트라이그램)
+        self._postings: Dict[str, Set[str]] = defaultdict(set)  # 트라이그램 -> 경로 집합
+        self._built = False
+
+    def contains(self, path: str) -> bool:
+        real_path = os.path.realpath(path)
+        return real_path == self.root or real_path.startswith(self.root + os.sep)
+
+    def _iter_files(self, top: Optional[str] = None) -> Iterator[str]:
+        for dir_path, dir_names, file_names in os.walk(top or self.root):
+            dir_names[:] = [d for d in dir_names if not d.startswith(".") and d not in _SKIP_DIR_NAMES]
+            for file_name in file_names:
+                if not file_name.startswith("."):
+                    yield os.path.join(dir_path, file_name)
+
+    def _remove_locked(self, path: str):
+        entry = self._files.pop(path, None)
+        if entry is None:
+            return
+        for gram in entry[2]:
+            paths = self._postings.get(gram)
+            if paths is not None:
+                paths.discard(path)
+                if not paths: del self._postings[gram]
+
+    def _index_locked(self, path: str):
+        self._remove_locked(path)
+        try:
+            st = os.stat(path)
+        except OSError:
+            return
+        text = _read_text(path)
+        if text is None:
+            return
+        grams = _trigrams(text.lower())
+        for gram in grams:
+            self._postings[gram].add(path)
+        self._files[path] = (st.st_mtime_ns, st.st_size, grams)
+
+    def _ensure_built_locked(self):
+        if self._built:
+            return
+        for path in self._iter_files():
+            self._index_locked(path)
+        self._built = True
+
+    def update_file(self, path: str):
+        """ [Lite] 파일이 쓰여졌을 때 해당 파일만 다시 색인합니다. (색인 전이면 무시) """
+        real_path = os.path.realpath(path)
+        with self._lock:
+            if not self._built or not self.contains(real_path): return
+            if os.path.isdir(real_path):
+                for file_path in self._iter_files(real_path): self._index_locked(file_path)
+            else:
+                self._index_locked(real_path)
+
+    def remove_path(self, path: str):
+        """ [Lite] 삭제된 파일/폴더를 색인에서 제거합니다. """
+        real_path = os.path.realpath(path)
+        with self._lock:
+            for indexed_path in [p for p in self._files if p == real_path or p.startswith(real_path + os.sep)]:
+                self._remove_locked(indexed_path)
+
+    def refresh(self) -> int:
+        """ [Lite] 디스크와 비교해 바뀐/새/삭제된 파일만 갱신합니다. 반환: 갱신한 파일 수 """
+        with self._lock:
+            if not self._built:
+                self._ensure_built_locked()
+                return len(self._files)
+            seen = set()
+            updated = 0
+            for path in self._iter_files():
+                seen.add(path)
+                try:
+                    st = os.stat(path)
+                except OSError:
+                    continue
+                entry = self._files.get(path)
+                if entry is None or entry[0] != st.st_mtime_ns or entry[1] != st.st_size:
+                    self._index_locked(path); updated += 1
+            for path in [p for p in self._files if p not in seen]:
+                self._remove_locked(path); updated += 1
+            return updated
+
+    def _candidates_locked(self, needle: str) -> List[str]:
+        grams = _trigrams(needle)
+        if not grams:  # 3글자 미만: 전체 파일 확인
+            return sorted(self._files)
+        postings = sorted((self._postings.get(gram, set()) for gram in grams), key=len)
+        candidates = set(postings[0])
+        for paths in postings[1:]:
+            candidates &= paths
+            if not candidates: break
+        return sorted(candidates)
+
+    def search(self, query: str, max_results: int = SEARCH_MAX_RESULTS,
+               context_lines: int = SEARCH_CONTEXT_LINES) -> List[Dict[str, Any]]:
+        """
+        [Lite] 대소문자 구분 없이 query가 포함된 줄을 찾습니다. (줄 단위 일치)
+        반환: [{"path"(루트 기준 상대 경로), "abs_path", "line"(1-based), "text", "before", "after"}, ...]
+        """
+        needle = query.lower()
+        if not needle.strip():
+            return []
+        with self._lock:
+            self._ensure_built_locked()
+            candidates = self._candidates_locked(needle)
+        results: List[Dict[str, Any]] = []
+        for path in candidates:
+            text = _read_text(path)
+            if text is None: continue
+            lines = text.splitlines()
+            for i, line in enumerate(lines):
+                if needle not in line.lower(): continue
+                results.append({
+                    "path": os.path.relpath(path, self.root),
+                    "abs_path": path,
+                    "line": i + 1,
+                    "text": line[:MAX_RESULT_LINE_CHARS],
+                    "before": [l[:MAX_RESULT_LINE_CHARS] for l in lines[max(0, i - context_lines):i]],
+                    "after": [l[:MAX_RESULT_LINE_CHARS] for l in lines[i + 1:i + 1 + context_lines]],
+                })
+                if len(results) >= max_results: return results
+        return results
+
+    def approx_bytes(self) -> int:
+        """ 색인의 대략적인 메모리 사용량 (트라이그램 소속 1건당 파일 쪽/역색인 쪽 집합 항목 2개) """
+        with self._lock:
+            return sum(len(entry[2]) for entry in self._files.values()) * 2 * _BYTES_PER_SET_ENTRY
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"files": len(self._files), "trigrams": len(self._postings)}
+
+
+_INDEXES: Dict[str, ProjectSearchIndex] = {}
+_INDEXES_LOCK = threading.Lock()
+_CHANGE_LISTENERS: List[Tuple[Callable[[str], None], Callable[[str], None]]] = []
+
+
+def get_project_index(root: str) -> ProjectSearchIndex:
+    """ [Lite] 루트 폴더별 색인 (프로세스 안에서 공유) """
+    real_root = os.path.realpath(root)
+    with _INDEXES_LOCK:
+        index = _INDEXES.get(real_root)
+        if index is None:
+            index = _INDEXES[real_root] = ProjectSearchIndex(real_root)
+        return index
+
+
+def peek_project_index(root: str) -> Optional[ProjectSearchIndex]:
+    """ 이미 만들어진 색인만 반환합니다. (없으면 만들지 않고 None) """
+    with _INDEXES_LOCK:
+        return _INDEXES.get(os.path.realpath(root))
+
+
+def drop_project_index(root: str):
+    """ [Lite] 색인을 메모리에서 내립니다. (다음 get_project_index 때 다시 만듦) """
+    with _INDEXES_LOCK:
+        _INDEXES.pop(os.path.realpath(root), None)
+
+
+def register_change_listener(on_changed: Callable[[str], None], on_removed: Callable[[str], None]):
+    """ [Lite] 다른 색인(예: 심볼 색인)도 같은 파일 쓰기/삭제 알림을 받도록 등록합니다. """
+    _CHANGE_LISTENERS.append((on_changed, on_removed))
+
+
+def notify_file_changed(path: str):
+    """ [Lite] 파일 쓰기 후 호출: 이 파일을 포함하는 모든 색인을 갱신합니다. """
+    with _INDEXES_LOCK:
+        indexes = list(_INDEXES.values())
+    for index in indexes:
+        if index.contains(path): index.update_file(path)
+    for on_changed, _ in _CHANGE_LISTENERS: on_changed(path)
+
+
+def notify_path_removed(path: str):
+    with _INDEXES_LOCK:
+        indexes = list(_INDEXES.values())
+    for index in indexes:
+        if index.contains(path): index.remove_path(path)
+    for _, on_removed in _CHANGE_LISTENERS: on_removed(path)
+
+
+def format_search_results(query: str, results: List[Dict[str, Any]], max_results: int) -> str:
+    """ [Lite] 플래너/LLM에 넘길 검색 결과 문자열 (파일:줄 + 주변 줄) """
+    if not results:
+        return f"'{query}'에 대한 프로젝트 검색 결과가 없습니다."
+    blocks = []
+    for result in results:
+        first_line = result["line"] - len(result["before"])
+        numbered = [f"{first_line + j:>5} | {line}" for j, line in enumerate(result["before"])]
+        numbered.append(f"{result['line']:>5} > {result['text']}")
+        numbered += [f"{result['line'] + 1 + j:>5} | {line}" for j, line in enumerate(result["after"])]
+        blocks.append(f"{result['path']}:{result['line']}\n" + "\n".join(numbered))
+    header = f"'{query}' 검색 결과 {len(results)}건" + (" (최대 개수 도달, 일부 생략)" if len(results) >= max_results else "")
+    return header + "\n\n" + "\n\n".join(blocks)
@@ -0,0 +1,262 @@
+import asyncio
+import gzip
+import hashlib
+import json
+import threading
+import time
+from collections import defaultdict, deque
+from typing import Any, AsyncIterator, Deque, Dict, List, Optional, Tuple
+
+# [Lite] LLM/도구 트래픽 기록/재생 설정
+REPLAY_ORIGINAL_SPEED = 1.0   # 재생 시 기록된 지연 그대로
+REPLAY_NO_DELAY = 0.0         # 지연 없이 즉시 응답 (순수 Core 오버헤드 측정용)
+
+# 기록 파일(JSONL, .gz로 끝나면 gzip) 한 줄에 레코드 하나:
+#   {"type": "header", "version": 1, "created": ...}
+#   {"type": "blob", "id": "<sha1 앞 16자>", "text": "..."}           같은 텍스트(플래너 접두부 등)는 한 번만 저장
+#   {"type": "llm", "seq", "key", "t", "duration", "prompt", "prefix", "response"}   (텍스트 필드는 blob id)
+#   {"type": "llm_stream", ..., "chunks": [[도착 시각(호출 시작 기준), 텍스트 blob id], ...], "error"(선택)}
+#   {"type": "tool", "seq", "key", "tool", "args", "t", "duration", "result" | "error"}
+FORMAT_VERSION = 1
+
+
+class ReplayMismatch(LookupError):
+    """ 재생 파일에 해당 요청이 없음 (strict 모드) """
+
+
+class RecordedError(Exception):
+    """ 기록 당시 발생한 예외를 재생할 때 사용 (원래 예외 타입 이름을 메시지에 포함) """
+
+
+def _open(path: str, mode: str):
+    if path.endswith(".gz"):
+        return gzip.open(path, mode + "t", encoding="utf-8")
+    return open(path, mode, encoding="utf-8")
+
+
+def _digest(*parts: Any) -> str:
+    payload = json.dumps(parts, ensure_ascii=False, sort_keys=True, default=str)
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+
+def llm_key(prompt: str, static_prefix: Optional[str] = None,
+            response_mime_type: Optional[str] = None, response_schema: Optional[Dict] = None,
+            generation: Optional[Dict] = None) -> str:
+    """
+    [Lite] LLM 요청 식별 키 (같은 요청이면 기록/재생에서 같은 키)
+    generation은 해석된 생성 프로필(모델 + 출력 상한/온도/중단 시퀀스)로, 프롬프트가 같아도 설정이 다르면 다른 키
+    """
+    return _digest("llm", static_prefix or "", prompt, response_mime_type, response_schema, generation)
+
+
+def tool_key(tool_name: str, kwargs: Dict[str, Any]) -> str:
+    return _digest("tool", tool_name, kwargs)
+
+
+def _error_text(error: BaseException) -> str:
+    return f"{type(error).__name__}: {error}"
+
+
+class TrafficRecorder:
+    """
+    [Lite] LLM 호출과 도구 실행의 요청/응답/시간을 파일에 기록합니다.
+    긴 텍스트(프롬프트, 응답, 도구 결과)는 내용 해시로 한 번만 저장하므로 반복되는 접두부가 있어도 파일이 작습니다.
+    레코드는 끝날 때마다 flush하므로 중간에 중단돼도 그때까지의 기록은 재생할 수 있습니다.
+    """
+    def __init__(self, path: str):
+        self.path = path
+        self._file = _open(path, "w")
+        self._lock = threading.Lock()
+        self._blobs: set = set()
+        self._seq = 0
+        self._started = time.monotonic()
+        self.counts: Dict[str, int] = defaultdict(int)
+        self._write({"type": "header", "version": FORMAT_VERSION, "created": time.time()})
+
+    def _write(self, record: Dict[str, Any]):
+        self._file.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+    def _blob_locked(self, text: Optional[str]) -> Optional[str]:
+        if text is None: return None
+        blob_id = hashlib.sha1(text.encode("utf-8", "replace")).hexdigest()[:16]
+        if blob_id not in self._blobs:
+            self._blobs.add(blob_id)
+            self._write({"type": "blob", "id": blob_id, "text": text})
+        return blob_id
+
+    def now(self) -> float:
+        return time.monotonic() - self._started
+
+    def _add(self, record: Dict[str, Any], texts: Dict[str, Optional[str]]):
+        with self._lock:
+            if self._file is None: return
+            for field, text in texts.items():
+                record[field] = self._blob_locked(text)
+            record["seq"] = self._seq; self._seq += 1
+            self.counts[record["type"]] += 1
+            self._write(record)
+            self._file.flush()
+
+    def record_llm(self, key: str, started: float, prompt: str, static_prefix: Optional[str], response: str,
+                   failed: bool = False):
+        # (API 오류도 get_llm_response_async가 돌려준 오류 문자열 그대로 기록, failed로 오류 응답 표시)
+        record = {"type": "llm", "key": key, "t": round(started, 4), "duration": round(self.now() - started, 4)}
+        if failed: record["failed"] = True
+        self._add(record, {"prompt": prompt, "prefix": static_prefix, "response": response})
+
+    def record_llm_stream(self, key: str, started: float, prompt: str, static_prefix: Optional[str],
+                          chunks: List[Tuple[float, str]], error: Optional[BaseException] = None):
+        record = {"type": "llm_stream", "key": key, "t": round(started, 4), "duration": round(self.now() - started, 4)}
+        if error is not None: record["error"] = _error_text(error)
+        with self._lock:
+            record["chunks"] = [[round(offset, 4), self._blob_locked(text)] for offset, text in chunks]
+        self._add(record, {"prompt": prompt, "prefix": static_prefix})
+
+    def record_tool(self, key: str, started: float, tool_name: str, kwargs: Dict[str, Any],
+                    result: Optional[str] = None, error: Optional[BaseException] = None, failed: bool = False):
+        record = {"type": "tool", "key": key, "tool": tool_name, "t": round(started, 4),
+                  "duration": round(self.now() - started, 4)}
+        if error is not None: record["error"] = _error_text(error)
+        if failed: record["failed"] = True  # 도구가 실패 결과(ToolFailure)를 반환
+        self._add(record, {"args": json.dumps(kwargs, ensure_ascii=False, default=str),
+                           "result": result if isinstance(result, str) or result is None else str(result)})
+
+    def close(self):
+        with self._lock:
+            if self._file is not None:
+                self._file.close(); self._file = None
+        print(f"📼 [Replay-Lite] 기록 완료: '{self.path}' (LLM {self.counts['llm'] + self.counts['llm_stream']}회, "
+              f"도구 {self.counts['tool']}회)")
+
+
+class TrafficReplayer:
+    """
+    [Lite] 기록 파일의 응답을 API/도구 호출 없이 돌려줍니다.
+    같은 키의 요청은 기록된 순서대로(FIFO) 응답하므로 같은 입력이면 재생 결과가 항상 같습니다.
+    speed: 기록된 지연에 곱하는 값 (1.0 = 원래 속도, 0.1 = 10배 빠르게, 0 = 지연 없음)
+    strict=False면 키가 없는 요청에 같은 종류의 다음 미사용 레코드를 대신 돌려주고 mismatches로 집계합니다.
+    """
+    def __init__(self, path: str, speed: float = REPLAY_ORIGINAL_SPEED, strict: bool = False,
+                 replay_tools: bool = True):
+        self.path = path
+        self.speed = max(0.0, speed)
+        self.strict = strict
+        self.replay_tools = replay_tools
+        self._by_key: Dict[Tuple[str, str], Deque[Dict[str, Any]]] = defaultdict(deque)
+        self._by_type: Dict[str, Deque[Dict[str, Any]]] = defaultdict(deque)
+        self._blobs: Dict[str, str] = {}
+        self._used: set = set()
+        self.mismatches = 0
+        self.recorded_seconds = 0.0
+        self.replayed = 0
+        self._load()
+
+    def _load(self):
+        with _open(self.path, "r") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    continue  # 기록 중 중단된 마지막 줄
+                kind = record.get("type")
+                if kind == "blob":
+                    self._blobs[record["id"]] = record["text"]
+                elif kind in ("llm", "llm_stream", "tool"):
+                    group = "llm" if kind.startswith("llm") else "tool"
+                    self._by_key[(group, record["key"])].append(record)
+                    self._by_type[group].append(record)
+                    self.recorded_seconds += record.get("duration", 0.0)
+        total = sum(len(records) for records in self._by_type.values())
+        print(f"📼 [Replay-Lite] '{self.path}' 재생 준비: 레코드 {total}개 (속도 x{self.speed:g}, strict={self.strict})")
+
+    def _take(self, group: str, key: str) -> Dict[str, Any]:
+        queue = self._by_key.get((group, key))
+        while queue:
+            record = queue.popleft()
+            if record["seq"] not in self._used:
+                self._used.add(record["seq"]); self.replayed += 1
+                return record
+        if self.strict:
+            raise ReplayMismatch(f"기록에 없는 {group} 요청입니다. (key {key[:12]})")
+        fallback = self._by_type.get(group)
+        while fallback:
+            record = fallback.popleft()
+            if record["seq"] not in self._used:
+                self._used.add(record["seq"]); self.replayed += 1; self.mismatches += 1
+                return record
+        raise ReplayMismatch(f"재생할 {group} 레코드가 더 없습니다.")
+
+    def _text(self, blob_id: Optional[str]) -> Optional[str]:
+        return None if blob_id is None else self._blobs.get(blob_id, "")
+
+    async def _delay(self, seconds: float):
+        if self.speed > 0 and seconds > 0:
+            await asyncio.sleep(seconds * self.speed)
+
+    async def llm_response(self, key: str) -> Tuple[str, bool]:
+        """ (기록된 응답, 오류 응답이었는지) """
+        record = self._take("llm", key)
+        await self._delay(record.get("duration", 0.0))
+        if record["type"] == "llm_stream":
+            if "error" in record:
+                return f"LLM API 호출 실패: {record['error']}", True
+            return "".join(self._text(blob_id) for _, blob_id in record["chunks"]), False
+        return self._text(record.get("response")) or "", bool(record.get("failed"))
+
+    async def llm_stream(self, key: str) -> AsyncIterator[str]:
+        record = self._take("llm", key)
+        chunks = record.get("chunks") or [[record.get("duration", 0.0), record.get("response")]]
+        previous = 0.0
+        for offset, blob_id in chunks:
+            await self._delay(offset - previous); previous = offset
+            yield self._text(blob_id) or ""
+        if "error" in record:
+            raise RecordedError(record["error"])
+
+    async def tool_result(self, key: str) -> Tuple[str, bool]:
+        """ (기록된 결과, 도구가 실패 결과를 반환했는지) """
+        record = self._take("tool", key)
+        await self._delay(record.get("duration", 0.0))
+        if "error" in record:
+            raise RecordedError(record["error"])
+        return self._text(record.get("result")) or "", bool(record.get("failed"))
+
+    def summary(self) -> Dict[str, Any]:
+        remaining = sum(1 for records in self._by_type.values() for r in records if r["seq"] not in self._used)
+        return {"replayed": self.replayed, "mismatches": self.mismatches, "unused": remaining,
+                "recorded_seconds": round(self.recorded_seconds, 3)}
+
+
+_recorder: Optional[TrafficRecorder] = None
+_replayer: Optional[TrafficReplayer] = None
+
+
+def start_recording(path: str) -> TrafficRecorder:
+    """ [Lite] 이후의 LLM/도구 호출을 path에 기록합니다. """
+    global _recorder
+    stop()
+    _recorder = TrafficRecorder(path)
+    return _recorder
+
+
+def start_replay(path: str, speed: float = REPLAY_ORIGINAL_SPEED, strict: bool = False,
+                 replay_tools: bool = True) -> TrafficReplayer:
+    """ [Lite] 이후의 LLM 호출(과 replay_tools면 도구 실행)을 기록 파일로 대신합니다. """
+    global _replayer
+    stop()
+    _replayer = TrafficReplayer(path, speed, strict, replay_tools)
+    return _replayer
+
+
+def stop():
+    global _recorder, _replayer
+    if _recorder is not None: _recorder.close()
+    _recorder = _replayer = None
+
+
+def get_recorder() -> Optional[TrafficRecorder]:
+    return _recorder
+
+
+def get_replayer() -> Optional[TrafficReplayer]:
+    return _replayer
@@ -0,0 +1,78 @@
+import re
+from typing import Any, Dict, Iterable, Optional
+
+# [Lite] 계획 단계 결과 참조 설정
+PREV_STEP_PLACEHOLDER = "$PREV_STEP_RESULT"    # 직전 단계(배치)의 결과
+STEP_REFERENCE_RE = re.compile(r"\$STEP(\d+)_RESULT|\$PREV_STEP_RESULT")  # $STEP2_RESULT: 2번째 단계 결과 (1-based)
+RESULT_PREVIEW_CHARS = 2000       # 최종 결과(대화 기록/GUI)에 넣는 결과 미리보기 길이
+PROMPT_INLINE_CHARS = 12000       # LLM 프롬프트 인수에 결과를 넣을 때 결과 하나의 최대 길이
+
+
+def has_step_reference(value: Any) -> bool:
+    """ [Lite] 인수 값이 이전 단계 결과를 참조하는지 ($PREV_STEP_RESULT / $STEPn_RESULT) """
+    return isinstance(value, str) and "$" in value and STEP_REFERENCE_RE.search(value) is not None
+
+
+def truncate_middle(text: str, limit: int, label: str = "") -> str:
+    """ [Lite] 앞(2/3)과 뒤(1/3)만 남기고 가운데를 생략 표시로 바꿉니다. (limit 이하면 그대로) """
+    if len(text) <= limit:
+        return text
+    head = limit * 2 // 3
+    tail = limit - head
+    note = f"\n... ({len(text) - limit}자 생략{', ' + label if label else ''}) ...\n"
+    return text[:head] + note + text[len(text) - tail:]
+
+
+class StepResultStore:
+    """
+    [Lite] 계획 실행 중 단계 결과를 단계 번호(1-based)로 보관합니다.
+    결과 문자열은 한 번만 저장하고 참조로 넘기며, 인수에 실제로 넣어야 할 때만 꺼냅니다.
+      - 인수 전체가 참조 하나면 같은 문자열 객체를 그대로 전달 (복사 없음)
+      - LLM 프롬프트로 들어가는 인수(prompt_args)에는 결과마다 PROMPT_INLINE_CHARS로 잘라서 넣음
+      - 최종 결과/대화 기록에는 preview()만 사용
+    """
+    def __init__(self):
+        self._results: Dict[int, str] = {}
+        self.last_step: Optional[int] = None
+
+    def put(self, step_id: int, result: Any):
+        self._results[step_id] = result if isinstance(result, str) else str(result)
+        self.last_step = step_id
+
+    def get(self, step_id: int) -> str:
+        if step_id not in self._results:
+            raise LookupError(f"단계 {step_id}의 결과가 아직 없습니다.")
+        return self._results[step_id]
+
+    def _lookup(self, match: "re.Match") -> str:
+        if match.group(1) is None:  # $PREV_STEP_RESULT
+            return self._results[self.last_step] if self.last_step is not None else ""
+        return self.get(int(match.group(1)))
+
+    def resolve(self, value: str, for_prompt: bool = False) -> str:
+        """ [Lite] 문자열 안의 결과 참조를 실제 결과로 바꿉니다. """
+        if not has_step_reference(value):
+            return value
+        match = STEP_REFERENCE_RE.fullmatch(value)
+        if match and not for_prompt:
+            return self._lookup(match)  # 참조 하나뿐: 저장된 객체 그대로
+        if for_prompt:
+            return STEP_REFERENCE_RE.sub(
+                lambda m: truncate_middle(self._lookup(m), PROMPT_INLINE_CHARS, "이전 단계 결과 일부"), value)
+        return STEP_REFERENCE_RE.sub(self._lookup, value)
+
+    def resolve_args(self, args: Dict[str, Any], prompt_args: Iterable[str] = ()) -> Dict[str, Any]:
+        """ [Lite] 인수 dict의 결과 참조를 해석합니다. (참조가 없는 인수는 건드리지 않음) """
+        prompt_args = set(prompt_args)
+        return {key: self.resolve(value, for_prompt=key in prompt_args) if isinstance(value, str) else value
+                for key, value in args.items()}
+
+    def preview(self, step_id: Optional[int] = None, limit: int = RESULT_PREVIEW_CHARS) -> str:
+        """ [Lite] 결과 미리보기 (기본: 마지막 단계). 길면 가운데를 생략하고 단계 번호를 표시 """
+        step_id = self.last_step if step_id is None else step_id
+        if step_id is None or step_id not in self._results:
+            return ""
+        return truncate_middle(self._results[step_id], limit, f"단계 {step_id} 전체 결과 {len(self._results[step_id])}자")
+
+    def sizes(self) -> Dict[int, int]:
+        return {step_id: len(result) for step_id, result in self._results.items()}
@@ -0,0 +1,284 @@
+import asyncio
+import json
+import os
+import signal
+import sys
+import time
+from typing import Any, Dict, List, Optional
+
+# [Lite] 샌드박스 스크립트 실행 기본 제한값
+SANDBOX_POOL_SIZE = 2              # 대기(warm) 워커 프로세스 수
+SANDBOX_CPU_SECONDS = 10           # RLIMIT_CPU (초)
+SANDBOX_MEMORY_MB = 1024           # RLIMIT_AS (MB)
+SANDBOX_MAX_OPEN_FILES = 64        # RLIMIT_NOFILE
+SANDBOX_WALL_TIMEOUT = 10.0        # 벽시계 타임아웃 (초)
+SANDBOX_OUTPUT_CAP = 64 * 1024     # stdout/stderr 각각 최대 보관 바이트
+SANDBOX_JOBS_PER_WORKER = 50       # 워커 재활용 주기 (누수 방지)
+
+# fork + resource가 있는 POSIX에서만 warm 워커(zygote) 방식을 사용합니다.
+WARM_WORKERS_SUPPORTED = hasattr(os, "fork") and sys.platform != "win32"
+
+# 워커 프로세스에서 실행되는 부트스트랩 코드.
+# stdin으로 작업(JSON 한 줄)을 받아, 이미 떠 있는 인터프리터에서 fork한 자식에
+# 자원 제한을 걸고 스크립트를 실행한 뒤, 결과(JSON 한 줄)를 stdout으로 돌려줍니다.
+_WORKER_BOOTSTRAP = r'''
+import json, os, resource, select, signal, sys, time, traceback
+
+def _run_job(job):
+    out_r, out_w = os.pipe()
+    err_r, err_w = os.pipe()
+    sys.stdout.flush(); sys.stderr.flush()
+    start = time.monotonic()
+    pid = os.fork()
+    if pid == 0:
+        code = 1
+        try:
+            os.setsid()
+            devnull = os.open(os.devnull, os.O_RDONLY)
+            os.dup2(devnull, 0); os.dup2(out_w, 1); os.dup2(err_w, 2)
+            # 제어 채널 등 워커가 가진 나머지 fd는 자식에게 넘기지 않음
+            os.closerange(3, 1024)
+            cpu = job["cpu_seconds"]
+            resource.setrlimit(resource.RLIMIT_CPU, (cpu, cpu + 1))
+            mem = job["memory_mb"] * 1024 * 1024
+            resource.setrlimit(resource.RLIMIT_AS, (mem, mem))
+            nofile = job["max_open_files"]
+            resource.setrlimit(resource.RLIMIT_NOFILE, (nofile, nofile))
+            os.chdir(job["cwd"])
+            sys.argv = [job["script"]]
+            sys.path[0] = os.path.dirname(job["script"])
+            import runpy
+            runpy.run_path(job["script"], run_name="__main__")
+            code = 0
+        except SystemExit as e:
+            code = e.code if isinstance(e.code, int) else (0 if e.code is None else 1)
+        except BaseException:
+            traceback.print_exc()
+            code = 1
+        finally:
+            try:
+                sys.stdout.flush(); sys.stderr.flush()
+            finally:
+                os._exit(code)
+
+    os.close(out_w); os.close(err_w)
+    cap = job["output_cap"]
+    buffers = {out_r: bytearray(), err_r: bytearray()}
+    truncated = False
+    timed_out = False
+    deadline = start + job["wall_timeout"]
+    open_fds = [out_r, err_r]
+    while open_fds:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            timed_out = True
+            try: os.killpg(pid, signal.SIGKILL)
+            except OSError: pass
+            break
+        ready, _, _ = select.select(open_fds, [], [], min(remaining, 0.5))
+        for fd in ready:
+            chunk = os.read(fd, 65536)
+            if not chunk:
+                open_fds.remove(fd)
+                continue
+            room = cap - len(buffers[fd])
+            if room > 0:
+                buffers[fd] += chunk[:room]
+            if len(chunk) > room:
+                truncated = True
+    for fd in (out_r, err_r):
+        os.close(fd)
+    _, status, usage = os.wait4(pid, 0)
+    term_signal = os.WTERMSIG(status) if os.WIFSIGNALED(status) else None
+    return {
+        "returncode": os.WEXITSTATUS(status) if os.WIFEXITED(status) else -(term_signal or 1),
+        "signal": term_signal,
+        "stdout": buffers[out_r].decode("utf-8", "replace"),
+        "stderr": buffers[err_r].decode("utf-8", "replace"),
+        "timed_out": timed_out,
+        "truncated": truncated,
+        "wall_time": time.monotonic() - start,
+        "cpu_time": usage.ru_utime + usage.ru_stime,
+        "max_rss_kb": usage.ru_maxrss,
+    }
+
+_control_out = os.fdopen(os.dup(1), "w", encoding="utf-8")
+for line in sys.stdin:
+    if not line.strip():
+        continue
+    try:
+        result = _run_job(json.loads(line))
+    except Exception as e:
+        result = {"returncode": -1, "stdout": "", "stderr": f"[Sandbox Worker] {e}", "worker_error": True}
+    _control_out.write(json.dumps(result) + "\n")
+    _control_out.flush()
+'''
+
+
+class _SandboxWorker:
+    """ (Helper) 부트스트랩 코드를 실행 중인 warm 워커 프로세스 하나 """
+    def __init__(self, process: asyncio.subprocess.Process):
+        self.process = process
+        self.jobs_run = 0
+
+    @property
+    def alive(self) -> bool:
+        return self.process.returncode is None
+
+    def kill(self):
+        if self.alive:
+            try: self.process.kill()
+            except ProcessLookupError: pass
+
+
+class SandboxRunner:
+    """
+    [Lite] 생성된 코드를 warm 워커 프로세스 풀에서 자원 제한과 함께 실행합니다.
+    각 실행은 워커에서 fork한 자식 프로세스에서 이뤄지므로 인터프리터 시작 비용 없이
+    CPU 시간 / 메모리(주소 공간) / 열린 파일 수 / 벽시계 시간 / 출력 크기가 제한됩니다.
+    (fork/resource가 없는 플랫폼에서는 제한 없이 일반 subprocess로 대체 실행)
+    """
+    def __init__(self,
+                 pool_size: int = SANDBOX_POOL_SIZE,
+                 cpu_seconds: int = SANDBOX_CPU_SECONDS,
+                 memory_mb: int = SANDBOX_MEMORY_MB,
+                 max_open_files: int = SANDBOX_MAX_OPEN_FILES,
+                 wall_timeout: float = SANDBOX_WALL_TIMEOUT,
+                 output_cap: int = SANDBOX_OUTPUT_CAP):
+        self.pool_size = pool_size
+        self.cpu_seconds = cpu_seconds
+        self.memory_mb = memory_mb
+        self.max_open_files = max_open_files
+        self.wall_timeout = wall_timeout
+        self.output_cap = output_cap
+        self._idle: List[_SandboxWorker] = []
+        self._slots: Optional[asyncio.Semaphore] = None
+
+    async def _spawn_worker(self) -> _SandboxWorker:
+        env = dict(os.environ, PYTHONIOENCODING="utf-8", PYTHONUNBUFFERED="1")
+        process = await asyncio.create_subprocess_exec(
+            sys.executable, "-c", _WORKER_BOOTSTRAP,
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.DEVNULL,
+            env=env,
+            # 결과 JSON 한 줄에 stdout/stderr가 모두 담기므로 출력 제한보다 넉넉하게
+            limit=4 * self.output_cap + 65536,
+        )
+        return _SandboxWorker(process)
+
+    async def _acquire_worker(self) -> "tuple[_SandboxWorker, bool]":
+        """ 대기 중인 warm 워커를 꺼내거나 새로 띄웁니다. 반환: (워커, 재사용 여부) """
+        while self._idle:
+            worker = self._idle.pop()
+            if worker.alive:
+                return worker, True
+        return await self._spawn_worker(), False
+
+    def _release_worker(self, worker: _SandboxWorker):
+        if worker.alive and worker.jobs_run < SANDBOX_JOBS_PER_WORKER and len(self._idle) < self.pool_size:
+            self._idle.append(worker)
+        else:
+            worker.kill()
+
+    async def warm_up(self):
+        """ 풀을 미리 채워 첫 실행의 인터프리터 시작 비용을 없앱니다. """
+        if not WARM_WORKERS_SUPPORTED: return
+        while len(self._idle) < self.pool_size:
+            self._idle.append(await self._spawn_worker())
+
+    async def run_script_async(self, script_path: str, cwd: Optional[str] = None) -> Dict[str, Any]:
+        """
+        [Lite] 스크립트를 샌드박스에서 실행하고 결과와 자원 사용량을 반환합니다.
+        반환 dict: returncode, stdout, stderr, timed_out, truncated, wall_time, cpu_time,
+                   max_rss_kb, warm(재사용 워커 여부), limited(자원 제한 적용 여부)
+        """
+        script_path = os.path.abspath(script_path)
+        cwd = cwd or os.path.dirname(script_path)
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.pool_size)
+
+        async with self._slots:
+            if not WARM_WORKERS_SUPPORTED:
+                return await self._run_cold_async(script_path, cwd)
+
+            worker, reused = await self._acquire_worker()
+            job = {
+                "script": script_path, "cwd": cwd,
+                "cpu_seconds": self.cpu_seconds, "memory_mb": self.memory_mb,
+                "max_open_files": self.max_open_files,
+                "wall_timeout": self.wall_timeout, "output_cap": self.output_cap,
+            }
+            try:
+                worker.process.stdin.write((json.dumps(job) + "\n").encode("utf-8"))
+                await worker.process.stdin.drain()
+                # 워커 자체가 멈춘 경우를 대비한 바깥쪽 타임아웃
+                line = await asyncio.wait_for(worker.process.stdout.readline(), self.wall_timeout + 5)
+                if not line:
+                    raise RuntimeError("샌드박스 워커가 예기치 않게 종료되었습니다.")
+                result = json.loads(line)
+            except Exception as e:
+                worker.kill()
+                return {
+                    "returncode": -1, "stdout": "", "stderr": f"[Sandbox] 실행 실패: {e}",
+                    "timed_out": isinstance(e, asyncio.TimeoutError), "truncated": False,
+                    "wall_time": 0.0, "cpu_time": 0.0, "max_rss_kb": 0,
+                    "warm": reused, "limited": True,
+                }
+            worker.jobs_run += 1
+            self._release_worker(worker)
+            result["warm"] = reused
+            result["limited"] = True
+            return result
+
+    async def _run_cold_async(self, script_path: str, cwd: str) -> Dict[str, Any]:
+        """ (Fallback) 자원 제한 없이 새 인터프리터로 실행 (타임아웃/출력 제한만 적용) """
+        start = time.monotonic()
+        env = dict(os.environ, PYTHONIOENCODING="utf-8")
+        process = await asyncio.create_subprocess_exec(
+            sys.executable, script_path, cwd=cwd, env=env,
+            stdin=asyncio.subprocess.DEVNULL,
+            stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE,
+        )
+        timed_out = False
+        try:
+            stdout, stderr = await asyncio.wait_for(process.communicate(), self.wall_timeout)
+        except asyncio.TimeoutError:
+            timed_out = True
+            process.kill()
+            stdout, stderr = await process.communicate()
+        truncated = len(stdout) > self.output_cap or len(stderr) > self.output_cap
+        return {
+            "returncode": process.returncode, "signal": None,
+            "stdout": stdout[:self.output_cap].decode("utf-8", "replace"),
+            "stderr": stderr[:self.output_cap].decode("utf-8", "replace"),
+            "timed_out": timed_out, "truncated": truncated,
+            "wall_time": time.monotonic() - start, "cpu_time": None, "max_rss_kb": None,
+            "warm": False, "limited": False,
+        }
+
+    async def shutdown(self):
+        for worker in self._idle:
+            worker.kill()
+            try: await worker.process.wait()
+            except Exception: pass
+        self._idle.clear()
+
+
+def format_usage_report(result: Dict[str, Any]) -> str:
+    """ [Lite] debug_console에 출력할 실행 자원 사용량 요약 """
+    parts = [f"종료 코드 {result.get('returncode')}", f"벽시계 {result.get('wall_time', 0.0):.2f}s"]
+    if result.get("cpu_time") is not None:
+        parts.append(f"CPU {result['cpu_time']:.2f}s")
+    if result.get("max_rss_kb"):
+        parts.append(f"최대 메모리 {result['max_rss_kb'] / 1024:.1f}MB")
+    parts.append("warm 워커 재사용" if result.get("warm") else "새 인터프리터")
+    if not result.get("limited"):
+        parts.append("자원 제한 미지원")
+    if result.get("timed_out"):
+        parts.append("⏱ 시간 초과로 강제 종료")
+    elif result.get("signal") is not None and result.get("signal") == getattr(signal, "SIGXCPU", None):
+        parts.append("⏱ CPU 시간 제한 초과")
+    if result.get("truncated"):
+        parts.append("출력 잘림")
+    return "📊 [Sandbox] " + " | ".join(parts)
@@ -0,0 +1,374 @@
+import contextlib
+import contextvars
+import difflib
+import json
+import os
+import threading
+import time
+import zlib
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from autosave_module import atomic_write_text, content_hash
+from project_search_module import notify_file_changed, notify_path_removed
+
+# [Lite] AI 편집 스냅샷 저장소 설정
+SNAPSHOT_DIR_NAME = ".eidos_snapshots"  # 샌드박스 안의 숨김 폴더 (파일 트리/프로젝트 검색에서 제외)
+SNAPSHOT_MAX_CHANGESETS = 200           # 되돌리기 가능한 변경 묶음 수. 넘으면 오래된 것부터 정리
+_BLOB_COMPRESS_LEVEL = 6
+
+# 현재 실행 중인 변경 묶음 (store, changeset_id). 계획 실행 중 도구의 파일 쓰기가 여기에 기록됩니다.
+# (asyncio 태스크/to_thread는 컨텍스트를 복사하므로 병렬 단계에도 전달됨)
+_ACTIVE_CHANGESET: contextvars.ContextVar[Optional[Tuple["SnapshotStore", str]]] = \
+    contextvars.ContextVar("eidos_active_changeset", default=None)
+
+
+def _read_current(path: str) -> Optional[str]:
+    try:
+        with open(path, "r", encoding="utf-8", newline="") as f:
+            return f.read()
+    except (OSError, UnicodeDecodeError):
+        return None
+
+
+class SnapshotStore:
+    """
+    [Lite] 내용 주소 기반(content-addressed) AI 편집 스냅샷 저장소.
+      objects/ab/cdef...   파일 버전 내용 (해시로 중복 제거, zlib 압축)
+      changesets/<id>.json 변경 묶음(계획 실행/AI 수정 1회)의 매니페스트 {상대 경로: [이전 해시, 이후 해시]}
+      state.json           되돌리기/다시 실행 스택 (묶음 단위 + 파일 단위)
+    해시 None은 '파일 없음'을 뜻합니다. 되돌리기/다시 실행은 현재 파일 해시가 기대값과 같을 때만 덮어씁니다.
+    """
+    def __init__(self, root: str, max_changesets: int = SNAPSHOT_MAX_CHANGESETS):
+        self.root = os.path.realpath(root)
+        self.store_dir = os.path.join(self.root, SNAPSHOT_DIR_NAME)
+        self.max_changesets = max_changesets
+        self._lock = threading.RLock()
+        self._open: Dict[str, Dict[str, Any]] = {}  # 아직 커밋되지 않은 변경 묶음
+        self._state: Optional[Dict[str, Any]] = None
+
+    # --- 저장소 내부 ---
+    def _path(self, *parts: str) -> str:
+        return os.path.join(self.store_dir, *parts)
+
+    def contains(self, path: str) -> bool:
+        real_path = os.path.realpath(path)
+        return real_path.startswith(self.root + os.sep) and not real_path.startswith(self.store_dir + os.sep)
+
+    def _rel(self, path: str) -> str:
+        return os.path.relpath(os.path.realpath(path), self.root)
+
+    def _load_state(self) -> Dict[str, Any]:
+        if self._state is None:
+            try:
+                with open(self._path("state.json"), "r", encoding="utf-8") as f:
+                    self._state = json.load(f)
+            except (OSError, ValueError):
+                self._state = {"undo": [], "redo": [], "file_redo": {}}
+        return self._state
+
+    def _save_state(self):
+        atomic_write_text(self._path("state.json"), json.dumps(self._state, ensure_ascii=False))
+
+    def _put_blob(self, content: str) -> str:
+        digest = content_hash(content)
+        blob_path = self._path("objects", digest[:2], digest[2:])
+        if not os.path.exists(blob_path):  # 같은 내용은 한 번만 저장
+            os.makedirs(os.path.dirname(blob_path), exist_ok=True)
+            tmp_path = f"{blob_path}.{os.getpid()}.tmp"
+            with open(tmp_path, "wb") as f:
+                f.write(zlib.compress(content.encode("utf-8"), _BLOB_COMPRESS_LEVEL))
+            os.replace(tmp_path, blob_path)
+        return digest
+
+    def get_blob(self, digest: Optional[str]) -> Optional[str]:
+        if digest is None:
+            return None
+        with open(self._path("objects", digest[:2], digest[2:]), "rb") as f:
+            return zlib.decompress(f.read()).decode("utf-8")
+
+    def _load_manifest(self, changeset_id: str) -> Dict[str, Any]:
+        with open(self._path("changesets", f"{changeset_id}.json"), "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def get_manifest(self, changeset_id: str) -> Optional[Dict[str, Any]]:
+        """ 커밋된 변경 묶음의 매니페스트 (변경이 없어 커밋되지 않았으면 None) """
+        try:
+            return self._load_manifest(changeset_id)
+        except (OSError, ValueError):
+            return None
+
+    def _current_hash(self, abs_path: str) -> Optional[str]:
+        content = _read_current(abs_path)
+        return None if content is None else content_hash(content)
+
+    def _restore(self, rel_path: str, digest: Optional[str]):
+        abs_path = os.path.join(self.root, rel_path)
+        if digest is None:
+            if os.path.exists(abs_path):
+                os.remove(abs_path); notify_path_removed(abs_path)
+            return
+        atomic_write_text(abs_path, self.get_blob(digest))
+        notify_file_changed(abs_path)
+
+    # --- 기록 ---
+    def begin(self, label: str) -> str:
+        changeset_id = f"{time.strftime('%Y%m%d-%H%M%S')}-{os.urandom(3).hex()}"
+        with self._lock:
+            self._open[changeset_id] = {"id": changeset_id, "label": label, "created": time.time(), "files": {}}
+        return changeset_id
+
+    def write(self, changeset_id: str, path: str, content: str, before: Optional[str] = None):
+        """
+        [Lite] 파일을 원자적으로 쓰고 변경 묶음에 (이전, 이후) 버전을 기록합니다.
+        before가 없으면 디스크의 현재 내용을 이전 버전으로 사용합니다. (에디터의 미저장 버퍼를 넘길 때 사용)
+        """
+        rel_path = self._rel(path)
+        if before is None: before = _read_current(path)
+        with self._lock:
+            files = self._open[changeset_id]["files"]
+            before_hash = files[rel_path][0] if rel_path in files else (None if before is None else self._put_blob(before))
+            after_hash = self._put_blob(content)
+            files[rel_path] = [before_hash, after_hash]
+        atomic_write_text(path, content)
+        notify_file_changed(path)
+
+    def commit(self, changeset_id: str) -> Optional[Dict[str, Any]]:
+        """ [Lite] 변경 묶음을 매니페스트로 저장하고 되돌리기 스택에 올립니다. (변경 없음이면 None) """
+        with self._lock:
+            manifest = self._open.pop(changeset_id)
+            manifest["files"] = {rel: pair for rel, pair in manifest["files"].items() if pair[0] != pair[1]}
+            if not manifest["files"]:
+                return None
+            atomic_write_text(self._path("changesets", f"{changeset_id}.json"), json.dumps(manifest, ensure_ascii=False))
+            state = self._load_state()
+            state["undo"].append(changeset_id)
+            state["redo"] = []
+            for rel_path in manifest["files"]: state["file_redo"].pop(rel_path, None)
+            pruned = state["undo"][:-self.max_changesets]
+            if pruned:
+                state["undo"] = state["undo"][-self.max_changesets:]
+                self._prune(pruned)
+            self._save_state()
+            return manifest
+
+    def write_many(self, label: str, contents: Dict[str, str],
+                   before: Optional[Dict[str, str]] = None) -> Optional[Dict[str, Any]]:
+        """
+        [Lite] 여러 파일을 하나의 변경 묶음(되돌리기 한 번)으로 씁니다.
+        중간에 쓰기가 실패하면 이미 쓴 파일을 디스크의 원래 내용으로 되돌리고 예외를 다시 던집니다. (전부 또는 전무)
+        before: 경로 -> 이전 버전으로 기록할 내용 (에디터의 미저장 버퍼)
+        """
+        before = before or {}
+        changeset_id = self.begin(label)
+        written: List[Tuple[str, Optional[str]]] = []
+        try:
+            for path, content in contents.items():
+                on_disk = _read_current(path)
+                self.write(changeset_id, path, content, before=before.get(path))
+                written.append((path, on_disk))
+        except BaseException:
+            for path, on_disk in reversed(written):
+                try:
+                    if on_disk is None:
+                        os.remove(path); notify_path_removed(path)
+                    else:
+                        atomic_write_text(path, on_disk); notify_file_changed(path)
+                except OSError:
+                    pass
+            with self._lock: self._open.pop(changeset_id, None)
+            raise
+        return self.commit(changeset_id)
+
+    @contextlib.contextmanager
+    def changeset(self, label: str) -> Iterator[str]:
+        """ [Lite] with 블록 동안의 도구 파일 쓰기를 하나의 변경 묶음으로 기록합니다. """
+        changeset_id = self.begin(label)
+        token = _ACTIVE_CHANGESET.set((self, changeset_id))
+        try:
+            yield changeset_id
+        finally:
+            _ACTIVE_CHANGESET.reset(token)
+            self.commit(changeset_id)
+
+    def _prune(self, changeset_ids: List[str]):
+        """ (Helper) 오래된 매니페스트를 지우고, 남은 매니페스트가 참조하지 않는 내용을 정리합니다. """
+        for changeset_id in changeset_ids:
+            try: os.remove(self._path("changesets", f"{changeset_id}.json"))
+            except OSError: pass
+        state = self._load_state()
+        pruned = set(changeset_ids)
+        for rel_path in list(state["file_redo"]):
+            state["file_redo"][rel_path] = [c for c in state["file_redo"][rel_path] if c not in pruned]
+            if not state["file_redo"][rel_path]: del state["file_redo"][rel_path]
+        live = set()
+        for changeset_id in state["undo"] + state["redo"]:
+            try:
+                for pair in self._load_manifest(changeset_id)["files"].values(): live.update(pair)
+            except (OSError, ValueError):
+                continue
+        for manifest in self._open.values():
+            for pair in manifest["files"].values(): live.update(pair)
+        objects_dir = self._path("objects")
+        for prefix in os.listdir(objects_dir):
+            for name in os.listdir(os.path.join(objects_dir, prefix)):
+                if prefix + name not in live:
+                    os.remove(os.path.join(objects_dir, prefix, name))
+
+    # --- 되돌리기 / 다시 실행 ---
+    def _apply(self, manifest: Dict[str, Any], undo: bool, force: bool,
+               only: Optional[str] = None) -> Dict[str, Any]:
+        restored, conflicts = [], []
+        for rel_path, (before_hash, after_hash) in manifest["files"].items():
+            if only is not None and rel_path != only: continue
+            expected, target = (after_hash, before_hash) if undo else (before_hash, after_hash)
+            current = self._current_hash(os.path.join(self.root, rel_path))
+            if current == target:
+                continue  # 이미 목표 상태
+            if current != expected and not force:
+                conflicts.append(rel_path); continue  # 이후에 다른 곳에서 수정됨: 덮어쓰지 않음
+            self._restore(rel_path, target)
+            restored.append(rel_path)
+        return {"changeset": manifest["id"], "label": manifest["label"], "restored": restored, "conflicts": conflicts}
+
+    def undo(self, changeset_id: Optional[str] = None, force: bool = False) -> Optional[Dict[str, Any]]:
+        """ [Lite] 변경 묶음(기본: 가장 최근) 전체를 되돌립니다. """
+        with self._lock:
+            state = self._load_state()
+            if not state["undo"]: return None
+            changeset_id = changeset_id or state["undo"][-1]
+            if changeset_id not in state["undo"]: return None
+            result = self._apply(self._load_manifest(changeset_id), undo=True, force=force)
+            state["undo"].remove(changeset_id); state["redo"].append(changeset_id)
+            self._save_state()
+            return result
+
+    def redo(self, force: bool = False) -> Optional[Dict[str, Any]]:
+        """ [Lite] 마지막으로 되돌린 변경 묶음을 다시 적용합니다. """
+        with self._lock:
+            state = self._load_state()
+            if not state["redo"]: return None
+            changeset_id = state["redo"].pop()
+            result = self._apply(self._load_manifest(changeset_id), undo=False, force=force)
+            state["undo"].append(changeset_id)
+            self._save_state()
+            return result
+
+    def undo_file(self, path: str) -> Optional[Dict[str, Any]]:
+        """ [Lite] 파일의 현재 버전을 만든 가장 최근 변경만 되돌립니다. (여러 번 호출하면 한 단계씩) """
+        rel_path = self._rel(path)
+        with self._lock:
+            state = self._load_state()
+            current = self._current_hash(path)
+            for changeset_id in reversed(state["undo"]):
+                manifest = self._load_manifest(changeset_id)
+                pair = manifest["files"].get(rel_path)
+                if pair is None or pair[1] != current: continue
+                result = self._apply(manifest, undo=True, force=False, only=rel_path)
+                state["file_redo"].setdefault(rel_path, []).append(changeset_id)
+                self._save_state()
+                return result
+            return None
+
+    def redo_file(self, path: str) -> Optional[Dict[str, Any]]:
+        rel_path = self._rel(path)
+        with self._lock:
+            state = self._load_state()
+            stack = state["file_redo"].get(rel_path)
+            if not stack: return None
+            changeset_id = stack.pop()
+            if not stack: del state["file_redo"][rel_path]
+            result = self._apply(self._load_manifest(changeset_id), undo=False, force=False, only=rel_path)
+            self._save_state()
+            return result
+
+    def can_undo_file(self, path: str) -> bool:
+        rel_path, current = self._rel(path), self._current_hash(path)
+        with self._lock:
+            for changeset_id in self._load_state()["undo"]:
+                pair = self._load_manifest(changeset_id)["files"].get(rel_path)
+                if pair is not None and pair[1] == current: return True
+        return False
+
+    def can_redo_file(self, path: str) -> bool:
+        with self._lock:
+            return bool(self._load_state()["file_redo"].get(self._rel(path)))
+
+    # --- 조회 / 비교 ---
+    def list_changesets(self) -> List[Dict[str, Any]]:
+        """ 되돌리기 가능한 변경 묶음 (오래된 순) """
+        with self._lock:
+            manifests = [self._load_manifest(changeset_id) for changeset_id in self._load_state()["undo"]]
+        return [{"id": m["id"], "label": m["label"], "created": m["created"], "files": sorted(m["files"])} for m in manifests]
+
+    def history(self, path: str) -> List[Dict[str, Any]]:
+        """ 파일의 버전 기록 (오래된 순) """
+        rel_path = self._rel(path)
+        entries = []
+        for changeset in self.list_changesets():
+            if rel_path in changeset["files"]:
+                before_hash, after_hash = self._load_manifest(changeset["id"])["files"][rel_path]
+                entries.append({"changeset": changeset["id"], "label": changeset["label"],
+                                "created": changeset["created"], "before": before_hash, "after": after_hash})
+        return entries
+
+    def diff(self, rel_path: str, from_hash: Optional[str], to_hash: Optional[str]) -> str:
+        """ [Lite] 두 버전 간 unified diff (None은 빈 파일로 취급) """
+        old_lines = (self.get_blob(from_hash) or "").splitlines(keepends=True)
+        new_lines = (self.get_blob(to_hash) or "").splitlines(keepends=True)
+        return "".join(difflib.unified_diff(
+            old_lines, new_lines,
+            fromfile=f"a/{rel_path}" if from_hash else "/dev/null",
+            tofile=f"b/{rel_path}" if to_hash else "/dev/null",
+        ))
+
+    def diff_changeset(self, changeset_id: str) -> str:
+        manifest = self._load_manifest(changeset_id)
+        return "".join(self.diff(rel_path, before_hash, after_hash)
+                       for rel_path, (before_hash, after_hash) in sorted(manifest["files"].items()))
+
+    def stats(self) -> Dict[str, int]:
+        """ 저장 공간 사용량 (blob_bytes: 압축 후, 중복 제거 후) """
+        blob_count, blob_bytes = 0, 0
+        objects_dir = self._path("objects")
+        if os.path.isdir(objects_dir):
+            for prefix in os.listdir(objects_dir):
+                for name in os.listdir(os.path.join(objects_dir, prefix)):
+                    blob_count += 1; blob_bytes += os.path.getsize(os.path.join(objects_dir, prefix, name))
+        with self._lock:
+            state = self._load_state()
+            return {"changesets": len(state["undo"]), "redo": len(state["redo"]),
+                    "blobs": blob_count, "blob_bytes": blob_bytes}
+
+
+_STORES: Dict[str, SnapshotStore] = {}
+_STORES_LOCK = threading.Lock()
+
+
+def get_snapshot_store(root: str) -> SnapshotStore:
+    """ [Lite] 루트 폴더별 스냅샷 저장소 (프로세스 안에서 공유) """
+    real_root = os.path.realpath(root)
+    with _STORES_LOCK:
+        store = _STORES.get(real_root)
+        if store is None:
+            store = _STORES[real_root] = SnapshotStore(real_root)
+        return store
+
+
+def write_text(path: str, content: str, root: str, label: str):
+    """
+    [Lite] AI 도구의 파일 쓰기. 실행 중인 변경 묶음이 있으면 거기에, 없으면 이 쓰기 하나짜리 묶음으로 기록합니다.
+    root(샌드박스) 밖의 경로는 기록 없이 원자적으로만 씁니다.
+    """
+    active = _ACTIVE_CHANGESET.get()
+    if active is not None and active[0].contains(path):
+        active[0].write(active[1], path, content)
+        return
+    store = get_snapshot_store(root)
+    if not store.contains(path):
+        atomic_write_text(path, content); notify_file_changed(path)
+        return
+    changeset_id = store.begin(label)
+    try:
+        store.write(changeset_id, path, content)
+    finally:
+        store.commit(changeset_id)
@@ -0,0 +1,318 @@
+import ast
+import os
+import threading
+from collections import defaultdict
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
+
+from project_search_module import register_change_listener
+
+# [Lite] 심볼 색인 / 구조 기반 프롬프트 컨텍스트 설정
+SYMBOL_MAX_FILE_BYTES = 1024 * 1024   # 이보다 큰 .py 파일은 색인하지 않음
+SYMBOL_CONTEXT_BUDGET = 6000          # 코드 수정 프롬프트에 넣을 심볼 + 의존성의 최대 글자 수
+SYMBOL_SCOPE_MIN_CHARS = 4000         # 파일이 이보다 길면 코드 수정은 커서 위치 심볼만 대상으로 함
+MAX_CALLERS = 8                       # 컨텍스트에 나열할 호출 위치 수
+DEPENDENCY_PREVIEW_LINES = 6          # 예산이 모자란 의존 심볼은 앞부분(시그니처)만
+_SKIP_DIR_NAMES = {"__pycache__", "node_modules", "venv"}  # 숨김 폴더('.'으로 시작)도 건너뜀
+_DEFINITION_KINDS = ("function", "class")
+
+
+def _node_range(node: ast.AST) -> Tuple[int, int]:
+    """ (Helper) 데코레이터를 포함한 줄 범위 (1-based, 포함) """
+    start = min([node.lineno] + [d.lineno for d in getattr(node, "decorator_list", [])])
+    return start, getattr(node, "end_lineno", node.lineno) or node.lineno
+
+
+def _referenced_names(node: ast.AST) -> Set[str]:
+    """ (Helper) 노드 안에서 읽는 이름과 속성 이름 (호출/상속/타입 힌트 포함) """
+    names = set()
+    for child in ast.walk(node):
+        if isinstance(child, ast.Name) and isinstance(child.ctx, ast.Load):
+            names.add(child.id)
+        elif isinstance(child, ast.Attribute):
+            names.add(child.attr)
+    return names
+
+
+def parse_symbols(source: str) -> Optional[Dict[str, Any]]:
+    """
+    [Lite] 파이썬 소스의 심볼 목록. 문법 오류면 None.
+    반환: {"symbols": [{"qualname", "name", "kind"(function/class/variable), "start_line", "end_line", "refs"}, ...],
+           "imports": {로컬 이름: "모듈.이름"}, "import_lines": {로컬 이름: 줄 번호}}
+    모듈 수준 함수/클래스/상수와 클래스의 메서드를 기록합니다. (중첩 함수는 바깥 심볼에 포함)
+    """
+    try:
+        tree = ast.parse(source)
+    except (SyntaxError, ValueError):
+        return None
+    symbols: List[Dict[str, Any]] = []
+    imports: Dict[str, str] = {}
+    import_lines: Dict[str, int] = {}
+
+    def add(node: ast.AST, name: str, qualname: str, kind: str):
+        start, end = _node_range(node)
+        if isinstance(node, ast.ClassDef):
+            # 클래스 자체의 참조는 상속/데코레이터/클래스 본문만 (메서드는 각자 기록)
+            parts = node.bases + node.keywords + node.decorator_list + \
+                [m for m in node.body if not isinstance(m, (ast.FunctionDef, ast.AsyncFunctionDef))]
+            refs = set().union(*(_referenced_names(part) for part in parts)) if parts else set()
+        else:
+            refs = _referenced_names(node)
+        symbols.append({"qualname": qualname, "name": name, "kind": kind,
+                        "start_line": start, "end_line": end, "refs": refs - {name}})
+
+    for node in tree.body:
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            add(node, node.name, node.name, "function")
+        elif isinstance(node, ast.ClassDef):
+            add(node, node.name, node.name, "class")
+            for member in node.body:
+                if isinstance(member, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                    add(member, member.name, f"{node.name}.{member.name}", "function")
+        elif isinstance(node, (ast.Assign, ast.AnnAssign)):
+            targets = node.targets if isinstance(node, ast.Assign) else [node.target]
+            for target in targets:
+                if isinstance(target, ast.Name):
+                    add(node, target.id, target.id, "variable")
+        elif isinstance(node, ast.Import):
+            for alias in node.names:
+                local = alias.asname or alias.name.split(".")[0]
+                imports[local] = alias.name; import_lines[local] = node.lineno
+        elif isinstance(node, ast.ImportFrom):
+            for alias in node.names:
+                local = alias.asname or alias.name
+                imports[local] = f"{'.' * node.level}{node.module or ''}.{alias.name}"; import_lines[local] = node.lineno
+    return {"symbols": symbols, "imports": imports, "import_lines": import_lines}
+
+
+def find_symbol_at(symbols: List[Dict[str, Any]], line: int) -> Optional[Dict[str, Any]]:
+    """ [Lite] 줄을 포함하는 가장 안쪽 함수/클래스 (없으면 None) """
+    best = None
+    for symbol in symbols:
+        if symbol["kind"] not in _DEFINITION_KINDS: continue
+        if symbol["start_line"] <= line <= symbol["end_line"]:
+            if best is None or symbol["end_line"] - symbol["start_line"] < best["end_line"] - best["start_line"]:
+                best = symbol
+    return best
+
+
+def _slice_lines(lines: List[str], start: int, end: int) -> str:
+    return "\n".join(lines[start - 1:end])
+
+
+class SymbolIndex:
+    """
+    [Lite] 폴더 하나의 .py 파일에 대한 심볼 색인 (ast 기반).
+      이름 -> 정의 위치(파일, 심볼), 이름 -> 그 이름을 참조(호출)하는 심볼
+    처음 사용할 때 한 번 전체를 만들고, 이후에는 파일 쓰기/저장 알림으로 해당 파일만 갱신합니다.
+    문법 오류로 파싱에 실패한 파일은 마지막으로 성공한 결과를 유지합니다. (편집 중인 파일 보호)
+    """
+    def __init__(self, root: str):
+        self.root = os.path.realpath(root)
+        self._lock = threading.RLock()
+        self._files: Dict[str, Tuple[int, int, Dict[str, Any]]] = {}   # 경로 -> (mtime_ns, 크기, parse_symbols 결과)
+        self._definitions: Dict[str, Set[Tuple[str, str]]] = defaultdict(set)  # 이름 -> {(경로, qualname)}
+        self._references: Dict[str, Set[Tuple[str, str]]] = defaultdict(set)   # 이름 -> {(경로, qualname)}
+        self._built = False
+
+    def contains(self, path: str) -> bool:
+        real_path = os.path.realpath(path)
+        return real_path == self.root or real_path.startswith(self.root + os.sep)
+
+    def _iter_files(self, top: Optional[str] = None) -> Iterator[str]:
+        for dir_path, dir_names, file_names in os.walk(top or self.root):
+            dir_names[:] = [d for d in dir_names if not d.startswith(".") and d not in _SKIP_DIR_NAMES]
+            for file_name in file_names:
+                if file_name.endswith(".py") and not file_name.startswith("."):
+                    yield os.path.join(dir_path, file_name)
+
+    def _remove_locked(self, path: str):
+        entry = self._files.pop(path, None)
+        if entry is None:
+            return
+        for symbol in entry[2]["symbols"]:
+            key = (path, symbol["qualname"])
+            for table, names in ((self._definitions, [symbol["name"]]), (self._references, symbol["refs"])):
+                for name in names:
+                    owners = table.get(name)
+                    if owners is not None:
+                        owners.discard(key)
+                        if not owners: del table[name]
+
+    def _index_locked(self, path: str):
+        try:
+            st = os.stat(path)
+            if st.st_size > SYMBOL_MAX_FILE_BYTES:
+                self._remove_locked(path); return
+            with open(path, "r", encoding="utf-8", errors="replace") as f:
+                parsed = parse_symbols(f.read())
+        except OSError:
+            self._remove_locked(path); return
+        if parsed is None:
+            return  # 문법 오류: 이전 결과 유지
+        self._remove_locked(path)
+        for symbol in parsed["symbols"]:
+            key = (path, symbol["qualname"])
+            self._definitions[symbol["name"]].add(key)
+            for name in symbol["refs"]: self._references[name].add(key)
+        self._files[path] = (st.st_mtime_ns, st.st_size, parsed)
+
+    def ensure_built(self):
+        with self._lock:
+            if self._built: return
+            for path in self._iter_files(): self._index_locked(path)
+            self._built = True
+
+    def update_file(self, path: str):
+        """ [Lite] 파일이 쓰여졌을 때 해당 파일만 다시 색인합니다. (색인 전이면 무시) """
+        real_path = os.path.realpath(path)
+        with self._lock:
+            if not self._built or not self.contains(real_path): return
+            if os.path.isdir(real_path):
+                for file_path in self._iter_files(real_path): self._index_locked(file_path)
+            elif real_path.endswith(".py"):
+                self._index_locked(real_path)
+
+    def remove_path(self, path: str):
+        real_path = os.path.realpath(path)
+        with self._lock:
+            for indexed_path in [p for p in self._files if p == real_path or p.startswith(real_path + os.sep)]:
+                self._remove_locked(indexed_path)
+
+    def _symbol_locked(self, path: str, qualname: str) -> Optional[Dict[str, Any]]:
+        entry = self._files.get(path)
+        if entry is None: return None
+        return next((s for s in entry[2]["symbols"] if s["qualname"] == qualname), None)
+
+    def definitions(self, name: str) -> List[Dict[str, Any]]:
+        """ [Lite] 이름이 name인 심볼의 정의 목록 [{"path", "qualname", "kind", "start_line", "end_line"}, ...] """
+        with self._lock:
+            self.ensure_built()
+            results = []
+            for path, qualname in sorted(self._definitions.get(name, ())):
+                symbol = self._symbol_locked(path, qualname)
+                if symbol: results.append(dict(symbol, path=path))
+            return results
+
+    def callers(self, name: str) -> List[Dict[str, Any]]:
+        """ [Lite] name을 참조(호출)하는 함수/클래스 목록 (이름 기준이므로 같은 이름의 다른 심볼도 포함될 수 있음) """
+        with self._lock:
+            self.ensure_built()
+            results = []
+            for path, qualname in sorted(self._references.get(name, ())):
+                symbol = self._symbol_locked(path, qualname)
+                if symbol and symbol["kind"] in _DEFINITION_KINDS: results.append(dict(symbol, path=path))
+            return results
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"files": len(self._files), "names": len(self._definitions)}
+
+    def context_for(self, path: str, source: str, line: int,
+                    budget_chars: int = SYMBOL_CONTEXT_BUDGET) -> Optional[Dict[str, Any]]:
+        """
+        [Lite] 커서 위치(line)의 심볼과 그 의존성으로 프롬프트 컨텍스트를 만듭니다.
+        source는 에디터 버퍼(저장 전일 수 있음)이고, 다른 파일의 심볼은 색인에서 찾습니다.
+        반환: {"qualname", "kind", "start_line", "end_line", "code", "text"(프롬프트용 전체), "dependencies", "callers"}
+              버퍼를 파싱할 수 없거나 커서가 함수/클래스 밖이면 None
+        """
+        parsed = parse_symbols(source)
+        if parsed is None: return None
+        target = find_symbol_at(parsed["symbols"], line)
+        if target is None: return None
+        real_path = os.path.realpath(path)
+        lines = source.splitlines()
+        code = _slice_lines(lines, target["start_line"], target["end_line"])
+        owner_class = target["qualname"].split(".")[0] if "." in target["qualname"] else None
+        used = len(code)
+
+        import_lines = sorted({parsed["import_lines"][name] for name in target["refs"] if name in parsed["import_lines"]})
+        imports_text = "\n".join(lines[n - 1] for n in import_lines)
+        used += len(imports_text)
+
+        # 의존 심볼: 같은 버퍼(같은 클래스 우선) -> 다른 파일 순서로 찾음
+        local = defaultdict(list)
+        for symbol in parsed["symbols"]:
+            if symbol is not target and not target["qualname"].startswith(symbol["qualname"] + "."):
+                local[symbol["name"]].append(symbol)
+        dependencies, dependency_names = [], []
+        file_cache: Dict[str, List[str]] = {}
+        for name in sorted(target["refs"]):
+            candidates = sorted(local.get(name, []), key=lambda s: not (owner_class and s["qualname"].startswith(owner_class + ".")))
+            if candidates:
+                symbol = candidates[0]
+                snippet_lines, location = lines, os.path.basename(path)
+            else:
+                remote = [d for d in self.definitions(name) if d["path"] != real_path]
+                if not remote: continue
+                symbol = remote[0]
+                if symbol["path"] not in file_cache:
+                    try:
+                        with open(symbol["path"], "r", encoding="utf-8", errors="replace") as f:
+                            file_cache[symbol["path"]] = f.read().splitlines()
+                    except OSError:
+                        continue
+                snippet_lines, location = file_cache[symbol["path"]], os.path.relpath(symbol["path"], self.root)
+            header = f"# {location}:{symbol['start_line']}-{symbol['end_line']} ({symbol['kind']} {symbol['qualname']})"
+            body = _slice_lines(snippet_lines, symbol["start_line"], symbol["end_line"])
+            if used + len(header) + len(body) > budget_chars:
+                body = _slice_lines(snippet_lines, symbol["start_line"],
+                                    min(symbol["end_line"], symbol["start_line"] + DEPENDENCY_PREVIEW_LINES - 1)) + "\n    ..."
+                if used + len(header) + len(body) > budget_chars: continue
+            dependencies.append(f"{header}\n{body}"); dependency_names.append(symbol["qualname"])
+            used += len(header) + len(body)
+
+        # 호출 위치: 같은 버퍼 + 색인의 다른 파일 (위치만)
+        callers = [f"{os.path.basename(path)}:{s['start_line']} {s['qualname']}" for s in parsed["symbols"]
+                   if s["kind"] in _DEFINITION_KINDS and target["name"] in s["refs"] and s is not target]
+        callers += [f"{os.path.relpath(c['path'], self.root)}:{c['start_line']} {c['qualname']}"
+                    for c in self.callers(target["name"]) if c["path"] != real_path]
+
+        sections = [f"[커서 위치 심볼] {target['kind']} {target['qualname']} ({target['start_line']}~{target['end_line']}줄)\n{code}"]
+        if imports_text: sections.append(f"[사용하는 import]\n{imports_text}")
+        if dependencies: sections.append("[의존 심볼 (참고용, 수정 대상 아님)]\n" + "\n\n".join(dependencies))
+        if callers: sections.append("[호출하는 곳]\n" + "\n".join(callers[:MAX_CALLERS]))
+        return {"qualname": target["qualname"], "kind": target["kind"],
+                "start_line": target["start_line"], "end_line": target["end_line"], "code": code,
+                "text": "\n\n".join(sections), "dependencies": dependency_names, "callers": callers[:MAX_CALLERS]}
+
+
+_INDEXES: Dict[str, SymbolIndex] = {}
+_INDEXES_LOCK = threading.Lock()
+
+
+def get_symbol_index(root: str) -> SymbolIndex:
+    """ [Lite] 루트 폴더별 심볼 색인 (프로세스 안에서 공유) """
+    real_root = os.path.realpath(root)
+    with _INDEXES_LOCK:
+        index = _INDEXES.get(real_root)
+        if index is None:
+            index = _INDEXES[real_root] = SymbolIndex(real_root)
+        return index
+
+
+def project_root_for(path: str, base: str) -> str:
+    """ [Lite] 파일이 속한 프로젝트 폴더 (base 바로 아래 폴더, base 밖이면 파일의 폴더) """
+    real_path, real_base = os.path.realpath(path), os.path.realpath(base)
+    if real_path.startswith(real_base + os.sep):
+        first = os.path.relpath(real_path, real_base).split(os.sep)[0]
+        candidate = os.path.join(real_base, first)
+        return candidate if os.path.isdir(candidate) else real_base
+    return os.path.dirname(real_path)
+
+
+def _on_file_changed(path: str):
+    with _INDEXES_LOCK:
+        indexes = list(_INDEXES.values())
+    for index in indexes:
+        if index.contains(path): index.update_file(path)
+
+
+def _on_path_removed(path: str):
+    with _INDEXES_LOCK:
+        indexes = list(_INDEXES.values())
+    for index in indexes:
+        if index.contains(path): index.remove_path(path)
+
+
+# 저장/도구 쓰기 알림(project_search_module.notify_*)을 받아 증분 갱신
+register_change_listener(_on_file_changed, _on_path_removed)
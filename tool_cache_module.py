@@ -0,0 +1,76 @@
+import json
+import os
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+class ToolResultCache:
+    """
+    [Lite] 세션 단위 도구 결과 메모 캐시 (LRU).
+    레지스트리 메타데이터로 캐시 정책을 결정합니다.
+      - pure:            인수만으로 키 생성, 만료 없음 (calculate_math)
+      - cache_file_args: 해당 인수가 가리키는 파일의 (경로, mtime, 크기)를 키에 포함 (read_file)
+      - cache_ttl:       저장 후 N초가 지나면 만료 (perform_web_search)
+    실패 결과는 호출하는 쪽(Core)이 put하지 않습니다. (execution_module.ToolFailure)
+    """
+    def __init__(self, max_entries: int = 256):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[str, float, Optional[float]]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def is_cacheable(spec: Dict[str, Any]) -> bool:
+        return bool(spec.get("pure") or spec.get("cache_ttl") or spec.get("cache_file_args"))
+
+    def make_key(self, tool_name: str, args: Dict[str, Any], spec: Dict[str, Any]) -> Optional[str]:
+        """ 캐시 키를 만듭니다. 키를 만들 수 없으면(파일 없음, 직렬화 불가) None. """
+        if not self.is_cacheable(spec):
+            return None
+        file_stamps = []
+        for arg_name in spec.get("cache_file_args") or ():
+            path = args.get(arg_name)
+            if not isinstance(path, str):
+                return None
+            try:
+                st = os.stat(path)
+            except OSError:
+                return None
+            file_stamps.append([os.path.realpath(path), st.st_mtime_ns, st.st_size])
+        try:
+            args_str = json.dumps(args, sort_keys=True, ensure_ascii=False)
+        except (TypeError, ValueError):
+            return None
+        return f"{tool_name}:{args_str}:{json.dumps(file_stamps)}"
+
+    def get(self, key: str) -> Optional[str]:
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        result, stored_at, ttl = entry
+        if ttl is not None and time.monotonic() - stored_at > ttl:
+            del self._entries[key]
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return result
+
+    def put(self, key: str, result: Any, spec: Dict[str, Any]):
+        if not isinstance(result, str):
+            return
+        self._entries[key] = (result, time.monotonic(), spec.get("cache_ttl"))
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self):
+        self._entries.clear()
+
+    def approx_bytes(self) -> int:
+        """ 캐시된 결과 문자열의 대략적인 메모리 사용량 (작업 공간 메모리 예산 계산용) """
+        return sum(len(key) + len(entry[0]) for key, entry in self._entries.items())
+
+    def stats(self) -> Dict[str, int]:
+        return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses}
@@ -0,0 +1,158 @@
+import json
+import math
+import os
+import re
+import threading
+from collections import defaultdict
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from autosave_module import atomic_write_text
+
+# [Lite] 요청 분류(triage) 설정: 플래너(큰 모델) 호출 전에 네트워크 없이 대화/도구/코드 수정을 구분
+TRIAGE_MODEL_FILE = ".eidos_triage.json"    # 샌드박스의 숨김 파일 (분류기 단어 빈도)
+TRIAGE_CHAT_MAX_CHARS = 40                  # 이보다 긴 요청은 대화로 판정하지 않음 (플래너로)
+TRIAGE_MIN_EXAMPLES = 20                    # 분류별 학습 예시가 이만큼 모여야 분류기 사용
+TRIAGE_CHAT_CONFIDENCE = 0.9                # 분류기가 이 확률 이상으로 대화라고 볼 때만 플래너 생략
+TRIAGE_SAVE_EVERY = 10                      # 학습 예시 N개마다 파일에 저장
+
+ROUTE_CHAT = "chat"            # 플래너 없이 빠른 모델로 바로 대답
+ROUTE_TOOL = "tool"            # 도구 사용 -> 플래너
+ROUTE_CODE = "code"            # 코드 작성/수정 -> 플래너
+ROUTE_AMBIGUOUS = "ambiguous"  # 판단 불가 -> 플래너 (플래너가 CHAT으로 답할 수 있음)
+
+# 도구/코드 작업을 뜻하는 단어 (하나라도 있으면 대화로 보지 않음)
+_CODE_RE = re.compile(r"코드|함수|클래스|메서드|리팩터|버그|디버그|스크립트|\.py\b|\bdef\b|\bclass\b|"
+                      r"\b(code|function|refactor|bug|debug|script)\b", re.IGNORECASE)
+_TOOL_RE = re.compile(r"파일|폴더|저장|읽어|써\s*줘|작성|만들|생성|검색|찾아|계산|요약|번역|정리|보고서|이메일|프로젝트|"
+                      r"수정|고쳐|바꿔|변경|삭제|추가|알려|설명|비교|분석|목록|"
+                      r"[\w./-]+\.\w{1,5}\b|\d+\s*[-+*/^%]\s*\d+|"
+                      r"\b(file|folder|save|read|write|create|make|search|find|calculate|summari[sz]e|translate|"
+                      r"project|fix|change|delete|add|explain|compare|list)\b", re.IGNORECASE)
+# 인사/감사/맞장구 등 짧은 대화 (요청 전체가 이런 말로만 이뤄진 경우)
+_SMALL_TALK_RE = re.compile(r"^(?:(?:안녕(?:하세요|하십니까)?|반가(?:워|워요|습니다)|고마(?:워|워요)|감사(?:해|해요|합니다)|"
+                            r"수고(?:했어|하셨어요|하세요)?|잘\s*(?:자|가|있어)|좋아(?:요)?|알겠(?:어|어요|습니다)|"
+                            r"오케이|넵?|네|응|그래|굿|최고|잘했어|ㅎ+|ㅋ+|ㅠ+|"
+                            r"hi|hello|hey|thanks?|thank\s+you|bye|ok(?:ay)?|cool|nice|great)"
+                            r"[\s!?.~,^]*)+$", re.IGNORECASE)
+_WORD_RE = re.compile(r"\w+")
+
+
+def _features(text: str) -> List[str]:
+    """ (Helper) 분류기 특징: 단어 + 글자 2-gram (한국어 어미 변화에 덜 민감) """
+    text = text.lower()
+    words = _WORD_RE.findall(text)
+    compact = "".join(words)
+    return ["w:" + w for w in words] + ["c:" + compact[i:i + 2] for i in range(len(compact) - 1)]
+
+
+class TriageClassifier:
+    """
+    [Lite] 대화(chat)/도구(tool) 2분류 나이브 베이즈. 특징별 빈도만 저장하므로 파일이 작고 학습/예측이 즉시 끝납니다.
+    플래너의 실제 판정(CHAT/PLAN)을 예시로 계속 학습하고(learn), 배치 결과 파일로 한 번에 학습할 수도 있습니다.
+    """
+    LABELS = (ROUTE_CHAT, ROUTE_TOOL)
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path
+        self._lock = threading.Lock()
+        self.counts: Dict[str, Dict[str, int]] = {label: defaultdict(int) for label in self.LABELS}
+        self.totals: Dict[str, int] = {label: 0 for label in self.LABELS}   # 특징 수 합
+        self.docs: Dict[str, int] = {label: 0 for label in self.LABELS}     # 예시 수
+        self._unsaved = 0
+        if path: self._load()
+
+    def _load(self):
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            for label in self.LABELS:
+                self.counts[label].update(data["counts"][label])
+                self.totals[label] = data["totals"][label]
+                self.docs[label] = data["docs"][label]
+        except (OSError, ValueError, KeyError, TypeError):
+            pass  # 없거나 깨진 파일이면 빈 분류기로 시작
+
+    def save(self):
+        if not self.path: return
+        with self._lock:
+            data = json.dumps({"counts": self.counts, "totals": self.totals, "docs": self.docs}, ensure_ascii=False)
+            self._unsaved = 0
+        atomic_write_text(self.path, data)
+
+    @property
+    def ready(self) -> bool:
+        return all(self.docs[label] >= TRIAGE_MIN_EXAMPLES for label in self.LABELS)
+
+    def learn(self, text: str, label: str) -> bool:
+        """ 예시 하나를 학습합니다. 저장할 때가 되면 True (저장은 호출한 쪽이 io 풀에서) """
+        if label not in self.LABELS or not text.strip(): return False
+        features = _features(text)
+        with self._lock:
+            for feature in features: self.counts[label][feature] += 1
+            self.totals[label] += len(features)
+            self.docs[label] += 1
+            self._unsaved += 1
+            return self._unsaved >= TRIAGE_SAVE_EVERY
+
+    def predict(self, text: str) -> Tuple[str, float]:
+        """ (가장 가능성 높은 분류, 그 확률) """
+        features = _features(text)
+        with self._lock:
+            vocabulary = len(set(self.counts[ROUTE_CHAT]) | set(self.counts[ROUTE_TOOL])) + 1
+            all_docs = sum(self.docs.values()) or 1
+            scores = {}
+            for label in self.LABELS:
+                score = math.log((self.docs[label] + 1) / (all_docs + 2))
+                denominator = self.totals[label] + vocabulary
+                for feature in features:
+                    score += math.log((self.counts[label].get(feature, 0) + 1) / denominator)
+                scores[label] = score
+        best = max(scores, key=scores.get)
+        norm = sum(math.exp(s - scores[best]) for s in scores.values())
+        return best, 1.0 / norm
+
+
+def classify(text: str, classifier: Optional[TriageClassifier] = None, has_attachments: bool = False) -> Dict[str, Any]:
+    """
+    [Lite] 요청 분류 (규칙 -> 분류기 순, 네트워크 호출 없음)
+    반환: {"route": chat/tool/code/ambiguous, "source": rule/classifier, "confidence", "reason"}
+    chat이 아니면 모두 플래너로 보내며, 잘못 대화로 보내는 비용이 크므로 chat 판정은 보수적으로 합니다.
+    """
+    stripped = text.strip()
+    if has_attachments:
+        return {"route": ROUTE_TOOL, "source": "rule", "confidence": 1.0, "reason": "첨부 파일"}
+    if _CODE_RE.search(stripped):
+        return {"route": ROUTE_CODE, "source": "rule", "confidence": 1.0, "reason": "코드 관련 단어"}
+    if _TOOL_RE.search(stripped):
+        return {"route": ROUTE_TOOL, "source": "rule", "confidence": 1.0, "reason": "도구 관련 단어"}
+    if not stripped or (len(stripped) <= TRIAGE_CHAT_MAX_CHARS and _SMALL_TALK_RE.match(stripped)):
+        return {"route": ROUTE_CHAT, "source": "rule", "confidence": 1.0, "reason": "인사/짧은 대화"}
+    if classifier is not None and classifier.ready and len(stripped) <= TRIAGE_CHAT_MAX_CHARS:
+        label, probability = classifier.predict(stripped)
+        if label == ROUTE_CHAT and probability >= TRIAGE_CHAT_CONFIDENCE:
+            return {"route": ROUTE_CHAT, "source": "classifier", "confidence": probability, "reason": "분류기"}
+        return {"route": ROUTE_AMBIGUOUS, "source": "classifier", "confidence": probability,
+                "reason": f"분류기 {label} {probability:.0%}"}
+    return {"route": ROUTE_AMBIGUOUS, "source": "rule", "confidence": 0.0, "reason": "규칙 불일치"}
+
+
+def examples_from_results(paths: Iterable[str]) -> List[Tuple[str, str]]:
+    """
+    [Lite] 배치 결과 파일(eidos_batch)에서 학습 예시 (요청, chat/tool)를 만듭니다.
+    성공한 작업 중 계획이 없으면 대화, 있으면 도구 사용으로 봅니다.
+    """
+    examples = []
+    for path in paths:
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                if record.get("status") != "ok" or not record.get("text"): continue
+                examples.append((record["text"], ROUTE_TOOL if record.get("plan") else ROUTE_CHAT))
+    return examples
+
+
+def model_path(base_root: str) -> str:
+    return os.path.join(base_root, TRIAGE_MODEL_FILE)
@@ -0,0 +1,166 @@
+import json
+import os
+import threading
+import time
+from collections import OrderedDict, deque
+from typing import Any, Dict, List, Optional
+
+from tool_cache_module import ToolResultCache
+from auto_debug_module import AutoFixEngine
+from autosave_module import atomic_write_text
+import project_search_module
+
+# [Lite] 작업 공간(다중 프로젝트) 설정
+WORKSPACE_MAX_ACTIVE_PROJECTS = 8              # 메모리에 올려 두는 프로젝트 컨텍스트 수
+WORKSPACE_MEMORY_BUDGET = 64 * 1024 * 1024     # 활성 컨텍스트(캐시 + 색인)의 대략적인 메모리 예산 (바이트)
+PROJECT_STATE_FILE = ".eidos_project.json"      # 프로젝트 폴더의 숨김 상태 파일 (대화 기록)
+PROJECT_HISTORY_LENGTH = 30
+
+
+def list_projects(base_root: str) -> List[str]:
+    """ [Lite] 작업 공간의 프로젝트 목록 (샌드박스 바로 아래 폴더, 숨김 폴더 제외) """
+    try:
+        names = [n for n in os.listdir(base_root)
+                 if not n.startswith(".") and os.path.isdir(os.path.join(base_root, n))]
+    except OSError:
+        return []
+    return sorted(names)
+
+
+class ProjectContext:
+    """
+    [Lite] 프로젝트 하나의 가벼운 Core 컨텍스트.
+    대화 기록, 도구 결과 캐시, 자동 디버거 상태, 샌드박스 루트를 프로젝트별로 분리합니다.
+    검색 색인은 처음 사용할 때 만들어집니다. (project_search_module의 루트별 색인)
+    """
+    def __init__(self, name: str, root: str):
+        self.name = name
+        self.root = root
+        self.chat_history: deque = deque(maxlen=PROJECT_HISTORY_LENGTH)
+        self.tool_cache = ToolResultCache()
+        self.auto_fix_engine = AutoFixEngine()
+        self.last_used = time.monotonic()
+        self._load_state()
+
+    @property
+    def search_index(self) -> project_search_module.ProjectSearchIndex:
+        return project_search_module.get_project_index(self.root)
+
+    def _state_path(self) -> str:
+        return os.path.join(self.root, PROJECT_STATE_FILE)
+
+    def _load_state(self):
+        try:
+            with open(self._state_path(), "r", encoding="utf-8") as f:
+                self.chat_history.extend(json.load(f).get("chat_history", []))
+        except (OSError, ValueError):
+            pass
+
+    def save_state(self):
+        """ 비활성화 전에 대화 기록을 프로젝트 폴더에 저장합니다. """
+        if not self.chat_history or not os.path.isdir(self.root):
+            return
+        atomic_write_text(self._state_path(), json.dumps({"chat_history": list(self.chat_history)}, ensure_ascii=False))
+
+    def history_for(self, text_input: str) -> List[str]:
+        """ 플래너에 넘길 대화 기록 (이 프로젝트의 기록 + 현재 입력) """
+        return list(self.chat_history) + [f"👤 사용자: {text_input}"]
+
+    def record_turn(self, text_input: str, response_text: str):
+        self.chat_history.append(f"👤 사용자: {text_input}")
+        self.chat_history.append(f"🤖 EIDOS-Lite: {response_text}")
+
+    def approx_bytes(self) -> int:
+        index_bytes = 0
+        index = project_search_module.peek_project_index(self.root)
+        if index is not None:
+            index_bytes = index.approx_bytes()
+        return self.tool_cache.approx_bytes() + index_bytes + sum(len(line) for line in self.chat_history)
+
+    def release(self):
+        """ 메모리에서 내릴 때: 상태 저장 후 캐시/색인 해제 """
+        self.save_state()
+        self.tool_cache.clear()
+        project_search_module.drop_project_index(self.root)
+
+
+class WorkspaceManager:
+    """
+    [Lite] 프로젝트별 컨텍스트를 필요할 때 만들고(지연 활성화), 최근 사용 순으로 유지합니다.
+    활성 컨텍스트 수 또는 메모리 예산을 넘으면 가장 오래 쓰지 않은 컨텍스트부터 내립니다.
+    (내려간 프로젝트의 대화 기록은 파일에 남아 다시 활성화할 때 복원됩니다)
+    """
+    def __init__(self, base_root: str,
+                 max_active: int = WORKSPACE_MAX_ACTIVE_PROJECTS,
+                 memory_budget: int = WORKSPACE_MEMORY_BUDGET):
+        self.base_root = os.path.realpath(base_root)
+        self.max_active = max_active
+        self.memory_budget = memory_budget
+        self._contexts: "OrderedDict[str, ProjectContext]" = OrderedDict()
+        self._lock = threading.RLock()
+        self.evictions = 0
+
+    def project_root(self, name: str) -> str:
+        root = os.path.realpath(os.path.join(self.base_root, name))
+        if os.path.dirname(root) != self.base_root:
+            raise PermissionError(f"Security Error: 프로젝트 '{name}'이(가) 작업 공간 '{self.base_root}' 바로 아래가 아닙니다.")
+        return root
+
+    def activate(self, name: str) -> ProjectContext:
+        """ [Lite] 프로젝트 컨텍스트를 가져옵니다. (없으면 생성, 필요하면 다른 컨텍스트를 내림) """
+        with self._lock:
+            context = self._contexts.get(name)
+            if context is None:
+                root = self.project_root(name)
+                os.makedirs(root, exist_ok=True)
+                context = self._contexts[name] = ProjectContext(name, root)
+                print(f"📁 [Workspace-Lite] 프로젝트 '{name}' 활성화 (활성 {len(self._contexts)}개)")
+            self._contexts.move_to_end(name)
+            context.last_used = time.monotonic()
+            self._enforce_budget()
+            return context
+
+    def context_for_path(self, path: Optional[str]) -> Optional[ProjectContext]:
+        """ 파일 경로가 속한 프로젝트의 컨텍스트 (작업 공간 밖이면 None) """
+        if not path:
+            return None
+        real_path = os.path.realpath(path)
+        if not real_path.startswith(self.base_root + os.sep):
+            return None
+        name = os.path.relpath(real_path, self.base_root).split(os.sep)[0]
+        if name.startswith(".") or not os.path.isdir(os.path.join(self.base_root, name)):
+            return None
+        return self.activate(name)
+
+    def _enforce_budget(self):
+        while len(self._contexts) > 1:
+            over_count = len(self._contexts) > self.max_active
+            over_memory = sum(c.approx_bytes() for c in self._contexts.values()) > self.memory_budget
+            if not (over_count or over_memory):
+                return
+            name, context = self._contexts.popitem(last=False)  # 가장 오래 쓰지 않은 컨텍스트
+            context.release()
+            self.evictions += 1
+            print(f"💤 [Workspace-Lite] 프로젝트 '{name}' 비활성화 ({'개수' if over_count else '메모리'} 제한)")
+
+    def deactivate(self, name: str):
+        with self._lock:
+            context = self._contexts.pop(name, None)
+            if context is not None: context.release()
+
+    def close(self):
+        """ 종료 시 모든 컨텍스트의 상태를 저장합니다. """
+        with self._lock:
+            for context in self._contexts.values(): context.save_state()
+
+    def list_projects(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            return [{"name": name, "active": name in self._contexts} for name in list_projects(self.base_root)]
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "active": list(self._contexts),
+                "approx_bytes": sum(c.approx_bytes() for c in self._contexts.values()),
+                "evictions": self.evictions,
+            }